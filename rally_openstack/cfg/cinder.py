@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from rally_openstack.cfg import polling
+
 OPTS = {"openstack": [
     cfg.FloatOpt("cinder_volume_create_prepoll_delay",
                  default=2.0,
@@ -48,4 +50,5 @@ OPTS = {"openstack": [
                  deprecated_group="benchmark",
                  help="Interval between checks when waiting for backup"
                       " restoring."),
+    polling.poll_strategy_opt("Cinder"),
 ]}
@@ -23,5 +23,16 @@ OPTS = {"openstack": [
     cfg.IntOpt("cleanup_threads",
                default=20,
                deprecated_group="cleanup",
-               help="Number of cleanup threads to run")
+               help="Number of cleanup threads to run"),
+    cfg.IntOpt("cleanup_groups_threads",
+               default=4, min=1,
+               help="Number of groups of independent resource managers to "
+                    "clean up simultaneously. Resource managers inside one "
+                    "group are always processed one after another"),
+    cfg.BoolOpt("cleanup_admin_listing",
+                default=True,
+                help="List resources of all tenants by one admin request "
+                     "instead of listing resources per every tenant. It is "
+                     "used only by resource managers which support it and "
+                     "only if admin credentials are available")
 ]}
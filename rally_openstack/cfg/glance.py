@@ -48,5 +48,15 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Interval between checks when waiting for image "
-                      "creation.")
+                      "creation."),
+    cfg.StrOpt("image_cache_dir",
+               default="~/.rally/openstack/image_cache",
+               help="Directory of the local cache of images which are "
+                    "uploaded by images@openstack context from URLs."),
+    cfg.IntOpt("image_cache_max_size",
+               default=0,
+               min=0,
+               help="Max total size of the local image cache in MB. The "
+                    "least recently used images are removed when it is "
+                    "exceeded. 0 disables the cache.")
 ]}
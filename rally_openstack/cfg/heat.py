@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from rally_openstack.cfg import polling
+
 OPTS = {"openstack": [
     cfg.FloatOpt("heat_stack_create_prepoll_delay",
                  default=2.0,
@@ -108,5 +110,6 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Time interval (in sec) between checks when waiting for "
-                      "a stack to scale up or down.")
+                      "a stack to scale up or down."),
+    polling.poll_strategy_opt("Heat"),
 ]}
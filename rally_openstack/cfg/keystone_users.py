@@ -35,5 +35,19 @@ OPTS = {"openstack": [
                default="member",
                deprecated_group="users_context",
                help="The default role name of the keystone to assign to "
-                    "users.")
+                    "users."),
+    cfg.BoolOpt("users_context_token_pool",
+                default=False,
+                help="Authenticate users in parallel while setting up users "
+                     "context and reuse their tokens in scenarios instead of "
+                     "authenticating every user in every iteration. Note "
+                     "that scenarios measuring authentication (for example, "
+                     "Authenticate.*) do not measure it anymore then, and "
+                     "tokens of all users are stored in the task context."),
+    cfg.IntOpt("users_context_token_min_lifetime",
+               default=600,
+               min=0,
+               help="Minimal remaining lifetime (in sec) of a pooled token. "
+                    "Users with tokens that expire sooner are authenticated "
+                    "by password."),
 ]}
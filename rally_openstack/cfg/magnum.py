@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from rally_openstack.cfg import polling
+
 OPTS = {"openstack": [
     cfg.FloatOpt("magnum_cluster_create_prepoll_delay",
                  default=5.0,
@@ -48,5 +50,6 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Time interval(in sec) between checks when waiting for "
-                      "k8s rc creation.")
+                      "k8s rc creation."),
+    polling.poll_strategy_opt("Magnum"),
 ]}
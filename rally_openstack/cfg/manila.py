@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from rally_openstack.cfg import polling
+
 OPTS = {"openstack": [
     cfg.FloatOpt(
         "manila_share_create_prepoll_delay",
@@ -66,4 +68,5 @@ OPTS = {"openstack": [
         deprecated_group="benchmark",
         help="Interval between checks when waiting for Manila access "
              "deletion."),
+    polling.poll_strategy_opt("Manila"),
 ]}
@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from rally_openstack.cfg import polling
+
 OPTS = {"openstack": [
     # prepoll delay, timeout, poll interval
     # "start": (0, 300, 1)
@@ -304,5 +306,13 @@ OPTS = {"openstack": [
     cfg.FloatOpt("nova_detach_volume_poll_interval",
                  default=2.0,
                  deprecated_group="benchmark",
-                 help="Nova volume detach poll interval")
+                 help="Nova volume detach poll interval"),
+    polling.poll_strategy_opt("Nova"),
+    cfg.BoolOpt("nova_shared_polling",
+                default=False,
+                help="Check statuses of nova servers waited by all "
+                     "iterations of one process by a single listing of "
+                     "servers changed since the last check instead of "
+                     "fetching every server separately. The poll intervals "
+                     "of the actions are kept, the poll strategy is ignored."),
 ]}
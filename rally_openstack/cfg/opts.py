@@ -27,6 +27,7 @@ from rally_openstack.cfg import neutron
 from rally_openstack.cfg import nova
 from rally_openstack.cfg import octavia
 from rally_openstack.cfg import osclients
+from rally_openstack.cfg import polling
 from rally_openstack.cfg import profiler
 from rally_openstack.cfg import sahara
 from rally_openstack.cfg import senlin
@@ -48,10 +49,10 @@ def list_opts():
     opts = {}
     for l_opts in (cinder.OPTS, ec2.OPTS, heat.OPTS, ironic.OPTS, magnum.OPTS,
                    manila.OPTS, mistral.OPTS, monasca.OPTS, murano.OPTS,
-                   nova.OPTS, osclients.OPTS, profiler.OPTS, sahara.OPTS,
-                   vm.OPTS, glance.OPTS, watcher.OPTS, tempest.OPTS,
-                   keystone_roles.OPTS, keystone_users.OPTS, cleanup.OPTS,
-                   senlin.OPTS, neutron.OPTS, octavia.OPTS,
+                   nova.OPTS, osclients.OPTS, polling.OPTS, profiler.OPTS,
+                   sahara.OPTS, vm.OPTS, glance.OPTS, watcher.OPTS,
+                   tempest.OPTS, keystone_roles.OPTS, keystone_users.OPTS,
+                   cleanup.OPTS, senlin.OPTS, neutron.OPTS, octavia.OPTS,
                    osprofilerchart.OPTS):
         for category, opt in l_opts.items():
             opts.setdefault(category, [])
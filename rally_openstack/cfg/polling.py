@@ -0,0 +1,65 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import cfg
+
+
+POLL_STRATEGIES = ["fixed", "exponential", "learned"]
+
+
+def poll_strategy_opt(service):
+    """Returns an option choosing the polling strategy of the service."""
+    return cfg.StrOpt("%s_poll_strategy" % service.lower(),
+                      default="fixed",
+                      choices=POLL_STRATEGIES,
+                      help="Strategy of polling for %s resource statuses: "
+                           "'fixed' checks the status every poll interval, "
+                           "'exponential' grows the interval up to the poll "
+                           "interval and 'learned' sleeps the median "
+                           "duration of the same atomic action before the "
+                           "second check." % service)
+
+
+OPTS = {"openstack": [
+    cfg.FloatOpt("poll_backoff_initial_interval",
+                 default=0.25,
+                 min=0,
+                 help="Time(in sec) to sleep before the second status check "
+                      "for 'exponential' and 'learned' polling strategies."),
+    cfg.FloatOpt("poll_backoff_factor",
+                 default=2.0,
+                 min=1,
+                 help="Multiplier of the interval between status checks for "
+                      "'exponential' and 'learned' polling strategies. The "
+                      "interval never exceeds the poll interval configured "
+                      "for the action."),
+    cfg.FloatOpt("poll_jitter",
+                 default=0.25,
+                 min=0,
+                 max=1,
+                 help="Max part of the interval between status checks which "
+                      "is randomly cut off for 'exponential' and 'learned' "
+                      "polling strategies."),
+    cfg.IntOpt("poll_learned_window",
+               default=50,
+               min=1,
+               help="Number of the latest waits within the same atomic "
+                    "action used by 'learned' polling strategy."),
+    cfg.IntOpt("poll_learned_min_samples",
+               default=3,
+               min=1,
+               help="Number of finished waits within the same atomic action "
+                    "required by 'learned' polling strategy before it stops "
+                    "falling back to 'exponential' one."),
+]}
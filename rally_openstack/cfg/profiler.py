@@ -19,5 +19,42 @@ OPTS = {"openstack": [
     cfg.BoolOpt("enable_profiler",
         default=True,
         deprecated_group="benchmark",
-        help="Enable or disable osprofiler to trace the scenarios")
+        help="Enable or disable osprofiler to trace the scenarios"),
+    cfg.StrOpt("profiler_sampling",
+               default="all",
+               choices=["all", "every_nth", "random", "first_per_user",
+                        "slow"],
+               help="Iterations to trace with osprofiler: 'all', every Nth "
+                    "one ('every_nth', see profiler_sample_every), a random "
+                    "fraction ('random', see profiler_sample_fraction), the "
+                    "first iterations of every user ('first_per_user', see "
+                    "profiler_sample_per_user) or 'slow' ones. In case of "
+                    "'slow', all iterations are traced, but trace ids are "
+                    "kept only for iterations slower than a percentile "
+                    "(see profiler_sample_percentile) of previous iterations "
+                    "of the workload."),
+    cfg.IntOpt("profiler_sample_every",
+               default=10,
+               min=1,
+               help="Trace every Nth iteration in case of 'every_nth' "
+                    "sampling."),
+    cfg.FloatOpt("profiler_sample_fraction",
+                 default=0.1,
+                 min=0,
+                 max=1,
+                 help="Fraction of iterations to trace in case of 'random' "
+                      "sampling."),
+    cfg.FloatOpt("profiler_sample_percentile",
+                 default=90,
+                 min=0,
+                 max=100,
+                 help="Percentile of durations of previous iterations to "
+                      "keep traces of slower iterations in case of 'slow' "
+                      "sampling."),
+    cfg.IntOpt("profiler_sample_per_user",
+               default=1,
+               min=1,
+               help="Number of the first iterations of every user to trace "
+                    "in case of 'first_per_user' sampling. Iterations are "
+                    "counted by every runner process separately.")
 ]}
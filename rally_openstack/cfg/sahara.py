@@ -15,6 +15,8 @@
 
 from rally.common import cfg
 
+from rally_openstack.cfg import polling
+
 OPTS = {"openstack": [
     cfg.IntOpt("sahara_cluster_create_timeout",
                default=1800,
@@ -39,5 +41,6 @@ OPTS = {"openstack": [
     cfg.IntOpt("sahara_workers_per_proxy",
                default=20,
                deprecated_group="benchmark",
-               help="Amount of workers one proxy should serve to.")
+               help="Amount of workers one proxy should serve to."),
+    polling.poll_strategy_opt("Sahara"),
 ]}
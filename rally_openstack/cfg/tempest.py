@@ -21,6 +21,12 @@ OPTS = {"openstack": [
                        "0.3.5/cirros-0.3.5-x86_64-disk.img",
                deprecated_group="tempest",
                help="image URL"),
+    cfg.StrOpt("img_checksum",
+               default=None,
+               help="Expected checksum of the image downloaded from img_url "
+                    "in form '<algorithm>:<hex digest>', for example "
+                    "'md5:f8ab98ff5e73ebab884d80c9dc9c7290'. The image is "
+                    "not verified if it is not set."),
     cfg.StrOpt("img_disk_format",
                default="qcow2",
                deprecated_group="tempest",
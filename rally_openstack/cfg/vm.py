@@ -23,5 +23,11 @@ OPTS = {"openstack": [
     cfg.FloatOpt("vm_ping_timeout",
                  default=120.0,
                  deprecated_group="benchmark",
-                 help="Time to wait for a VM to become pingable")
+                 help="Time to wait for a VM to become pingable"),
+    cfg.IntOpt("vm_ssh_keepalive_interval",
+               default=10,
+               min=0,
+               help="Interval in seconds of keepalive packets of SSH "
+                    "connections to VMs which are reused by several "
+                    "commands. 0 disables keepalive packets.")
 ]}
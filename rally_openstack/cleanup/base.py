@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
 
 from rally.common import cfg
+from rally.common import utils as rutils
 from rally.task import utils
 
 CONF = cfg.CONF
@@ -38,10 +41,66 @@ class NoName(object):
         return "<NoName %s resource>" % self.resource_type
 
 
+class ListingCache(object):
+    """Cache of resource listings shared by resource managers.
+
+    One instance is shared by all resource managers of one cleanup run, so
+    every collection is fetched once and then served to all managers and
+    tenants which need it. Listings are keyed by (service, resource, tenant).
+    Listings of all tenants (made by admin) are keyed with `None` as a tenant
+    and partitioned by tenant on the fly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._listings = {}
+
+    def _get_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def list(self, key, list_resources, tenant_uuid=None,
+             tenant_field="tenant_id"):
+        """Returns cached listing of resources.
+
+        :param key: tuple of (service, resource, tenant) identifying
+            the listing
+        :param list_resources: function to call in case of cache miss
+        :param tenant_uuid: return only resources of this tenant
+        :param tenant_field: field of resource which refers to the tenant
+        """
+        with self._get_lock(key):
+            with self._lock:
+                listing = self._listings.get(key)
+            if listing is None:
+                listing = {"resources": list(list_resources())}
+                with self._lock:
+                    self._listings[key] = listing
+
+            if tenant_uuid is None:
+                return list(listing["resources"])
+            if "by_tenant" not in listing:
+                by_tenant = collections.defaultdict(list)
+                for r in listing["resources"]:
+                    by_tenant[r.get(tenant_field)].append(r)
+                listing["by_tenant"] = by_tenant
+            return list(listing["by_tenant"].get(tenant_uuid, []))
+
+    def invalidate(self, service, resource):
+        """Drop all cached listings of the resource."""
+        with self._lock:
+            keys = [k for k in self._listings
+                    if k[0] == service and k[1] == resource]
+            for key in keys:
+                self._listings.pop(key, None)
+
+
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.openstack.resource_deletion_timeout,
-             interval=1, threads=CONF.openstack.cleanup_threads):
+             interval=1, threads=CONF.openstack.cleanup_threads,
+             batch_polling=False, admin_listing=False):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -61,6 +120,12 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param batch_polling: Check deletion of all resources of one tenant by
+                          a single listing per interval instead of polling
+                          every resource separately
+                          (see ResourceManager.list_undeleted_ids)
+    :param admin_listing: Resources of all tenants can be listed by one
+                          admin request (see ResourceManager.list_all_tenants)
     """
 
     def inner(cls):
@@ -75,6 +140,8 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._batch_polling = batch_polling
+        cls._admin_listing = admin_listing
 
         return cls
 
@@ -92,11 +159,13 @@ class ResourceManager(object):
     list() and is_deleted() methods to make them fit to your case.
     """
 
-    def __init__(self, resource=None, admin=None, user=None, tenant_uuid=None):
+    def __init__(self, resource=None, admin=None, user=None, tenant_uuid=None,
+                 listing_cache=None):
         self.admin = admin
         self.user = user
         self.raw_resource = resource
         self.tenant_uuid = tenant_uuid
+        self._listing_cache = listing_cache or ListingCache()
 
     def _manager(self):
         client = self._admin_required and self.admin or self.user
@@ -124,10 +193,100 @@ class ResourceManager(object):
 
         return utils.get_status(resource) in ("DELETED", "DELETE_COMPLETE")
 
+    def list_undeleted_ids(self):
+        """List ids of resources which are not deleted yet.
+
+        It is used for checking the deletion of many resources by one
+        request in case of `batch_polling`. The resource is treated as
+        deleted if it is missed in the result.
+        """
+        ids = set()
+        for raw_resource in self.list():
+            if utils.get_status(raw_resource) in ("DELETED",
+                                                  "DELETE_COMPLETE"):
+                continue
+            resource = self.__class__(resource=raw_resource,
+                                      admin=self.admin, user=self.user,
+                                      tenant_uuid=self.tenant_uuid,
+                                      listing_cache=self._listing_cache)
+            ids.add(resource.id())
+        return ids
+
+    def list_all_tenants(self):
+        """List resources of all tenants using admin credentials.
+
+        Should be implemented by resource managers with `admin_listing`.
+
+        :returns: list of pairs (tenant id, raw resource)
+        """
+        raise NotImplementedError()
+
     def delete(self):
         """Delete resource that corresponds to instance of this class."""
         self._manager().delete(self.id())
 
+    def bulk_delete_limit(self):
+        """Return the max number of resources deleted by one delete_many call.
+
+        Resource managers which can delete many resources by one request
+        should override it together with delete_many. By default, bulk
+        deletion is not supported.
+        """
+        return 0
+
+    def delete_many(self, resources):
+        """Delete many resources by one request.
+
+        Resources which are reported as deleted are not polled afterwards,
+        so bulk deletion should be synchronous.
+
+        :param resources: list of resource managers initiated with resources
+            that should be deleted
+        :returns: list of resource managers which were not deleted and
+            should be deleted one by one
+        """
+        raise NotImplementedError()
+
     def list(self):
         """List all resources specific for admin or user."""
         return self._manager().list()
+
+    def list_pages(self):
+        """Yield resources specific for admin or user page by page.
+
+        Resource managers which support paginated listing should override
+        this method (see _paginate), so deletion of resources from the first
+        page can start while the next page is being fetched. By default,
+        the whole listing is returned as a single page.
+        """
+        yield list(rutils.retry(3, self.list))
+
+    def _paginate(self, list_page, get_marker, stable_markers=False):
+        """Yield pages of resources using marker-based pagination.
+
+        Every page is fetched with retries, so a failure of one request
+        doesn't restart the whole listing.
+
+        :param list_page: function which takes a marker (None for the first
+            page) and returns a page of resources
+        :param get_marker: function which returns a marker for the next page
+            from the last resource of the current page
+        :param stable_markers: whether the API accepts markers of deleted
+            resources. Only then a page is yielded as soon as it is fetched,
+            otherwise the resource used as a marker may be deleted by
+            consumers before the next page is requested, so all pages are
+            fetched first.
+        """
+        marker = None
+        pages = []
+        while True:
+            page = rutils.retry(3, list_page, marker)
+            if not page:
+                break
+            if stable_markers:
+                yield page
+            else:
+                pages.append(page)
+            marker = get_marker(page[-1])
+        for page in pages:
+            yield page
@@ -13,23 +13,146 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
 import time
 
 from rally.common import broker
+from rally.common import cfg
 from rally.common import logging
 from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
+from six.moves import queue
+
 from rally_openstack.cleanup import base
 
 
+CONF = cfg.CONF
 LOG = logging.getLogger(__name__)
 
+# NOTE: Resources of these services can refer to each other (a port
+#   is bound to a server, a volume is attached to a server, a heat stack owns
+#   servers, networks and volumes, etc), so all their resource managers form
+#   one group and are processed strictly one after another according to the
+#   `_order`. Resource managers of any other service form a separate group
+#   per service, which is processed simultaneously with other groups.
+_DEPENDENT_SERVICES = ("magnum", "heat", "senlin", "nova", "ec2", "neutron",
+                       "octavia", "cinder", "manila", "glance", "sahara",
+                       "murano", "ironic")
+
+# Resources of these services (projects, users, roles) can be used by
+# resources of all other services, so they are cleaned up only when all other
+# groups are finished.
+_FINAL_SERVICES = ("keystone",)
+
+
+class _JobsQueue(object):
+    """Thread-safe queue with deque-like interface for publishers."""
+
+    _STOP = object()
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def append(self, job):
+        self._queue.put(job)
+
+    def stop(self, consumers_count):
+        for i in range(consumers_count):
+            self._queue.put(self._STOP)
+
+    def __iter__(self):
+        while True:
+            job = self._queue.get()
+            if job is self._STOP:
+                return
+            yield job
+
+
+def _run_streaming(publish, consume, consumers_count=1):
+    """Run publisher and consumers simultaneously.
+
+    Unlike rally.common.broker.run, consumers do not wait for the publisher
+    to finish and process jobs as soon as they are published.
+
+    :param publish: Function that puts values to the queue
+    :param consume: Function that processes a single value from the queue
+    :param consumers_count: Number of consumers
+    """
+    jobs = _JobsQueue()
+
+    def _consumer():
+        cache = {}
+        for args in jobs:
+            try:
+                consume(cache, args)
+            except Exception as e:
+                msg = "Failed to consume a task from the queue"
+                if logging.is_debug():
+                    LOG.exception(msg)
+                else:
+                    LOG.warning("%s: %s" % (msg, e))
+
+    consumers = []
+    for i in range(consumers_count):
+        consumer = threading.Thread(target=_consumer)
+        consumer.start()
+        consumers.append(consumer)
+
+    try:
+        publish(jobs)
+    except Exception as e:
+        msg = "Failed to publish a task to the queue"
+        if logging.is_debug():
+            LOG.exception(msg)
+        else:
+            LOG.warning("%s: %s" % (msg, e))
+    finally:
+        jobs.stop(consumers_count)
+
+    for consumer in consumers:
+        consumer.join()
+
+
+class _DeletionTracker(object):
+    """Checks deletion of many resources of one tenant by one listing.
+
+    Instead of fetching every resource which is being deleted separately,
+    resources of a tenant are listed at most once per polling interval and
+    all pending deletions of this tenant are resolved from that listing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenant_locks = {}
+        self._listings = {}
+
+    def _get_tenant_lock(self, tenant_uuid):
+        with self._lock:
+            return self._tenant_locks.setdefault(tenant_uuid,
+                                                 threading.Lock())
+
+    def is_deleted(self, resource):
+        with self._get_tenant_lock(resource.tenant_uuid):
+            listed_at, ids = self._listings.get(resource.tenant_uuid,
+                                                (None, None))
+            if listed_at is None or (
+                    time.time() - listed_at >= resource._interval):
+                listed_at = time.time()
+                ids = resource.list_undeleted_ids()
+                self._listings[resource.tenant_uuid] = (listed_at, ids)
+        return resource.id() not in ids
+
+
+class _BulkDeletion(list):
+    """Deletion job of resources which are deleted by one request."""
+
 
 class SeekAndDestroy(object):
 
     def __init__(self, manager_cls, admin, users, api_versions=None,
-                 resource_classes=None, task_id=None):
+                 resource_classes=None, task_id=None, listing_cache=None):
         """Resource deletion class.
 
         This class contains method exterminate() that finds and deletes
@@ -42,6 +165,8 @@ class SeekAndDestroy(object):
         :param resource_classes: Resource classes to match resource names
                                  against
         :param task_id: The UUID of task to match resource names against
+        :param listing_cache: base.ListingCache instance to share listings
+                              of resources between resource managers
         """
         self.manager_cls = manager_cls
         self.admin = admin
@@ -50,6 +175,8 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        self.listing_cache = listing_cache or base.ListingCache()
+        self._deletion_tracker = _DeletionTracker()
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -62,7 +189,9 @@ class SeekAndDestroy(object):
         """Safe resource deletion with retries and timeouts.
 
         Send request to delete resource, in case of failures repeat it few
-        times. After that pull status of resource until it's deleted.
+        times. After that pull status of resource until it's deleted. In case
+        of `batch_polling` resource managers, the status is resolved from the
+        listing of tenant resources shared by all deletion jobs.
 
         Writes in LOG warning with UUID of resource that wasn't deleted
 
@@ -92,11 +221,17 @@ class SeekAndDestroy(object):
             else:
                 LOG.warning("%(msg)s Reason: %(e)s" % {"msg": msg, "e": e})
         else:
+            if resource._batch_polling:
+                def is_deleted():
+                    return self._deletion_tracker.is_deleted(resource)
+            else:
+                is_deleted = resource.is_deleted
+
             started = time.time()
             failures_count = 0
             while time.time() - started < resource._timeout:
                 try:
-                    if resource.is_deleted():
+                    if is_deleted():
                         return
                 except Exception as e:
                     LOG.exception(
@@ -123,63 +258,136 @@ class SeekAndDestroy(object):
         (using manager_cls) and puts jobs for deletion.
 
         Every deletion job contains tuple with two values: user and resource
-        uuid that should be deleted.
+        uuid that should be deleted. Resources are published page by page,
+        so jobs are consumed while next pages are being fetched.
+
+        If the resource manager supports bulk deletion, a job contains a list
+        of resources which are deleted by one request instead.
 
         In case of tenant based resource, uuids are fetched only from one user
-        per tenant.
+        per tenant. If the resource manager supports it and admin is
+        available, resources of all tenants are fetched by one admin listing
+        and matched against tenants of passed users.
         """
         def _publish(admin, user, manager):
             try:
-                for raw_resource in rutils.retry(3, manager.list):
-                    queue.append((admin, user, raw_resource))
+                bulk_limit = manager.bulk_delete_limit()
+                for page in manager.list_pages():
+                    if bulk_limit > 1:
+                        for i in range(0, len(page), bulk_limit):
+                            queue.append((admin, user, _BulkDeletion(
+                                page[i:i + bulk_limit])))
+                        continue
+                    for raw_resource in page:
+                        queue.append((admin, user, raw_resource))
             except Exception:
                 LOG.exception(
-                    "Seems like %s.%s.list(self) method is broken. "
+                    "Seems like %s.%s.list_pages(self) method is broken. "
                     "It shouldn't raise any exceptions."
                     % (manager.__module__, type(manager).__name__))
 
         if self.admin and (not self.users
                            or self.manager_cls._perform_for_admin_only):
             manager = self.manager_cls(
-                admin=self._get_cached_client(self.admin))
+                admin=self._get_cached_client(self.admin),
+                listing_cache=self.listing_cache)
             _publish(self.admin, None, manager)
+            return
 
-        else:
-            visited_tenants = set()
-            admin_client = self._get_cached_client(self.admin)
+        if (self.admin and self.manager_cls._tenant_resource
+                and self.manager_cls._admin_listing
+                and CONF.openstack.cleanup_admin_listing):
+            users = {}
             for user in self.users:
-                if (self.manager_cls._tenant_resource
-                   and user["tenant_id"] in visited_tenants):
-                    continue
+                users.setdefault(user["tenant_id"], user)
+            manager = self.manager_cls(
+                admin=self._get_cached_client(self.admin),
+                listing_cache=self.listing_cache)
+            try:
+                resources = rutils.retry(3, manager.list_all_tenants)
+            except Exception:
+                LOG.exception(
+                    "Seems like %s.%s.list_all_tenants(self) method is "
+                    "broken. Falling back to listing resources of every "
+                    "tenant." % (manager.__module__, type(manager).__name__))
+            else:
+                for tenant_id, raw_resource in resources:
+                    if tenant_id in users:
+                        queue.append((self.admin, users[tenant_id],
+                                      raw_resource))
+                return
+
+        visited_tenants = set()
+        admin_client = self._get_cached_client(self.admin)
+        for user in self.users:
+            if (self.manager_cls._tenant_resource
+               and user["tenant_id"] in visited_tenants):
+                continue
 
-                visited_tenants.add(user["tenant_id"])
-                manager = self.manager_cls(
-                    admin=admin_client,
-                    user=self._get_cached_client(user),
-                    tenant_uuid=user["tenant_id"])
-                _publish(self.admin, user, manager)
+            visited_tenants.add(user["tenant_id"])
+            manager = self.manager_cls(
+                admin=admin_client,
+                user=self._get_cached_client(user),
+                tenant_uuid=user["tenant_id"],
+                listing_cache=self.listing_cache)
+            _publish(self.admin, user, manager)
+
+    def _delete_many_resources(self, managers):
+        """Delete resources by one request falling back to one by one.
+
+        :param managers: list of instances of resource manager initiated with
+                         resources that should be deleted.
+        """
+        if len(managers) > 1:
+            msg_kw = {"count": len(managers),
+                      "service": self.manager_cls._service,
+                      "resource": self.manager_cls._resource}
+            LOG.debug("Deleting %(count)s %(service)s.%(resource)s objects by"
+                      " one request" % msg_kw)
+            try:
+                managers = managers[0].delete_many(managers)
+            except Exception as e:
+                msg = ("Bulk deletion of %(service)s.%(resource)s objects"
+                       " failed, deleting them one by one." % msg_kw)
+                if logging.is_debug():
+                    LOG.exception(msg)
+                else:
+                    LOG.warning("%(msg)s Reason: %(e)s" % {"msg": msg,
+                                                           "e": e})
+        for manager in managers:
+            self._delete_single_resource(manager)
 
     def _consumer(self, cache, args):
         """Method that consumes single deletion job."""
         admin, user, raw_resource = args
 
-        manager = self.manager_cls(
-            resource=raw_resource,
-            admin=self._get_cached_client(admin),
-            user=self._get_cached_client(user),
-            tenant_uuid=user and user["tenant_id"])
+        if isinstance(raw_resource, _BulkDeletion):
+            raw_resources = raw_resource
+        else:
+            raw_resources = [raw_resource]
 
-        if (isinstance(manager.name(), base.NoName) or
-                rutils.name_matches_object(
-                    manager.name(), *self.resource_classes,
-                    task_id=self.task_id, exact=False)):
-            self._delete_single_resource(manager)
+        managers = []
+        for raw_resource in raw_resources:
+            manager = self.manager_cls(
+                resource=raw_resource,
+                admin=self._get_cached_client(admin),
+                user=self._get_cached_client(user),
+                tenant_uuid=user and user["tenant_id"],
+                listing_cache=self.listing_cache)
+
+            if (isinstance(manager.name(), base.NoName) or
+                    rutils.name_matches_object(
+                        manager.name(), *self.resource_classes,
+                        task_id=self.task_id, exact=False)):
+                managers.append(manager)
+
+        self._delete_many_resources(managers)
 
     def exterminate(self):
         """Delete all resources for passed users, admin and resource_mgr."""
 
-        broker.run(self._publisher, self._consumer,
-                   consumers_count=self.manager_cls._threads)
+        _run_streaming(self._publisher, self._consumer,
+                       consumers_count=self.manager_cls._threads)
 
 
 def list_resource_names(admin_required=None):
@@ -239,6 +447,34 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def _split_resource_managers(resource_managers):
+    """Split resource managers into groups which can be processed in parallel.
+
+    :param resource_managers: List of resource managers sorted by `_order`
+    :returns: List of stages which should be processed one after another.
+        Every stage is a list of groups of resource managers. Groups of one
+        stage do not depend on each other and can be processed
+        simultaneously, while resource managers inside one group should be
+        processed in the same order as they are listed.
+    """
+    groups = collections.OrderedDict()
+    final_group = []
+    for manager in resource_managers:
+        if manager._service in _FINAL_SERVICES:
+            final_group.append(manager)
+        elif manager._service in _DEPENDENT_SERVICES:
+            groups.setdefault(None, []).append(manager)
+        else:
+            groups.setdefault(manager._service, []).append(manager)
+
+    stages = []
+    if groups:
+        stages.append(list(groups.values()))
+    if final_group:
+        stages.append([final_group])
+    return stages
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None,
             api_versions=None, superclass=plugin.Plugin, task_id=None):
     """Generic cleaner.
@@ -247,7 +483,8 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     with _service from services or _resource from resources.
 
     Then goes through all passed users and using cleaners cleans all related
-    resources.
+    resources. Resource managers of services which do not depend on each
+    other are processed simultaneously (see `cleanup_groups_threads` option).
 
     :param names: Use only resource managers that have names in this list.
                   There are in as _service or
@@ -280,11 +517,21 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
-    for manager in find_resource_managers(names, admin_required):
-        LOG.debug("Cleaning up %(service)s %(resource)s objects"
-                  % {"service": manager._service,
-                     "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users,
-                       api_versions=api_versions,
-                       resource_classes=resource_classes,
-                       task_id=task_id).exterminate()
+    listing_cache = base.ListingCache()
+
+    def seek_and_destroy(cache, resource_managers):
+        for manager in resource_managers:
+            LOG.debug("Cleaning up %(service)s %(resource)s objects"
+                      % {"service": manager._service,
+                         "resource": manager._resource})
+            SeekAndDestroy(manager, admin, users,
+                           api_versions=api_versions,
+                           resource_classes=resource_classes,
+                           task_id=task_id,
+                           listing_cache=listing_cache).exterminate()
+
+    for groups in _split_resource_managers(
+            find_resource_managers(names, admin_required)):
+        broker.run(lambda queue: queue.extend(groups), seek_and_destroy,
+                   consumers_count=min(len(groups),
+                                       CONF.openstack.cleanup_groups_threads))
@@ -15,12 +15,14 @@
 
 from rally.common import cfg
 from rally.common import logging
+from rally.common import utils as rutils
 from rally.task import utils as task_utils
 
 from rally_openstack.cleanup import base
 from rally_openstack.services.identity import identity
 from rally_openstack.services.image import glance_v2
 from rally_openstack.services.image import image
+from rally_openstack.wrappers import swift
 
 
 CONF = cfg.CONF
@@ -65,16 +67,13 @@ class MagnumMixin(base.ResourceManager):
         """Returns id of resource."""
         return self.raw_resource.uuid
 
+    def list_pages(self):
+        return self._paginate(
+            lambda marker: self._manager().list(marker=marker),
+            lambda r: r.uuid)
+
     def list(self):
-        result = []
-        marker = None
-        while True:
-            resources = self._manager().list(marker=marker)
-            if not resources:
-                break
-            result.extend(resources)
-            marker = resources[-1].uuid
-        return result
+        return [r for page in self.list_pages() for r in page]
 
 
 @base.resource("magnum", "clusters", order=next(_magnum_order),
@@ -91,7 +90,8 @@ class MagnumClusterTemplate(MagnumMixin):
 
 # HEAT
 
-@base.resource("heat", "stacks", order=100, tenant_resource=True)
+@base.resource("heat", "stacks", order=100, tenant_resource=True,
+               batch_polling=True)
 class HeatStack(base.ResourceManager):
     def name(self):
         return self.raw_resource.stack_name
@@ -139,12 +139,23 @@ _nova_order = get_order(200)
 
 
 @base.resource("nova", "servers", order=next(_nova_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_polling=True, admin_listing=True)
 class NovaServer(base.ResourceManager):
     def list(self):
         """List all servers."""
         return self._manager().list(limit=-1)
 
+    def list_pages(self):
+        # NOTE: nova looks up markers among deleted servers as well
+        return self._paginate(
+            lambda marker: self._manager().list(marker=marker, limit=1000),
+            lambda r: r.id, stable_markers=True)
+
+    def list_all_tenants(self):
+        servers = self.admin.nova().servers.list(
+            search_opts={"all_tenants": True}, limit=-1)
+        return [(s.tenant_id, s) for s in servers]
+
     def delete(self):
         if getattr(self.raw_resource, "OS-EXT-STS:locked", False):
             self.raw_resource.unlock()
@@ -262,6 +273,7 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
     def delete(self):
         delete_method = getattr(self._manager(), "delete_%s" % self._resource)
         delete_method(self.id())
+        self._listing_cache.invalidate(self._service, self._plural_key)
 
     @property
     def _plural_key(self):
@@ -270,13 +282,33 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
         else:
             return self._resource + "s"
 
+    def _list_resources(self, resources):
+        """List resources of the tenant using the shared listing cache.
+
+        If admin is available, resources of all tenants are listed only once
+        per cleanup and the result is partitioned by tenant, otherwise
+        resources are listed once per tenant.
+        """
+        if self.admin:
+            client = getattr(self.admin, self._service)()
+            key = (self._service, resources, None)
+            kwargs = {}
+        else:
+            client = self._manager()
+            key = (self._service, resources, self.tenant_uuid)
+            kwargs = {"tenant_id": self.tenant_uuid}
+        list_method = getattr(client, "list_%s" % resources)
+        return self._listing_cache.list(
+            key, lambda: list_method(**kwargs)[resources],
+            tenant_uuid=self.tenant_uuid)
+
     def list(self):
-        list_method = getattr(self._manager(), "list_%s" % self._plural_key)
-        result = list_method(tenant_id=self.tenant_uuid)[self._plural_key]
-        if self.tenant_uuid:
-            result = [r for r in result if r["tenant_id"] == self.tenant_uuid]
+        return self._list_resources(self._plural_key)
 
-        return result
+    def list_undeleted_ids(self):
+        # NOTE: The cached listing cannot be used to check the deletion
+        self._listing_cache.invalidate(self._service, self._plural_key)
+        return super(NeutronMixin, self).list_undeleted_ids()
 
 
 class NeutronLbaasV1Mixin(NeutronMixin):
@@ -314,7 +346,7 @@ class NeutronLbaasV2Mixin(NeutronMixin):
 
 
 @base.resource("neutron", "loadbalancer", order=next(_neutron_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_polling=True)
 class NeutronV2Loadbalancer(NeutronLbaasV2Mixin):
 
     def is_deleted(self):
@@ -460,19 +492,8 @@ class NeutronPort(NeutronMixin):
 
     ROUTER_GATEWAY_OWNER = "network:router_gateway"
 
-    def __init__(self, *args, **kwargs):
-        super(NeutronPort, self).__init__(*args, **kwargs)
-        self._cache = {}
-
-    def _get_resources(self, resource):
-        if resource not in self._cache:
-            resources = getattr(self._manager(), "list_%s" % resource)()
-            self._cache[resource] = [r for r in resources[resource]
-                                     if r["tenant_id"] == self.tenant_uuid]
-        return self._cache[resource]
-
     def list(self):
-        ports = self._get_resources("ports")
+        ports = self._list_resources("ports")
         for port in ports:
             if not port.get("name"):
                 parent_name = None
@@ -482,7 +503,7 @@ class NeutronPort(NeutronMixin):
                     #   the subnet
                     # second case is a port created while adding gateway for
                     #   the network
-                    port_router = [r for r in self._get_resources("routers")
+                    port_router = [r for r in self._list_resources("routers")
                                    if r["id"] == port["device_id"]]
                     if port_router:
                         parent_name = port_router[0]["name"]
@@ -512,6 +533,7 @@ class NeutronPort(NeutronMixin):
                 # Port can be already auto-deleted, skip silently
                 LOG.debug("Port %s was not deleted. Skip silently because "
                           "port can be already auto-deleted." % self.id())
+        self._listing_cache.invalidate(self._service, "ports")
 
 
 @base.resource("neutron", "subnet", order=next(_neutron_order),
@@ -586,9 +608,14 @@ class CinderVolumeTransfer(base.ResourceManager):
 
 
 @base.resource("cinder", "volumes", order=next(_cinder_order),
-               tenant_resource=True)
+               tenant_resource=True, batch_polling=True, admin_listing=True)
 class CinderVolume(base.ResourceManager):
-    pass
+
+    def list_all_tenants(self):
+        volumes = self.admin.cinder().volumes.list(
+            search_opts={"all_tenants": True})
+        return [(getattr(v, "os-vol-tenant-attr:tenant_id", None), v)
+                for v in volumes]
 
 
 @base.resource("cinder", "image_volumes_cache", order=next(_cinder_order),
@@ -652,7 +679,8 @@ class ManilaSecurityService(base.ResourceManager):
 
 # GLANCE
 
-@base.resource("glance", "images", order=500, tenant_resource=True)
+@base.resource("glance", "images", order=500, tenant_resource=True,
+               admin_listing=True)
 class GlanceImage(base.ResourceManager):
 
     def _client(self):
@@ -664,6 +692,12 @@ class GlanceImage(base.ResourceManager):
                                                owner=self.tenant_uuid))
         return images
 
+    def list_all_tenants(self):
+        client = self._client()
+        images = (client.list_images()
+                  + client.list_images(status="deactivated"))
+        return [(i.owner, i) for i in images]
+
     def delete(self):
         client = self._client()
         if self.raw_resource.status == "deactivated":
@@ -822,18 +856,17 @@ class DesignateServer(DesignateResource):
                tenant_resource=True, threads=1)
 class DesignateZones(DesignateResource):
 
-    def list(self):
-        marker = None
+    def list_pages(self):
         criterion = {"name": "%s*" % self.NAME_PREFIX}
+        return self._paginate(
+            lambda marker: self._manager().list(marker=marker, limit=100,
+                                                criterion=criterion),
+            lambda item: item["id"])
 
-        while True:
-            items = self._manager().list(marker=marker, limit=100,
-                                         criterion=criterion)
-            if not items:
-                break
-            for item in items:
+    def list(self):
+        for page in self.list_pages():
+            for item in page:
                 yield item
-            marker = items[-1]["id"]
 
 
 # SWIFT
@@ -868,16 +901,30 @@ class SwiftMixin(SynchronizedDeletion, base.ResourceManager):
                tenant_resource=True)
 class SwiftObject(SwiftMixin):
 
-    def list(self):
-        object_list = []
-        containers = self._manager().get_account(full_listing=True)[1]
+    def list_pages(self):
+        containers = rutils.retry(
+            3, self._manager().get_account, full_listing=True)[1]
         for con in containers:
-            objects = self._manager().get_container(con["name"],
-                                                    full_listing=True)[1]
-            for obj in objects:
-                raw_resource = [con["name"], obj["name"]]
-                object_list.append(raw_resource)
-        return object_list
+            def list_page(marker, container=con["name"]):
+                return self._manager().get_container(container,
+                                                     marker=marker)[1]
+
+            # NOTE: markers of swift are just names, objects with them
+            #   do not need to exist
+            for page in self._paginate(list_page, lambda obj: obj["name"],
+                                       stable_markers=True):
+                yield [[con["name"], obj["name"]] for obj in page]
+
+    def list(self):
+        return [r for page in self.list_pages() for r in page]
+
+    def bulk_delete_limit(self):
+        return swift.get_bulk_delete_limit(self._manager())
+
+    def delete_many(self, resources):
+        failed = swift.bulk_delete(self._manager(),
+                                   [tuple(r.raw_resource) for r in resources])
+        return [r for r in resources if tuple(r.raw_resource) in failed]
 
 
 @base.resource("swift", "container", order=next(_swift_order),
@@ -989,20 +1036,18 @@ class GnocchiMetric(GnocchiMixin):
     def id(self):
         return self.raw_resource["id"]
 
-    def list(self):
-        result = []
-        marker = None
-        while True:
-            metrics = self._manager().list(marker=marker)
-            if not metrics:
-                break
-            result.extend(metrics)
-            marker = metrics[-1]["id"]
-        if self.tenant_uuid:
-            result = [r for r in result
-                      if r["creator"].partition(":")[2] == self.tenant_uuid]
+    def list_pages(self):
+        pages = self._paginate(
+            lambda marker: self._manager().list(marker=marker),
+            lambda r: r["id"])
+        for page in pages:
+            if self.tenant_uuid:
+                page = [r for r in page
+                        if r["creator"].partition(":")[2] == self.tenant_uuid]
+            yield page
 
-        return result
+    def list(self):
+        return [r for page in self.list_pages() for r in page]
 
 
 @base.resource("gnocchi", "resource", order=next(_gnocchi_order),
@@ -1022,17 +1067,13 @@ class GnocchiResource(GnocchiMixin):
             return True
         return False
 
+    def list_pages(self):
+        return self._paginate(
+            lambda marker: self._manager().list(marker=marker),
+            lambda r: r["id"])
+
     def list(self):
-        result = []
-        marker = None
-        while True:
-            resources = self._manager().list(marker=marker)
-            if not resources:
-                break
-            result.extend(resources)
-            marker = resources[-1]["id"]
-
-        return result
+        return [r for page in self.list_pages() for r in page]
 
 
 # WATCHER
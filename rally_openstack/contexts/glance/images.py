@@ -12,15 +12,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from rally.common import broker
 from rally.common import cfg
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import validation
+from rally import exceptions
 from rally.task import context
 
 from rally_openstack.cleanup import manager as resource_manager
 from rally_openstack import consts
 from rally_openstack import osclients
+from rally_openstack.services.image import cache as image_cache
+from rally_openstack.services.image import glance_v2
 from rally_openstack.services.image import image
 
 
@@ -97,6 +101,21 @@ class ImageGenerator(context.Context):
                 "enum": ["qcow2", "raw", "vhd", "vmdk", "vdi", "iso", "aki",
                          "ari", "ami"],
             },
+            "resource_management_workers": {
+                "description": "The number of images to upload "
+                               "simultaneously.",
+                "type": "integer",
+                "minimum": 1
+            },
+            "share_images": {
+                "description": "Upload images to the first tenant only and "
+                               "share them with all other tenants. Images "
+                               "with 'private' visibility are shared via "
+                               "image members of Glance V2, 'community' and "
+                               "'public' images are available to all "
+                               "tenants as is.",
+                "type": "boolean"
+            },
         },
         "oneOf": [{"description": "It is been used since Rally 0.10.0",
                    "required": ["image_url", "disk_format",
@@ -113,7 +132,8 @@ class ImageGenerator(context.Context):
         "additionalProperties": False
     }
 
-    DEFAULT_CONFIG = {"images_per_tenant": 1}
+    DEFAULT_CONFIG = {"images_per_tenant": 1,
+                      "resource_management_workers": 10}
 
     def setup(self):
         image_url = self.config.get("image_url")
@@ -159,25 +179,124 @@ class ImageGenerator(context.Context):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            current_images = []
-            clients = osclients.Clients(user["credential"])
-            image_service = image.Image(
-                clients, name_generator=self.generate_random_name)
+        # NOTE: URLs are downloaded once and all tenants upload the data
+        #   from the local copy
+        image_location = image_cache.get_image_location(image_url)
+
+        if self.config.get("share_images"):
+            self._create_shared_images(
+                image_name=image_name,
+                container_format=container_format,
+                image_location=image_location,
+                disk_format=disk_format,
+                visibility=visibility,
+                min_disk=min_disk,
+                min_ram=min_ram)
+            return
+
+        images_num = len(self.context["tenants"]) * images_per_tenant
+
+        def publish(queue):
+            for user, tenant_id in rutils.iterate_per_tenants(
+                    self.context["users"]):
+                self.context["tenants"][tenant_id]["images"] = []
+                for i in range(images_per_tenant):
+                    queue.append((user, tenant_id))
+
+        def consume(cache, args):
+            user, tenant_id = args
+            if tenant_id not in cache:
+                clients = osclients.Clients(user["credential"])
+                cache[tenant_id] = image.Image(
+                    clients, name_generator=self.generate_random_name)
+            image_obj = cache[tenant_id].create_image(
+                image_name=image_name,
+                container_format=container_format,
+                image_location=image_location,
+                disk_format=disk_format,
+                visibility=visibility,
+                min_disk=min_disk,
+                min_ram=min_ram)
+            self.context["tenants"][tenant_id]["images"].append(image_obj.id)
+
+        threads = min(self.config["resource_management_workers"],
+                      images_num)
+        LOG.debug("Creating %d images using %d threads."
+                  % (images_num, threads))
+        broker.run(publish, consume, threads)
 
+        images_count = sum(len(t.get("images", []))
+                           for t in self.context["tenants"].values())
+        if images_count != images_num:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to create the requested number of images, "
+                    "expected %(expected)s but got %(actual)s."
+                    % {"expected": images_num, "actual": images_count})
+
+    def _create_shared_images(self, **image_args):
+        images_per_tenant = self.config["images_per_tenant"]
+        users = list(rutils.iterate_per_tenants(self.context["users"]))
+        owner, owner_tenant_id = users[0]
+        if image_args["visibility"] == "private":
+            image_args["visibility"] = "shared"
+        images = []
+
+        def publish(queue):
             for i in range(images_per_tenant):
-                image_obj = image_service.create_image(
-                    image_name=image_name,
-                    container_format=container_format,
-                    image_location=image_url,
-                    disk_format=disk_format,
-                    visibility=visibility,
-                    min_disk=min_disk,
-                    min_ram=min_ram)
-                current_images.append(image_obj.id)
-
-            self.context["tenants"][tenant_id]["images"] = current_images
+                queue.append(i)
+
+        def consume(cache, i):
+            if "image" not in cache:
+                cache["image"] = image.Image(
+                    osclients.Clients(owner["credential"]),
+                    name_generator=self.generate_random_name)
+            images.append(cache["image"].create_image(**image_args).id)
+
+        broker.run(publish, consume,
+                   min(self.config["resource_management_workers"],
+                       images_per_tenant))
+        self.context["tenants"][owner_tenant_id]["images"] = list(images)
+        if len(images) != images_per_tenant:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to create the requested number of images, "
+                    "expected %(expected)s but got %(actual)s."
+                    % {"expected": images_per_tenant,
+                       "actual": len(images)})
+
+        def publish_members(queue):
+            for user, tenant_id in users[1:]:
+                queue.append((user, tenant_id))
+
+        def consume_members(cache, args):
+            user, tenant_id = args
+            if image_args["visibility"] == "shared":
+                if "owner" not in cache:
+                    cache["owner"] = glance_v2.GlanceV2Service(
+                        osclients.Clients(owner["credential"]))
+                member = glance_v2.GlanceV2Service(
+                    osclients.Clients(user["credential"]))
+                for image_id in images:
+                    cache["owner"].add_member(image_id, member_id=tenant_id)
+                    member.update_member_status(image_id,
+                                                member_id=tenant_id,
+                                                member_status="accepted")
+            self.context["tenants"][tenant_id]["images"] = list(images)
+
+        LOG.debug("Sharing %d images of tenant %s with %d tenants."
+                  % (len(images), owner_tenant_id, len(users) - 1))
+        broker.run(publish_members, consume_members,
+                   min(self.config["resource_management_workers"],
+                       max(len(users) - 1, 1)))
+
+        shared_num = len([t for t in self.context["tenants"].values()
+                          if "images" in t])
+        if shared_num != len(users):
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to share images with %d tenants."
+                    % (len(users) - shared_num))
 
     def cleanup(self):
         if self.context.get("admin", {}):
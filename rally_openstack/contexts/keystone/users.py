@@ -111,6 +111,10 @@ class UserGenerator(context.Context):
         super(UserGenerator, self).__init__(context)
 
         creds = self.env["platforms"]["openstack"]
+        # NOTE: versions saved by check_health of the platform save the
+        #   keystone discovery request for every credential
+        osclients.update_discovered_keystone_versions(
+            creds.get("keystone_versions", {}))
         if creds.get("admin"):
             admin_cred = copy.deepcopy(creds["admin"])
             api_info = copy.deepcopy(creds.get("api_info", {}))
@@ -322,16 +326,67 @@ class UserGenerator(context.Context):
                 "id": user_id,
                 "tenant_id": tenant_id
             })
+            if cfg.CONF.openstack.users_context_token_pool:
+                # NOTE: the user is already authenticated, so the token
+                #   costs nothing
+                self.context["users_tokens"][user_id] = (
+                    user_clients.keystone.dump_token())
+
+    def _authenticate_users(self):
+        """Fill the pool of tokens of created users.
+
+        Users which fail to authenticate are skipped, they authenticate by
+        password in scenarios.
+        """
+        threads = min(self.config["resource_management_workers"],
+                      len(self.context["users"]))
+        tokens = self.context["users_tokens"]
+
+        def publish(queue):
+            for user in self.context["users"]:
+                queue.append(user)
+
+        def consume(cache, user):
+            try:
+                tokens[user["id"]] = osclients.Clients(
+                    user["credential"]).keystone.dump_token()
+            except Exception as e:
+                LOG.warning("Failed to authenticate user %s: %s"
+                            % (user["id"], e))
+
+        LOG.debug("Authenticating %(users)d users using %(threads)s threads"
+                  % {"users": len(self.context["users"]), "threads": threads})
+        broker.run(publish, consume, threads)
 
     def setup(self):
         self.context["users"] = []
         self.context["tenants"] = {}
+        self.context["users_tokens"] = {}
         self.context["user_choice_method"] = self.config["user_choice_method"]
 
         if self.existing_users:
             self.use_existing_users()
         else:
             self.create_users()
+            if cfg.CONF.openstack.users_context_token_pool:
+                self._authenticate_users()
+
+        self._build_round_robin_index()
+
+    def _build_round_robin_index(self):
+        """Order users for 'round_robin' choice method once per workload.
+
+        The index is a tuple of (tenant_id, tuple of users) pairs sorted by
+        tenant id, so scenarios pick a user without sorting tenants on
+        every iteration.
+        """
+        users = collections.defaultdict(list)
+        for user in self.context["users"]:
+            users[user["tenant_id"]].append(user)
+        self.context["users_round_robin"] = tuple(
+            (tenant_id, tuple(users[tenant_id]))
+            for tenant_id in sorted(self.context["tenants"])
+            if users[tenant_id])
 
     def cleanup(self):
         """Delete tenants and users, using the broker pattern."""
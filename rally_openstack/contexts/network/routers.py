@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from rally.common import broker
+from rally.common import logging
 from rally.common import utils
 from rally.common import validation
+from rally import exceptions
 from rally.task import context
 
 from rally_openstack.cleanup import manager as resource_manager
@@ -22,6 +25,9 @@ from rally_openstack import consts
 from rally_openstack.scenarios.neutron import utils as neutron_utils
 
 
+LOG = logging.getLogger(__name__)
+
+
 @validation.add("required_platform", platform="openstack", admin=True,
                 users=True)
 @context.configure(name="router", platform="openstack", order=351)
@@ -79,6 +85,12 @@ class Router(context.Context):
             "availability_zone_hints": {
                 "description": "Require router_availability_zone extension.",
                 "type": "boolean"
+            },
+            "resource_management_workers": {
+                "description": "The number of routers to create "
+                               "simultaneously.",
+                "type": "integer",
+                "minimum": 1
             }
         },
         "additionalProperties": False
@@ -86,6 +98,7 @@ class Router(context.Context):
 
     DEFAULT_CONFIG = {
         "routers_per_tenant": 1,
+        "resource_management_workers": 10
     }
 
     def setup(self):
@@ -96,16 +109,40 @@ class Router(context.Context):
         for parameter in parameters:
             if parameter in self.config:
                 kwargs[parameter] = self.config[parameter]
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
-            self.context["tenants"][tenant_id]["routers"] = []
-            scenario = neutron_utils.NeutronScenario(
-                context={"user": user, "task": self.context["task"],
-                         "owner_id": self.context["owner_id"]}
-            )
-            for i in range(self.config["routers_per_tenant"]):
-                router = scenario._create_router(kwargs)
-                self.context["tenants"][tenant_id]["routers"].append(router)
+
+        def publish(queue):
+            for user, tenant_id in (utils.iterate_per_tenants(
+                    self.context.get("users", []))):
+                self.context["tenants"][tenant_id]["routers"] = []
+                for i in range(self.config["routers_per_tenant"]):
+                    queue.append((user, tenant_id))
+
+        def consume(cache, args):
+            user, tenant_id = args
+            # NOTE: every worker thread uses own clients
+            if tenant_id not in cache:
+                cache[tenant_id] = neutron_utils.NeutronScenario(
+                    context={"user": user, "task": self.context["task"],
+                             "owner_id": self.context["owner_id"]}
+                )
+            router = cache[tenant_id]._create_router(kwargs)
+            self.context["tenants"][tenant_id]["routers"].append(router)
+
+        routers_num = (len(self.context["tenants"])
+                       * self.config["routers_per_tenant"])
+        threads = self.config["resource_management_workers"]
+        LOG.debug("Creating %d routers using %d threads."
+                  % (routers_num, threads))
+        broker.run(publish, consume, threads)
+
+        routers_count = sum(len(t.get("routers", []))
+                            for t in self.context["tenants"].values())
+        if routers_count != routers_num:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to create the requested number of routers, "
+                    "expected %(expected)s but got %(actual)s."
+                    % {"expected": routers_num, "actual": routers_count})
 
     def cleanup(self):
         resource_manager.cleanup(
@@ -13,12 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally.common import broker
 from rally.common import utils as rutils
 
 from rally_openstack.scenarios.swift import utils as swift_utils
+from rally_openstack.wrappers import swift as swift_wrapper
 
 
 class SwiftObjectMixin(object):
@@ -52,7 +51,7 @@ class SwiftObjectMixin(object):
             container_name = cache[user["id"]]._create_container()
             tenant_containers.append({"user": user,
                                       "container": container_name,
-                                      "objects": []})
+                                      "objects": set()})
             containers.append((user["tenant_id"], container_name))
 
         broker.run(publish, consume, threads)
@@ -73,31 +72,26 @@ class SwiftObjectMixin(object):
         """
         objects = []
 
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-
-            def publish(queue):
-                for tenant_id in context["tenants"]:
-                    containers = context["tenants"][tenant_id]["containers"]
-                    for container in containers:
-                        for i in range(objects_per_container):
-                            queue.append(container)
-
-            def consume(cache, container):
-                user = container["user"]
-                if user["id"] not in cache:
-                    cache[user["id"]] = swift_utils.SwiftScenario(
-                        {"user": user, "task": context.get("task", {})})
-                dummy_file.seek(0)
-                object_name = cache[user["id"]]._upload_object(
-                    container["container"],
-                    dummy_file)[1]
-                container["objects"].append(object_name)
-                objects.append((user["tenant_id"], container["container"],
-                                object_name))
-
-            broker.run(publish, consume, threads)
+        def publish(queue):
+            for tenant_id in context["tenants"]:
+                containers = context["tenants"][tenant_id]["containers"]
+                for container in containers:
+                    for i in range(objects_per_container):
+                        queue.append(container)
+
+        def consume(cache, container):
+            user = container["user"]
+            if user["id"] not in cache:
+                cache[user["id"]] = swift_utils.SwiftScenario(
+                    {"user": user, "task": context.get("task", {})})
+            object_name = cache[user["id"]]._upload_object(
+                container["container"],
+                swift_utils.ObjectPayload(object_size))[1]
+            container["objects"].add(object_name)
+            objects.append((user["tenant_id"], container["container"],
+                            object_name))
+
+        broker.run(publish, consume, threads)
 
         return objects
 
@@ -128,25 +122,49 @@ class SwiftObjectMixin(object):
     def _delete_objects(self, context, threads):
         """Delete objects created by Swift context and update Rally context.
 
+        Objects are deleted by bulk-delete requests in chunks of the size
+        advertised by the cluster or one by one if bulk-delete middleware is
+        not enabled.
+
         :param context: dict, Rally context environment
         :param threads: int, number of threads to use for broker pattern
         """
         def publish(queue):
+            limit = None
             for tenant_id in context["tenants"]:
                 containers = context["tenants"][tenant_id]["containers"]
                 for container in containers:
-                    for object_name in container["objects"][:]:
-                        args = object_name, container
+                    if limit is None:
+                        limit = swift_wrapper.get_bulk_delete_limit(
+                            self._get_swift_scenario(
+                                context, {}, container["user"]).clients(
+                                    "swift"))
+                    object_names = list(container["objects"])
+                    step = limit or 1
+                    for i in range(0, len(object_names), step):
+                        args = object_names[i:i + step], container
                         queue.append(args)
 
         def consume(cache, args):
-            object_name, container = args
-            user = container["user"]
-            if user["id"] not in cache:
-                cache[user["id"]] = swift_utils.SwiftScenario(
-                    {"user": user, "task": context.get("task", {})})
-            cache[user["id"]]._delete_object(container["container"],
-                                             object_name)
-            container["objects"].remove(object_name)
+            object_names, container = args
+            scenario = self._get_swift_scenario(context, cache,
+                                                container["user"])
+            if len(object_names) > 1:
+                failed = swift_wrapper.bulk_delete(
+                    scenario.clients("swift"),
+                    [(container["container"], name) for name in object_names])
+                container["objects"].difference_update(
+                    set(object_names) - set(name for _c, name in failed))
+                object_names = sorted(name for _c, name in failed)
+            for object_name in object_names:
+                scenario._delete_object(container["container"], object_name)
+                container["objects"].discard(object_name)
 
         broker.run(publish, consume, threads)
+
+    @staticmethod
+    def _get_swift_scenario(context, cache, user):
+        if user["id"] not in cache:
+            cache[user["id"]] = swift_utils.SwiftScenario(
+                {"user": user, "task": context.get("task", {})})
+        return cache[user["id"]]
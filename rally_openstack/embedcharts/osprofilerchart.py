@@ -14,12 +14,14 @@
 
 import json
 import os
+import threading
 
 from rally.common import cfg
 from rally.common import logging
 from rally.common import opts
 from rally.common.plugin import plugin
 from rally.task.processing import charts
+from six.moves import queue
 
 import rally_openstack
 
@@ -44,7 +46,14 @@ OPTS = {
                  "(embed only trace id), 'raw' (embed raw osprofiler's native "
                  "report) or a path to directory (raw osprofiler's native "
                  "reports for each iteration will be saved separately there "
-                 "to decrease the size of rally report itself)")
+                 "to decrease the size of rally report itself)"),
+        cfg.IntOpt(
+            "osprofiler_chart_workers",
+            default=10,
+            min=1,
+            help="Number of threads fetching OSProfiler's traces and saving "
+                 "reports in case of a path to directory used as "
+                 "osprofiler_chart_mode")
     ]
 }
 
@@ -60,20 +69,73 @@ def _datetime_json_serialize(obj):
         return obj
 
 
+class _ReportWriter(object):
+    """Saves reports to files by a limited number of threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._workers = []
+
+    def submit(self, func, *args):
+        with self._lock:
+            self._queue.put((func, args))
+            self._workers = [w for w in self._workers if w.is_alive()]
+            if len(self._workers) < CONF.openstack.osprofiler_chart_workers:
+                # NOTE: the threads are not daemonic, so the process waits
+                #   for all reports to be saved before exiting
+                worker = threading.Thread(target=self._work)
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            with self._lock:
+                try:
+                    func, args = self._queue.get_nowait()
+                except queue.Empty:
+                    self._workers.remove(threading.current_thread())
+                    return
+            try:
+                func(*args)
+            except Exception:
+                LOG.exception("Failed to save OSProfiler's report.")
+
+    def wait(self):
+        """Wait for all submitted reports to be saved."""
+        while True:
+            with self._lock:
+                workers = list(self._workers)
+            if not workers:
+                return
+            for worker in workers:
+                worker.join()
+
+
 @plugin.configure(name="OSProfiler")
 class OSProfilerChart(OutputEmbeddedChart,
                       OutputEmbeddedExternalChart,
                       charts.OutputTextArea):
     """Chart for embedding OSProfiler data."""
 
+    _opts_registered = False
+    _template = None
+    _lock = threading.Lock()
+    _writer = _ReportWriter()
+
     @classmethod
     def _fetch_osprofiler_data(cls, connection_str, trace_id):
         from osprofiler.drivers import base
         from osprofiler import opts as osprofiler_opts
 
-        opts.register_opts(osprofiler_opts.list_opts())
+        with cls._lock:
+            if not cls._opts_registered:
+                opts.register_opts(osprofiler_opts.list_opts())
+                cls._opts_registered = True
 
         try:
+            # NOTE: a driver keeps the state of the report it builds, so it
+            #   can not be shared by several reports or threads
             engine = base.get_driver(connection_str)
         except Exception:
             msg = "Error while fetching OSProfiler results."
@@ -87,17 +149,29 @@ class OSProfilerChart(OutputEmbeddedChart,
 
     @classmethod
     def _generate_osprofiler_report(cls, osp_data):
-        from osprofiler import cmd
+        if cls._template is None:
+            from osprofiler import cmd
 
-        path = "%s/template.html" % os.path.dirname(cmd.__file__)
-        with open(path) as f:
-            html_obj = f.read()
+            path = "%s/template.html" % os.path.dirname(cmd.__file__)
+            with open(path) as f:
+                cls._template = f.read()
 
         osp_data = json.dumps(osp_data,
-                              indent=4,
-                              separators=(",", ": "),
+                              separators=(",", ":"),
                               default=_datetime_json_serialize)
-        return html_obj.replace("$DATA", osp_data).replace("$LOCAL", "false")
+        return cls._template.replace("$DATA", osp_data).replace("$LOCAL",
+                                                                "false")
+
+    @classmethod
+    def _save_osprofiler_report(cls, connection_str, trace_id, path):
+        osp_data = cls._fetch_osprofiler_data(connection_str, trace_id)
+        if osp_data:
+            osp_report = cls._generate_osprofiler_report(osp_data)
+        else:
+            osp_report = ("<html><body>Failed to fetch OSProfiler's trace "
+                          "%s.</body></html>" % trace_id)
+        with open(path, "w") as f:
+            f.write(osp_report)
 
     @classmethod
     def _return_raw_response_for_complete_data(cls, data):
@@ -116,6 +190,29 @@ class OSProfilerChart(OutputEmbeddedChart,
             #   used  before rally-openstack 1.5.0 .
             data["data"]["trace_id"] = data["data"]["trace_id"][0]
 
+        external = (mode and mode not in ("text", "raw")
+                    and "workload_uuid" in data["data"]
+                    and rally_openstack.__rally_version__ >= (1, 5, 0))
+        if data["data"].get("conn_str") and external:
+            # NOTE: only the path of the report is embedded, so traces are
+            #   fetched and reports are saved in background by several
+            #   threads while the rest of rally report is generated
+            workload_uuid = data["data"]["workload_uuid"]
+            iteration = data["data"]["iteration"]
+            file_name = "w_%s-%s.html" % (workload_uuid, iteration)
+            path = os.path.join(mode, file_name)
+            cls._writer.submit(cls._save_osprofiler_report,
+                               data["data"]["conn_str"],
+                               data["data"]["trace_id"], path)
+            return OutputEmbeddedExternalChart.render_complete_data(
+                {
+                    "title": "{0} : {1}".format(data["title"],
+                                                data["data"]["trace_id"]),
+                    "widget": "EmbeddedChart",
+                    "data": path
+                }
+            )
+
         if data["data"].get("conn_str") and mode != "text":
             osp_data = cls._fetch_osprofiler_data(
                 data["data"]["conn_str"],
@@ -136,22 +233,6 @@ class OSProfilerChart(OutputEmbeddedChart,
                     "widget": "EmbeddedChart",
                     "data": osp_report.replace("/script>", "\\/script>")
                 }
-            elif (mode and mode != "raw") and "workload_uuid" in data["data"]:
-                # NOTE(andreykurilin): we need to rework our charts plugin
-                #   mechanism so it is available out of box
-                workload_uuid = data["data"]["workload_uuid"]
-                iteration = data["data"]["iteration"]
-                file_name = "w_%s-%s.html" % (workload_uuid, iteration)
-                path = os.path.join(mode, file_name)
-                with open(path, "w") as f:
-                    f.write(osp_report)
-                return OutputEmbeddedExternalChart.render_complete_data(
-                    {
-                        "title": title,
-                        "widget": "EmbeddedChart",
-                        "data": path
-                    }
-                )
             else:
                 return OutputEmbeddedChart.render_complete_data(
                     {"title": title,
@@ -29,6 +29,24 @@ from rally_openstack import credential as oscred
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+# NOTE: the lowest available keystone API version per auth_url. It is shared
+#   by all credentials of the process, so the unversioned discovery request
+#   is made once per cloud instead of once per user.
+_DISCOVERED_KEYSTONE_VERSIONS = {}
+
+
+def get_discovered_keystone_versions():
+    """Return a copy of discovered keystone versions keyed by auth_url."""
+    return dict(_DISCOVERED_KEYSTONE_VERSIONS)
+
+
+def update_discovered_keystone_versions(versions):
+    """Extend the discovery cache, e.g. by the data saved in an env.
+
+    :param versions: a dict of keystone API versions keyed by auth_url
+    """
+    _DISCOVERED_KEYSTONE_VERSIONS.update(versions)
+
 
 class AuthenticationFailed(exceptions.AuthenticationFailed):
     error_code = 220
@@ -288,6 +306,31 @@ class Keystone(OSClient):
             raise e
         return self.cache["keystone_auth_ref"]
 
+    def dump_token(self):
+        """Return the token of the credential as a serializable dict.
+
+        The result can be passed as `token` argument of Clients to reuse the
+        token instead of authenticating the credential once again.
+        """
+        auth_ref = self.auth_ref
+        return {"auth_token": auth_ref.auth_token,
+                "expires_at": auth_ref.expires.isoformat(),
+                "body": auth_ref._data}
+
+    def _load_token(self):
+        """Return access info of the pooled token if it is still usable."""
+        token = self.cache.get("keystone_token")
+        if not token:
+            return None
+        from keystoneauth1 import access
+
+        auth_ref = access.create(body=token["body"],
+                                 auth_token=token["auth_token"])
+        if auth_ref.will_expire_soon(
+                CONF.openstack.users_context_token_min_lifetime):
+            return None
+        return auth_ref
+
     def get_session(self, version=None):
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
@@ -295,6 +338,21 @@ class Keystone(OSClient):
             from keystoneauth1 import identity
             from keystoneauth1 import session
 
+            auth_ref = self._load_token()
+            if auth_ref is not None:
+                from keystoneauth1.identity import access
+
+                identity_plugin = access.AccessInfoPlugin(
+                    auth_ref, auth_url=self.credential.auth_url)
+                sess = session.Session(
+                    auth=identity_plugin,
+                    verify=(self.credential.https_cacert or
+                            not self.credential.https_insecure),
+                    cert=self.credential.https_cert,
+                    timeout=CONF.openstack_client_http_timeout)
+                self.cache[key] = (sess, identity_plugin)
+                return self.cache[key]
+
             version = self.choose_version(version)
             auth_url = self.credential.auth_url
             if version is not None:
@@ -307,6 +365,8 @@ class Keystone(OSClient):
                 "tenant_name": self.credential.tenant_name
             }
 
+            if version is None:
+                version = _DISCOVERED_KEYSTONE_VERSIONS.get(auth_url)
             if version is None:
                 # NOTE(rvasilets): If version not specified than we discover
                 # available version with the smallest number. To be able to
@@ -319,6 +379,7 @@ class Keystone(OSClient):
                 version = str(discover.Discover(
                     temp_session,
                     password_args["auth_url"]).version_data()[0]["version"][0])
+                _DISCOVERED_KEYSTONE_VERSIONS[auth_url] = version
 
             if "v2.0" not in password_args["auth_url"] and version != "2":
                 password_args.update({
@@ -888,10 +949,21 @@ class Barbican(OSClient):
 class Clients(object):
     """This class simplify and unify work with OpenStack python clients."""
 
-    def __init__(self, credential, api_info=None, cache=None):
+    def __init__(self, credential, api_info=None, cache=None, token=None):
+        """Init clients.
+
+        :param credential: an instance of OpenStackCredential
+        :param api_info: deprecated, use api_info of credential instead
+        :param cache: a dict to cache initialized clients in
+        :param token: a token of the credential returned by
+            Keystone.dump_token(). It is used instead of authentication by
+            password until it is close to expiration.
+        """
         self.credential = credential
         self.api_info = api_info or {}
         self.cache = cache or {}
+        if token:
+            self.cache["keystone_token"] = token
 
     def __getattr__(self, client_name):
         """Lazy load of clients."""
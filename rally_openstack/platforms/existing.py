@@ -17,6 +17,7 @@ import json
 import traceback
 
 from rally.common import cfg
+from rally.common import db
 from rally.common import logging
 from rally.env import platform
 from rally_openstack import osclients
@@ -169,6 +170,7 @@ class OpenStack(platform.Platform):
     def check_health(self):
         """Check whatever platform is alive."""
 
+        platform_data = copy.deepcopy(self.platform_data)
         users_to_check = self.platform_data["users"]
         if self.platform_data["admin"]:
             users_to_check.append(self.platform_data["admin"])
@@ -239,8 +241,27 @@ class OpenStack(platform.Platform):
                     "traceback": traceback.format_exc()
                 }
 
+        self._save_keystone_versions(platform_data)
         return {"available": True}
 
+    def _save_keystone_versions(self, platform_data):
+        """Store keystone versions discovered while checking the creds.
+
+        The saved versions are loaded by users@openstack context, so clients
+        of the environment credentials skip the unversioned discovery.
+        """
+        discovered = osclients.get_discovered_keystone_versions()
+        users = platform_data["users"] + [platform_data["admin"]]
+        versions = dict((u["auth_url"], discovered[u["auth_url"]])
+                        for u in users
+                        if u and u["auth_url"] in discovered)
+        if not self.uuid or not versions or versions == platform_data.get(
+                "keystone_versions"):
+            return
+        platform_data["keystone_versions"] = versions
+        db.platform_set_data(self.uuid, platform_data=platform_data)
+        self.platform_data = platform_data
+
     def info(self):
         """Return information about cloud as dict."""
         active_user = (self.platform_data["admin"] or
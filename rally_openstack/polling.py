@@ -0,0 +1,388 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import random
+import threading
+import time
+
+from rally.common import cfg
+from rally.common.plugin import plugin
+from rally.task import utils
+
+
+CONF = cfg.CONF
+
+
+def configure(name):
+    """Polling strategy class wrapper.
+
+    :param name: Name of the strategy. It is a value for
+        `<service>_poll_strategy` options of openstack group.
+    """
+    return plugin.configure(name=name, platform="openstack")
+
+
+class _Durations(object):
+    """Storage of durations of the finished waits per atomic action.
+
+    Durations are kept separately for every workload, since waits of the
+    same action depend on workload arguments (flavors, images, etc).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def add(self, workload, action, duration):
+        key = (workload, action)
+        with self._lock:
+            if key not in self._samples:
+                self._samples[key] = collections.deque(
+                    maxlen=CONF.openstack.poll_learned_window)
+            self._samples[key].append(duration)
+
+    def median(self, workload, action):
+        """Return the median duration or None if there are no enough data."""
+        with self._lock:
+            samples = sorted(self._samples.get((workload, action), []))
+        if len(samples) < CONF.openstack.poll_learned_min_samples:
+            return None
+        return samples[len(samples) // 2]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+DURATIONS = _Durations()
+
+
+@plugin.base()
+class PollingStrategy(plugin.Plugin):
+    """Base class for strategies of waiting for a resource status.
+
+    A strategy decides how long to sleep between two consecutive checks of
+    the resource status. The first check is always done without sleeping.
+    """
+
+    def __init__(self, action, check_interval, workload=None):
+        """Init strategy.
+
+        :param action: name of the atomic action the wait belongs to
+        :param check_interval: configured interval between checks
+        :param workload: uuid of the workload the wait belongs to
+        """
+        self.action = action
+        self.check_interval = check_interval
+        self.workload = workload
+
+    def intervals(self):
+        """Yield pauses between the checks of the resource status."""
+        raise NotImplementedError()
+
+
+@configure(name="fixed")
+class FixedPolling(PollingStrategy):
+    """Check the status every `check_interval` seconds."""
+
+    def intervals(self):
+        while True:
+            yield self.check_interval
+
+
+@configure(name="exponential")
+class ExponentialPolling(PollingStrategy):
+    """Grow the pause between checks up to `check_interval` seconds.
+
+    The first pause is `poll_backoff_initial_interval` and every next one is
+    multiplied by `poll_backoff_factor`. All pauses are shortened by random
+    jitter, so concurrent iterations do not check their resources at the same
+    moments.
+    """
+
+    def _jitter(self, interval):
+        return interval * (1 - random.uniform(0, CONF.openstack.poll_jitter))
+
+    def intervals(self):
+        interval = min(CONF.openstack.poll_backoff_initial_interval,
+                       self.check_interval)
+        while True:
+            yield self._jitter(interval)
+            interval = min(interval * CONF.openstack.poll_backoff_factor,
+                           self.check_interval)
+
+
+@configure(name="learned")
+class LearnedPolling(ExponentialPolling):
+    """Sleep the most of the usual wait time before the second check.
+
+    The usual wait time is a median of the durations of previous waits within
+    the same atomic action of the workload. Until there are enough of them,
+    it behaves like `exponential` strategy which it falls back to after the
+    first long sleep as well.
+    """
+
+    def intervals(self):
+        median = DURATIONS.median(self.workload, self.action)
+        if median:
+            yield self._jitter(median)
+        for interval in super(LearnedPolling, self).intervals():
+            yield interval
+
+
+class _NovaServersListing(object):
+    """Listing of nova servers changed since the given server-side time."""
+
+    @staticmethod
+    def matches(resource):
+        from novaclient.v2 import servers
+
+        return isinstance(resource, servers.Server)
+
+    # NOTE: attributes of servers are taken from _info, since missing
+    #   attributes of novaclient resources are lazy loaded by a separate GET
+
+    @staticmethod
+    def key(resource):
+        return resource.manager.api.client.get_project_id()
+
+    @staticmethod
+    def changed_at(resource):
+        # NOTE: servers returned by create requests have neither of them
+        return resource._info.get("updated") or resource._info.get("created")
+
+    @staticmethod
+    def format_time(timestamp):
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+    @staticmethod
+    def is_deleted(resource):
+        return resource._info.get("status", "").upper() == "DELETED"
+
+    @staticmethod
+    def list_changes(resource, since):
+        search_opts = {"changes-since": since} if since else {}
+        return resource.manager.list(search_opts=search_opts, limit=-1)
+
+
+SHARED_LISTINGS = {"nova": _NovaServersListing}
+
+
+class SharedPoller(object):
+    """Checks statuses of resources of all waiters by one listing.
+
+    Every waiter asks for a state of its resource which is not older than
+    its own check interval. The first waiter which is due lists changed
+    resources of the whole tenant while the others wait for its result.
+    Resources which are missing in the listing are left to be checked by
+    the waiters themselves.
+    """
+
+    def __init__(self, listing):
+        self._listing = listing
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._registered_at = {}
+        self._seen_at = {}
+        self._listed_at = float("-inf")
+        self._in_progress = False
+
+    def register(self, resource):
+        with self._cond:
+            self._pending[resource.id] = resource
+            self._registered_at[resource.id] = time.time()
+
+    def unregister(self, resource):
+        with self._cond:
+            self._pending.pop(resource.id, None)
+            self._registered_at.pop(resource.id, None)
+            self._seen_at.pop(resource.id, None)
+
+    def update(self, resource):
+        """Store the state of the resource obtained by its own request."""
+        with self._cond:
+            if resource.id in self._pending:
+                self._pending[resource.id] = resource
+
+    def _since(self):
+        timestamps = []
+        for resource_id, resource in self._pending.items():
+            timestamp = self._listing.changed_at(resource)
+            if timestamp is None:
+                timestamp = self._listing.format_time(
+                    self._registered_at[resource_id])
+            timestamps.append(timestamp)
+        return min(timestamps)
+
+    def _result(self, resource):
+        return (self._pending[resource.id],
+                self._seen_at.get(resource.id) == self._listed_at)
+
+    def get(self, resource, not_before):
+        """Return the latest listed state of the resource.
+
+        :param resource: the resource which state is requested
+        :param not_before: the earliest time when the listing should start
+        :returns: tuple of the state of the resource and a flag whether it
+            was returned by the latest listing. A resource missing in the
+            listing has either not changed or disappeared, so its state
+            should be checked by the caller.
+        """
+        with self._cond:
+            while self._listed_at < not_before:
+                now = time.time()
+                if not self._in_progress and now >= not_before:
+                    self._in_progress = True
+                    since = self._since()
+                    break
+                timeout = None if self._in_progress else not_before - now
+                self._cond.wait(timeout)
+            else:
+                return self._result(resource)
+
+        started_at = time.time()
+        changes = None
+        try:
+            changes = self._listing.list_changes(resource, since)
+        finally:
+            with self._cond:
+                self._in_progress = False
+                if changes is not None:
+                    for changed in changes:
+                        if changed.id in self._pending:
+                            self._pending[changed.id] = changed
+                            self._seen_at[changed.id] = started_at
+                    self._listed_at = started_at
+                self._cond.notify_all()
+        with self._cond:
+            return self._result(resource)
+
+
+_SHARED_POLLERS = {}
+_SHARED_POLLERS_LOCK = threading.Lock()
+
+
+def _get_shared_poller(service, resource):
+    listing = SHARED_LISTINGS[service]
+    key = (service, listing.key(resource))
+    with _SHARED_POLLERS_LOCK:
+        if key not in _SHARED_POLLERS:
+            _SHARED_POLLERS[key] = SharedPoller(listing)
+        return _SHARED_POLLERS[key]
+
+
+def _wait_shared(service, resource, update_resource, check_interval,
+                 **kwargs):
+    listing = SHARED_LISTINGS[service]
+    poller = _get_shared_poller(service, resource)
+    poller.register(resource)
+    last_check = [time.time()]
+
+    def copy(current, info):
+        # NOTE: the copy is marked as loaded to avoid lazy GET of missing
+        #   attributes and stays bound to the manager of its own user
+        return current.__class__(current.manager, info, loaded=True)
+
+    def update_shared_resource(current, **kw):
+        listed, changed = poller.get(current, last_check[0])
+        last_check[0] = time.time() + check_interval
+        if changed and not listing.is_deleted(listed):
+            return copy(current, listed._info)
+        # NOTE: missing and deleted resources are checked by the caller's
+        #   function, which knows how to treat them (e.g. 404 of
+        #   get_from_manager means that the resource is deleted)
+        current = update_resource(current, **kw)
+        poller.update(current)
+        return current
+
+    try:
+        return utils.wait_for_status(
+            copy(resource, resource._info),
+            update_resource=update_shared_resource, check_interval=0,
+            **kwargs)
+    finally:
+        poller.unregister(resource)
+
+
+def _current_workload(timer):
+    context = getattr(timer, "context", None)
+    if not isinstance(context, dict):
+        # NOTE: services keep generate_random_name method of the scenario or
+        #   the context they are created by
+        owner = getattr(getattr(timer, "_name_generator", None), "__self__",
+                        None)
+        context = getattr(owner, "context", None)
+    if isinstance(context, dict):
+        return context.get("owner_id")
+    return None
+
+
+def _current_action(atomic_actions):
+    names = []
+    while atomic_actions and "finished_at" not in atomic_actions[-1]:
+        names.append(atomic_actions[-1]["name"])
+        atomic_actions = atomic_actions[-1]["children"]
+    return ".".join(names) or None
+
+
+def wait_for_status(timer, service, resource, update_resource=None,
+                    timeout=60, check_interval=1, **kwargs):
+    """Wait for resource status using the strategy configured for service.
+
+    It is a replacement for rally.task.utils.wait_for_status which takes
+    `<service>_poll_strategy` option of openstack group into account.
+
+    :param timer: an instance of ActionTimerMixin or a service which atomic
+        action the wait belongs to
+    :param service: name of the service which strategy should be used
+    :param resource: the resource to wait for
+    :param update_resource: function to get the resource with fresh status
+    :param timeout: time in seconds to wait for the status
+    :param check_interval: configured interval between checks
+    :param kwargs: the rest arguments of rally.task.utils.wait_for_status
+    """
+    if (service in SHARED_LISTINGS and update_resource is not None
+            and getattr(CONF.openstack, "%s_shared_polling" % service)
+            and SHARED_LISTINGS[service].matches(resource)):
+        return _wait_shared(service, resource, update_resource,
+                            check_interval, timeout=timeout, **kwargs)
+
+    name = getattr(CONF.openstack, "%s_poll_strategy" % service)
+    if name == "fixed" or update_resource is None:
+        return utils.wait_for_status(
+            resource, update_resource=update_resource, timeout=timeout,
+            check_interval=check_interval, **kwargs)
+
+    action = _current_action(getattr(timer, "_atomic_actions", None))
+    workload = _current_workload(timer)
+    strategy = PollingStrategy.get(name, platform="openstack")(
+        action, check_interval, workload=workload)
+    intervals = strategy.intervals()
+    started_at = time.time()
+    checked = []
+
+    def update_resource_with_pause(*args, **kw):
+        if checked:
+            left = timeout - (time.time() - started_at)
+            time.sleep(max(min(next(intervals), left), 0))
+        checked.append(True)
+        return update_resource(*args, **kw)
+
+    result = utils.wait_for_status(
+        resource, update_resource=update_resource_with_pause,
+        timeout=timeout, check_interval=0, **kwargs)
+    if action:
+        DURATIONS.add(workload, action, time.time() - started_at)
+    return result
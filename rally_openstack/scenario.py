@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
 import random
+import threading
+import time
 
 from osprofiler import profiler
 from rally.common import cfg
@@ -29,6 +32,27 @@ configure = functools.partial(scenario.configure, platform="openstack")
 
 CONF = cfg.CONF
 
+_PROFILER_SAMPLING_LOCK = threading.Lock()
+# NOTE: the number of traced iterations of (workload, user) pairs
+_PROFILER_USER_SAMPLES = collections.defaultdict(int)
+# NOTE: durations of the latest iterations of workloads
+_PROFILER_DURATIONS = collections.defaultdict(
+    lambda: collections.deque(maxlen=1000))
+
+
+def _is_slow_iteration(workload, duration):
+    """Check whether the iteration is slower than the previous ones."""
+    with _PROFILER_SAMPLING_LOCK:
+        durations = sorted(_PROFILER_DURATIONS[workload])
+        _PROFILER_DURATIONS[workload].append(duration)
+    # NOTE: traces are kept until there are enough iterations to
+    #   calculate the percentile
+    if len(durations) < 10:
+        return True
+    index = int(len(durations) * CONF.openstack.profiler_sample_percentile
+                / 100.0)
+    return duration >= durations[min(index, len(durations) - 1)]
+
 
 @context.add_default_context("users@openstack", {})
 @plugin.default_meta(inherit=True)
@@ -46,8 +70,10 @@ class OpenStackScenario(scenario.Scenario):
                     self._choose_user(context)
 
                 if "user" in context:
+                    token = context.get("users_tokens", {}).get(
+                        context["user"].get("id"))
                     self._clients = osclients.Clients(
-                        context["user"]["credential"])
+                        context["user"]["credential"], token=token)
 
         if admin_clients:
             self._admin_clients = admin_clients
@@ -66,12 +92,19 @@ class OpenStackScenario(scenario.Scenario):
         if context["user_choice_method"] == "random":
             user = random.choice(context["users"])
             tenant = context["tenants"][user["tenant_id"]]
-        else:
-            # Second and last case - 'round_robin'.
-            tenants_amount = len(context["tenants"])
+        elif "users_round_robin" in context:
             # NOTE(amaretskiy): iteration is subtracted by `1' because it
             #                   starts from `1' but we count from `0'
             iteration = context["iteration"] - 1
+            index = context["users_round_robin"]
+            tenant_id, users = index[iteration % len(index)]
+            tenant = context["tenants"][tenant_id]
+            user = users[(iteration // len(index)) % len(users)]
+        else:
+            # Second and last case - 'round_robin' without the index built
+            # by users context.
+            tenants_amount = len(context["tenants"])
+            iteration = context["iteration"] - 1
             tenant_index = int(iteration % tenants_amount)
             tenant_id = sorted(context["tenants"].keys())[tenant_index]
             tenant = context["tenants"][tenant_id]
@@ -107,6 +140,40 @@ class OpenStackScenario(scenario.Scenario):
 
         return client(version) if version is not None else client()
 
+    def _is_profiled(self, context):
+        """Check whether the iteration is sampled for tracing."""
+        sampling = CONF.openstack.profiler_sampling
+        if sampling == "every_nth":
+            return ((context["iteration"] - 1)
+                    % CONF.openstack.profiler_sample_every == 0)
+        elif sampling == "random":
+            return random.random() < CONF.openstack.profiler_sample_fraction
+        elif sampling == "first_per_user":
+            user_id = context.get("user", {}).get("id")
+            with _PROFILER_SAMPLING_LOCK:
+                key = (context.get("owner_id"), user_id)
+                _PROFILER_USER_SAMPLES[key] += 1
+                count = _PROFILER_USER_SAMPLES[key]
+            return count <= CONF.openstack.profiler_sample_per_user
+        return True
+
+    def _keep_trace_if_slow(self, context, complete_data):
+        """Drop the trace id from output if the iteration is not slow."""
+        run = self.run
+        workload = context.get("owner_id")
+
+        @functools.wraps(run)
+        def run_and_check_duration(*args, **kwargs):
+            started_at = time.time()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                duration = time.time() - started_at
+                if not _is_slow_iteration(workload, duration):
+                    self._output["complete"].remove(complete_data)
+
+        self.run = run_and_check_duration
+
     def _init_profiler(self, context):
         """Inits the profiler."""
         if not CONF.openstack.enable_profiler:
@@ -128,7 +195,7 @@ class OpenStackScenario(scenario.Scenario):
                 if cred.profiler_hmac_key is not None:
                     profiler_hmac_key = cred.profiler_hmac_key
                     profiler_conn_str = cred.profiler_conn_str
-            if profiler_hmac_key is None:
+            if profiler_hmac_key is None or not self._is_profiled(context):
                 return
             profiler.init(profiler_hmac_key)
             trace_id = profiler.get().get_base_id()
@@ -140,3 +207,5 @@ class OpenStackScenario(scenario.Scenario):
                                       "workload_uuid": context["owner_id"],
                                       "iteration": context["iteration"]}}
             self.add_output(complete=complete_data)
+            if CONF.openstack.profiler_sampling == "slow":
+                self._keep_trace_if_slow(context, complete_data)
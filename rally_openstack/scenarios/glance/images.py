@@ -22,6 +22,7 @@ from rally_openstack import scenario
 from rally_openstack.scenarios.nova import utils as nova_utils
 from rally_openstack.services.image import glance_v2
 from rally_openstack.services.image import image
+from rally_openstack import streaming
 
 LOG = logging.getLogger(__name__)
 
@@ -352,9 +353,13 @@ class CreateAndDeactivateImage(GlanceBasic):
 class CreateAndDownloadImage(GlanceBasic):
 
     def run(self, container_format, image_location, disk_format,
-            visibility="private", min_disk=0, min_ram=0, properties=None):
+            visibility="private", min_disk=0, min_ram=0, properties=None,
+            do_checksum=False):
         """Create an image, then download data of the image.
 
+        The whole data is downloaded within the atomic action. The size of
+        the data, time to first byte and throughput are added to the output.
+
         :param container_format: container format of image. Acceptable
                                  formats: ami, ari, aki, bare, and ovf
         :param image_location: image file location
@@ -365,6 +370,7 @@ class CreateAndDownloadImage(GlanceBasic):
         :param min_ram: The min ram of created images
         :param properties: A dict of image metadata properties to set
                            on the image
+        :param do_checksum: Validate checksum of the data while downloading
         """
         image = self.glance.create_image(
             container_format=container_format,
@@ -375,4 +381,7 @@ class CreateAndDownloadImage(GlanceBasic):
             min_ram=min_ram,
             properties=properties)
 
-        self.glance.download_image(image.id)
+        stats = self.glance.download_image_data(image.id,
+                                                do_checksum=do_checksum)
+        self.add_output(additive=streaming.get_output("Image download",
+                                                      stats))
@@ -20,6 +20,7 @@ from rally.task import atomic
 from rally.task import utils
 import requests
 
+from rally_openstack import polling
 from rally_openstack import scenario
 
 
@@ -67,8 +68,8 @@ class HeatScenario(scenario.OpenStackScenario):
 
         self.sleep_between(CONF.openstack.heat_stack_create_prepoll_delay)
 
-        stack = utils.wait_for_status(
-            stack,
+        stack = polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["CREATE_COMPLETE"],
             failure_statuses=["CREATE_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
@@ -103,8 +104,8 @@ class HeatScenario(scenario.OpenStackScenario):
 
         self.sleep_between(CONF.openstack.heat_stack_update_prepoll_delay)
 
-        stack = utils.wait_for_status(
-            stack,
+        stack = polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["UPDATE_COMPLETE"],
             failure_statuses=["UPDATE_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
@@ -121,8 +122,8 @@ class HeatScenario(scenario.OpenStackScenario):
         :param stack: stack that needs to be checked
         """
         self.clients("heat").actions.check(stack.id)
-        utils.wait_for_status(
-            stack,
+        polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["CHECK_COMPLETE"],
             failure_statuses=["CHECK_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(["CHECK_FAILED"]),
@@ -138,8 +139,8 @@ class HeatScenario(scenario.OpenStackScenario):
         :param stack: stack object
         """
         stack.delete()
-        utils.wait_for_status(
-            stack,
+        polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["DELETE_COMPLETE"],
             failure_statuses=["DELETE_FAILED", "ERROR"],
             check_deletion=True,
@@ -155,8 +156,8 @@ class HeatScenario(scenario.OpenStackScenario):
         """
 
         self.clients("heat").actions.suspend(stack.id)
-        utils.wait_for_status(
-            stack,
+        polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["SUSPEND_COMPLETE"],
             failure_statuses=["SUSPEND_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
@@ -171,8 +172,8 @@ class HeatScenario(scenario.OpenStackScenario):
         """
 
         self.clients("heat").actions.resume(stack.id)
-        utils.wait_for_status(
-            stack,
+        polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["RESUME_COMPLETE"],
             failure_statuses=["RESUME_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
@@ -188,8 +189,8 @@ class HeatScenario(scenario.OpenStackScenario):
         """
         snapshot = self.clients("heat").stacks.snapshot(
             stack.id)
-        utils.wait_for_status(
-            stack,
+        polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["SNAPSHOT_COMPLETE"],
             failure_statuses=["SNAPSHOT_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
@@ -205,8 +206,8 @@ class HeatScenario(scenario.OpenStackScenario):
         :param snapshot_id: id of given snapshot
         """
         self.clients("heat").stacks.restore(stack.id, snapshot_id)
-        utils.wait_for_status(
-            stack,
+        polling.wait_for_status(
+            self, "heat", stack,
             ready_statuses=["RESTORE_COMPLETE"],
             failure_statuses=["RESTORE_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
@@ -28,6 +28,7 @@ from rally import exceptions
 from rally.task import atomic
 from rally.task import utils
 
+from rally_openstack import polling
 from rally_openstack import scenario
 
 
@@ -112,8 +113,8 @@ class MagnumScenario(scenario.OpenStackScenario):
 
         common_utils.interruptable_sleep(
             CONF.openstack.magnum_cluster_create_prepoll_delay)
-        cluster = utils.wait_for_status(
-            cluster,
+        cluster = polling.wait_for_status(
+            self, "magnum", cluster,
             ready_statuses=["CREATE_COMPLETE"],
             failure_statuses=["CREATE_FAILED", "ERROR"],
             update_resource=utils.get_from_manager(),
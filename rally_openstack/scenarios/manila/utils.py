@@ -21,6 +21,7 @@ from rally.task import atomic
 from rally.task import utils
 
 from rally_openstack.contexts.manila import consts
+from rally_openstack import polling
 from rally_openstack import scenario
 
 
@@ -61,8 +62,8 @@ class ManilaScenario(scenario.OpenStackScenario):
             share_proto, size, **kwargs)
 
         self.sleep_between(CONF.openstack.manila_share_create_prepoll_delay)
-        share = utils.wait_for_status(
-            share,
+        share = polling.wait_for_status(
+            self, "manila", share,
             ready_statuses=["available"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.manila_share_create_timeout,
@@ -78,8 +79,8 @@ class ManilaScenario(scenario.OpenStackScenario):
         """
         share.delete()
         error_statuses = ("error_deleting", )
-        utils.wait_for_status(
-            share,
+        polling.wait_for_status(
+            self, "manila", share,
             ready_statuses=["deleted"],
             check_deletion=True,
             update_resource=utils.get_from_manager(error_statuses),
@@ -131,8 +132,8 @@ class ManilaScenario(scenario.OpenStackScenario):
                                                          access_result["id"])
 
         # We check if the access in that access_list has the active state
-        utils.wait_for_status(
-            access,
+        polling.wait_for_status(
+            self, "manila", access,
             ready_statuses=["active"],
             update_resource=fn,
             check_interval=CONF.openstack.manila_access_create_poll_interval,
@@ -168,8 +169,8 @@ class ManilaScenario(scenario.OpenStackScenario):
         fn = self._update_resource_in_deny_access_share(share,
                                                         access_id)
 
-        utils.wait_for_status(
-            access,
+        polling.wait_for_status(
+            self, "manila", access,
             ready_statuses=["deleted"],
             update_resource=fn,
             check_deletion=True,
@@ -196,8 +197,8 @@ class ManilaScenario(scenario.OpenStackScenario):
         :param new_size: new size of the share
         """
         share.extend(new_size)
-        utils.wait_for_status(
-            share,
+        polling.wait_for_status(
+            self, "manila", share,
             ready_statuses=["available"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.manila_share_create_timeout,
@@ -211,8 +212,8 @@ class ManilaScenario(scenario.OpenStackScenario):
         :param new_size: new size of the share
         """
         share.shrink(new_size)
-        utils.wait_for_status(
-            share,
+        polling.wait_for_status(
+            self, "manila", share,
             ready_statuses=["available"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.manila_share_create_timeout,
@@ -245,8 +246,8 @@ class ManilaScenario(scenario.OpenStackScenario):
         :param share_network: instance of :class:`ShareNetwork`.
         """
         share_network.delete()
-        utils.wait_for_status(
-            share_network,
+        polling.wait_for_status(
+            self, "manila", share_network,
             ready_statuses=["deleted"],
             check_deletion=True,
             update_resource=utils.get_from_manager(),
@@ -317,8 +318,8 @@ class ManilaScenario(scenario.OpenStackScenario):
         :param security_service: instance of :class:`SecurityService`.
         """
         security_service.delete()
-        utils.wait_for_status(
-            security_service,
+        polling.wait_for_status(
+            self, "manila", security_service,
             ready_statuses=["deleted"],
             check_deletion=True,
             update_resource=utils.get_from_manager(),
@@ -407,17 +407,23 @@ class SetAndClearRouterGateway(utils.NeutronScenario):
 class CreateAndListPorts(utils.NeutronScenario):
 
     def run(self, network_create_args=None,
-            port_create_args=None, ports_per_network=1):
+            port_create_args=None, ports_per_network=1, bulk_create=False):
         """Create and a given number of ports and list all ports.
 
         :param network_create_args: dict, POST /v2.0/networks request
                                     options. Deprecated.
         :param port_create_args: dict, POST /v2.0/ports request options
         :param ports_per_network: int, number of ports for one network
+        :param bulk_create: bool, create all ports of the network by one
+                            bulk request
         """
         network = self._get_or_create_network(network_create_args)
-        for i in range(ports_per_network):
-            self._create_port(network, port_create_args or {})
+        if bulk_create:
+            self._create_ports(network, port_create_args or {},
+                               ports_per_network)
+        else:
+            for i in range(ports_per_network):
+                self._create_port(network, port_create_args or {})
 
         self._list_ports()
 
@@ -498,7 +504,7 @@ class CreateAndShowPorts(utils.NeutronScenario):
 class CreateAndDeletePorts(utils.NeutronScenario):
 
     def run(self, network_create_args=None,
-            port_create_args=None, ports_per_network=1):
+            port_create_args=None, ports_per_network=1, bulk_create=False):
             """Create and delete a port.
 
             Measure the "neutron port-create" and "neutron port-delete"
@@ -508,8 +514,16 @@ class CreateAndDeletePorts(utils.NeutronScenario):
                                         options. Deprecated.
             :param port_create_args: dict, POST /v2.0/ports request options
             :param ports_per_network: int, number of ports for one network
+            :param bulk_create: bool, create all ports of the network by one
+                                bulk request
             """
             network = self._get_or_create_network(network_create_args)
+            if bulk_create:
+                for port in self._create_ports(network,
+                                               port_create_args or {},
+                                               ports_per_network):
+                    self._delete_port(port)
+                return
             for i in range(ports_per_network):
                 port = self._create_port(network, port_create_args)
                 self._delete_port(port)
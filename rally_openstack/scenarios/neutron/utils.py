@@ -265,6 +265,22 @@ class NeutronScenario(scenario.OpenStackScenario):
         port_create_args["name"] = self.generate_random_name()
         return self.clients("neutron").create_port({"port": port_create_args})
 
+    @atomic.action_timer("neutron.create_ports")
+    def _create_ports(self, network, port_create_args, ports_number):
+        """Create neutron ports by one bulk request.
+
+        :param network: neutron network dict
+        :param port_create_args: POST /v2.0/ports request options
+        :param ports_number: int, number of ports to create
+        :returns: list of neutron port dicts
+        """
+        ports = [dict(port_create_args,
+                      network_id=network["network"]["id"],
+                      name=self.generate_random_name())
+                 for i in range(ports_number)]
+        ports = self.clients("neutron").create_port({"ports": ports})["ports"]
+        return [{"port": port} for port in ports]
+
     @atomic.action_timer("neutron.list_ports")
     def _list_ports(self):
         """Return user ports list."""
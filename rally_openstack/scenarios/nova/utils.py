@@ -20,6 +20,7 @@ from rally import exceptions
 from rally.task import atomic
 from rally.task import utils
 
+from rally_openstack import polling
 from rally_openstack import scenario
 from rally_openstack.scenarios.cinder import utils as cinder_utils
 from rally_openstack.services.image import image as image_service
@@ -102,8 +103,8 @@ class NovaScenario(scenario.OpenStackScenario):
                 server_name, image, flavor, **kwargs)
 
             self.sleep_between(CONF.openstack.nova_server_boot_prepoll_delay)
-            server = utils.wait_for_status(
-                server,
+            server = polling.wait_for_status(
+                self, "nova", server,
                 ready_statuses=["ACTIVE"],
                 update_resource=utils.get_from_manager(),
                 timeout=CONF.openstack.nova_server_boot_timeout,
@@ -114,8 +115,8 @@ class NovaScenario(scenario.OpenStackScenario):
     def _do_server_reboot(self, server, reboottype):
         server.reboot(reboot_type=reboottype)
         self.sleep_between(CONF.openstack.nova_server_pause_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_reboot_timeout,
@@ -191,8 +192,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.rebuild(image, **kwargs)
         self.sleep_between(CONF.openstack.nova_server_rebuild_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_rebuild_timeout,
@@ -209,8 +210,8 @@ class NovaScenario(scenario.OpenStackScenario):
         :param server: The server to start and wait to become ACTIVE.
         """
         server.start()
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_start_timeout,
@@ -227,8 +228,8 @@ class NovaScenario(scenario.OpenStackScenario):
         :param server: The server to stop.
         """
         server.stop()
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["SHUTOFF"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_stop_timeout,
@@ -246,8 +247,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.rescue()
         self.sleep_between(CONF.openstack.nova_server_rescue_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["RESCUE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_rescue_timeout,
@@ -264,8 +265,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.unrescue()
         self.sleep_between(CONF.openstack.nova_server_unrescue_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_unrescue_timeout,
@@ -283,8 +284,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.suspend()
         self.sleep_between(CONF.openstack.nova_server_suspend_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["SUSPENDED"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_suspend_timeout,
@@ -302,8 +303,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.resume()
         self.sleep_between(CONF.openstack.nova_server_resume_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_resume_timeout,
@@ -321,8 +322,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.pause()
         self.sleep_between(CONF.openstack.nova_server_pause_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["PAUSED"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_pause_timeout,
@@ -340,8 +341,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.unpause()
         self.sleep_between(CONF.openstack.nova_server_pause_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_unpause_timeout,
@@ -359,8 +360,8 @@ class NovaScenario(scenario.OpenStackScenario):
         """
         server.shelve()
         self.sleep_between(CONF.openstack.nova_server_pause_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["SHELVED_OFFLOADED"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_shelve_timeout,
@@ -378,8 +379,8 @@ class NovaScenario(scenario.OpenStackScenario):
         server.unshelve()
 
         self.sleep_between(CONF.openstack. nova_server_unshelve_prepoll_delay)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_unshelve_timeout,
@@ -401,8 +402,8 @@ class NovaScenario(scenario.OpenStackScenario):
             else:
                 server.delete()
 
-            utils.wait_for_status(
-                server,
+            polling.wait_for_status(
+                self, "nova", server,
                 ready_statuses=["deleted"],
                 check_deletion=True,
                 update_resource=utils.get_from_manager(),
@@ -425,8 +426,8 @@ class NovaScenario(scenario.OpenStackScenario):
                     server.delete()
 
             for server in servers:
-                utils.wait_for_status(
-                    server,
+                polling.wait_for_status(
+                    self, "nova", server,
                     ready_statuses=["deleted"],
                     check_deletion=True,
                     update_resource=utils.get_from_manager(),
@@ -496,8 +497,8 @@ class NovaScenario(scenario.OpenStackScenario):
         glance.delete_image(image.id)
         check_interval = CONF.openstack.nova_server_image_delete_poll_interval
         with atomic.ActionTimer(self, "glance.wait_for_delete"):
-            utils.wait_for_status(
-                image,
+            polling.wait_for_status(
+                self, "nova", image,
                 ready_statuses=["deleted", "pending_delete"],
                 check_deletion=True,
                 update_resource=glance.get_image,
@@ -523,16 +524,16 @@ class NovaScenario(scenario.OpenStackScenario):
         image = glance.get_image(image_uuid)
         check_interval = CONF.openstack.nova_server_image_create_poll_interval
         with atomic.ActionTimer(self, "glance.wait_for_image"):
-            image = utils.wait_for_status(
-                image,
+            image = polling.wait_for_status(
+                self, "nova", image,
                 ready_statuses=["ACTIVE"],
                 update_resource=glance.get_image,
                 timeout=CONF.openstack.nova_server_image_create_timeout,
                 check_interval=check_interval
             )
         with atomic.ActionTimer(self, "nova.wait_for_server"):
-            utils.wait_for_status(
-                server,
+            polling.wait_for_status(
+                self, "nova", server,
                 ready_statuses=["None"],
                 status_attr="OS-EXT-STS:task_state",
                 update_resource=utils.get_from_manager(),
@@ -613,8 +614,8 @@ class NovaScenario(scenario.OpenStackScenario):
             servers = [s for s in self.clients("nova").servers.list()
                        if s.name.startswith(name_prefix)]
             self.sleep_between(CONF.openstack.nova_server_boot_prepoll_delay)
-            servers = [utils.wait_for_status(
-                server,
+            servers = [polling.wait_for_status(
+                self, "nova", server,
                 ready_statuses=["ACTIVE"],
                 update_resource=utils.
                 get_from_manager(),
@@ -721,8 +722,8 @@ class NovaScenario(scenario.OpenStackScenario):
     @atomic.action_timer("nova.resize")
     def _resize(self, server, flavor):
         server.resize(flavor)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["VERIFY_RESIZE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_resize_timeout,
@@ -732,8 +733,8 @@ class NovaScenario(scenario.OpenStackScenario):
     @atomic.action_timer("nova.resize_confirm")
     def _resize_confirm(self, server, status="ACTIVE"):
         server.confirm_resize()
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=[status],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_resize_confirm_timeout,
@@ -744,8 +745,8 @@ class NovaScenario(scenario.OpenStackScenario):
     @atomic.action_timer("nova.resize_revert")
     def _resize_revert(self, server, status="ACTIVE"):
         server.revert_resize()
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=[status],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_resize_revert_timeout,
@@ -763,8 +764,8 @@ class NovaScenario(scenario.OpenStackScenario):
         volume_id = volume.id
         attachment = self.clients("nova").volumes.create_server_volume(
             server_id, volume_id, device)
-        utils.wait_for_status(
-            volume,
+        polling.wait_for_status(
+            self, "nova", volume,
             ready_statuses=["in-use"],
             update_resource=self._update_volume_resource,
             timeout=CONF.openstack.nova_server_resize_revert_timeout,
@@ -799,8 +800,8 @@ class NovaScenario(scenario.OpenStackScenario):
 
         self.clients("nova").volumes.delete_server_volume(server_id,
                                                           volume.id)
-        utils.wait_for_status(
-            volume,
+        polling.wait_for_status(
+            self, "nova", volume,
             ready_statuses=["available"],
             update_resource=self._update_volume_resource,
             timeout=CONF.openstack.nova_detach_volume_timeout,
@@ -832,8 +833,8 @@ class NovaScenario(scenario.OpenStackScenario):
         host_pre_migrate = getattr(server_admin, "OS-EXT-SRV-ATTR:host")
         server_admin.live_migrate(block_migration=block_migration,
                                   disk_over_commit=disk_over_commit)
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["ACTIVE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_live_migrate_timeout,
@@ -868,8 +869,8 @@ class NovaScenario(scenario.OpenStackScenario):
         server_admin = self.admin_clients("nova").servers.get(server.id)
         host_pre_migrate = getattr(server_admin, "OS-EXT-SRV-ATTR:host")
         server_admin.migrate()
-        utils.wait_for_status(
-            server,
+        polling.wait_for_status(
+            self, "nova", server,
             ready_statuses=["VERIFY_RESIZE"],
             update_resource=utils.get_from_manager(),
             timeout=CONF.openstack.nova_server_migrate_timeout,
@@ -24,6 +24,7 @@ from rally.task import atomic
 from rally.task import utils
 
 from rally_openstack import consts
+from rally_openstack import polling
 from rally_openstack import scenario
 from rally_openstack.scenarios.sahara import consts as sahara_consts
 
@@ -106,8 +107,8 @@ class SaharaScenario(scenario.OpenStackScenario):
         self.clients("sahara").node_group_templates.delete(node_group.id)
 
     def _wait_active(self, cluster_object):
-        utils.wait_for_status(
-            resource=cluster_object, ready_statuses=["active"],
+        polling.wait_for_status(
+            self, "sahara", resource=cluster_object, ready_statuses=["active"],
             failure_statuses=["error"], update_resource=self._update_cluster,
             timeout=CONF.openstack.sahara_cluster_create_timeout,
             check_interval=CONF.openstack.sahara_cluster_check_interval)
@@ -13,13 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import tempfile
-
 from rally.task import validation
 
 from rally_openstack import consts
 from rally_openstack import scenario
 from rally_openstack.scenarios.swift import utils
+from rally_openstack import streaming
 
 
 """Scenarios for Swift Objects."""
@@ -37,17 +36,14 @@ class CreateContainerAndObjectThenListObjects(utils.SwiftScenario):
         """Create container and objects then list all objects.
 
         :param objects_per_container: int, number of objects to upload
-        :param object_size: int, temporary local object size
+        :param object_size: int, size of uploaded objects in bytes
         :param kwargs: dict, optional parameters to create container
         """
 
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                self._upload_object(container_name, dummy_file)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            self._upload_object(container_name,
+                                utils.ObjectPayload(object_size))
         self._list_objects(container_name)
 
 
@@ -63,20 +59,15 @@ class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
         """Create container and objects then delete everything created.
 
         :param objects_per_container: int, number of objects to upload
-        :param object_size: int, temporary local object size
+        :param object_size: int, size of uploaded objects in bytes
         :param kwargs: dict, optional parameters to create container
         """
-        container_name = None
         objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                object_name = self._upload_object(container_name,
-                                                  dummy_file)[1]
-                objects_list.append(object_name)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            object_name = self._upload_object(
+                container_name, utils.ObjectPayload(object_size))[1]
+            objects_list.append(object_name)
 
         for object_name in objects_list:
             self._delete_object(container_name, object_name)
@@ -91,27 +82,32 @@ class CreateContainerAndObjectThenDeleteAll(utils.SwiftScenario):
     platform="openstack")
 class CreateContainerAndObjectThenDownloadObject(utils.SwiftScenario):
 
-    def run(self, objects_per_container=1, object_size=1024, **kwargs):
+    def run(self, objects_per_container=1, object_size=1024,
+            do_checksum=False, **kwargs):
         """Create container and objects then download all objects.
 
+        The whole data of objects is downloaded within the atomic actions.
+        The total size of the data, mean time to first byte and throughput
+        are added to the output.
+
         :param objects_per_container: int, number of objects to upload
-        :param object_size: int, temporary local object size
+        :param object_size: int, size of uploaded objects in bytes
+        :param do_checksum: bool, validate MD5 of the downloaded data
         :param kwargs: dict, optional parameters to create container
         """
-        container_name = None
         objects_list = []
-        with tempfile.TemporaryFile() as dummy_file:
-            # set dummy file to specified object size
-            dummy_file.truncate(object_size)
-            container_name = self._create_container(**kwargs)
-            for i in range(objects_per_container):
-                dummy_file.seek(0)
-                object_name = self._upload_object(container_name,
-                                                  dummy_file)[1]
-                objects_list.append(object_name)
+        container_name = self._create_container(**kwargs)
+        for i in range(objects_per_container):
+            object_name = self._upload_object(
+                container_name, utils.ObjectPayload(object_size))[1]
+            objects_list.append(object_name)
 
+        stats = []
         for object_name in objects_list:
-            self._download_object(container_name, object_name)
+            stats.append(self._download_object_data(
+                container_name, object_name, do_checksum=do_checksum))
+        self.add_output(additive=streaming.get_output(
+            "Objects download", streaming.merge(stats)))
 
 
 @validation.add("required_services", services=[consts.Service.SWIFT])
@@ -13,9 +13,60 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import time
+
+from rally import exceptions
 from rally.task import atomic
 
 from rally_openstack import scenario
+from rally_openstack import streaming
+
+
+# NOTE: read-only zeros shared by all payloads, slices of a memoryview do
+#   not copy the data
+_ZEROS = memoryview(b"\0" * (1024 * 1024))
+
+
+class ObjectPayload(object):
+    """Zero-filled content of a swift object which is not stored anywhere.
+
+    Every instance is an independent reader of one shared read-only buffer,
+    so objects of any size are uploaded without touching local disk or
+    copying the data. An instance is cheap and should be created for every
+    upload instead of being shared between threads.
+    """
+
+    def __init__(self, size):
+        """Init payload.
+
+        :param size: int, size of the content in bytes
+        """
+        self.size = size
+        self._position = 0
+
+    def read(self, size=-1):
+        """Read at most `size` bytes, but not more than the shared buffer.
+
+        :returns: memoryview of the shared buffer
+        """
+        left = max(self.size - self._position, 0)
+        if size is None or size < 0 or size > left:
+            size = left
+        size = min(size, len(_ZEROS))
+        self._position += size
+        return _ZEROS[:size]
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self):
+        return self._position
 
 
 class SwiftScenario(scenario.OpenStackScenario):
@@ -105,6 +156,39 @@ class SwiftScenario(scenario.OpenStackScenario):
         return self.clients("swift").get_object(container_name, object_name,
                                                 **kwargs)
 
+    @atomic.action_timer("swift.download_object")
+    def _download_object_data(self, container_name, object_name,
+                              do_checksum=False, **kwargs):
+        """Download the whole object without keeping it in memory.
+
+        :param container_name: str, name of the container to download object
+                               from
+        :param object_name: str, name of the object to download
+        :param do_checksum: bool, compare MD5 of the data calculated while
+                            downloading with ETag of the object
+        :param kwargs: dict, other optional parameters to get_object
+
+        :returns: dict with statistics of the download (see
+                  rally_openstack.streaming.consume)
+        """
+        started_at = time.time()
+        headers, body = self.clients("swift").get_object(
+            container_name, object_name,
+            resp_chunk_size=streaming.CHUNK_SIZE, **kwargs)
+        stats = streaming.consume(body, started_at,
+                                  checksum="md5" if do_checksum else None)
+        # NOTE: ETag of large objects is not MD5 of their data
+        large_object = ("x-object-manifest" in headers
+                        or "x-static-large-object" in headers)
+        etag = headers.get("etag", "").strip("\"")
+        if do_checksum and not large_object and etag != stats["checksum"]:
+            raise exceptions.RallyException(
+                "Checksum of downloaded object %(obj)s (%(actual)s) does not"
+                " match its ETag (%(etag)s)." % {"obj": object_name,
+                                                 "actual": stats["checksum"],
+                                                 "etag": etag})
+        return stats
+
     @atomic.action_timer("swift.delete_object")
     def _delete_object(self, container_name, object_name, **kwargs):
         """Delete object from container.
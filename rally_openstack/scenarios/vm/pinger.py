@@ -0,0 +1,161 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import os
+import select
+import socket
+import struct
+import threading
+
+import netaddr
+from rally.common import logging
+
+
+LOG = logging.getLogger(__name__)
+
+_ICMP_ECHO_REQUEST = {4: 8, 6: 128}
+_ICMP_ECHO_REPLY = {4: 0, 6: 129}
+_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+_PROTOCOLS = {4: socket.IPPROTO_ICMP,
+              6: getattr(socket, "IPPROTO_ICMPV6", 58)}
+_PAYLOAD = b"rally-ping"
+
+
+def _checksum(data):
+    data = bytearray(data)
+    if len(data) % 2:
+        data.append(0)
+    total = sum((data[i] << 8) + data[i + 1] for i in range(0, len(data), 2))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def _echo_request(version, seq):
+    header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST[version], 0, 0, 0, seq)
+    if version == 4:
+        # NOTE: the kernel calculates the checksum of ICMPv6 messages itself
+        #   since it covers the IPv6 pseudo-header
+        header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST[version], 0,
+                             _checksum(header + _PAYLOAD), 0, seq)
+    return header + _PAYLOAD
+
+
+class Pinger(object):
+    """Pings hosts of all threads of the process over shared ICMP sockets.
+
+    Unprivileged ICMP datagram sockets (see net.ipv4.ping_group_range
+    sysctl) are used, one per address family. The kernel routes echo replies
+    to the socket the requests were sent from, so replies are matched to the
+    waiting threads by sequence numbers. A single thread receives replies
+    while there is anybody waiting for them.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._sockets = {}
+        self._waiters = {}
+        self._seq = itertools.count()
+        self._receiver = None
+
+    def _get_socket(self, version):
+        if version not in self._sockets:
+            try:
+                self._sockets[version] = socket.socket(
+                    _FAMILIES[version], socket.SOCK_DGRAM,
+                    _PROTOCOLS[version])
+            except socket.error as e:
+                LOG.debug("ICMPv%s datagram sockets are not available: %s"
+                          % (version, e))
+                self._sockets[version] = None
+        return self._sockets[version]
+
+    def _receive(self):
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._receiver = None
+                    return
+                sockets = dict((sock, version)
+                               for version, sock in self._sockets.items()
+                               if sock is not None)
+            readable = select.select(list(sockets), [], [], 0.1)[0]
+            for sock in readable:
+                try:
+                    data, address = sock.recvfrom(1024)
+                except socket.error:
+                    continue
+                self._dispatch(sockets[sock], bytearray(data), address[0])
+
+    def _dispatch(self, version, data, address):
+        if len(data) < 8 or data[0] != _ICMP_ECHO_REPLY[version]:
+            return
+        seq = struct.unpack("!H", bytes(data[6:8]))[0]
+        with self._lock:
+            waiter = self._waiters.get((version, seq))
+        if waiter is None:
+            return
+        ip, event = waiter
+        if netaddr.IPAddress(address.split("%")[0]) == ip:
+            event.set()
+
+    def ping(self, ip, timeout=1):
+        """Send ICMP echo request and wait for the reply.
+
+        :param ip: IP address to ping
+        :param timeout: time to wait for the reply in seconds
+        :returns: True if the reply is received in time, False if it is not
+            and None if ICMP datagram sockets are not available for the
+            address family
+        """
+        ip = netaddr.IPAddress(ip)
+        event = threading.Event()
+        with self._lock:
+            sock = self._get_socket(ip.version)
+            if sock is None:
+                return None
+            key = (ip.version, next(self._seq) & 0xffff)
+            self._waiters[key] = (ip, event)
+            if self._receiver is None:
+                self._receiver = threading.Thread(target=self._receive)
+                self._receiver.daemon = True
+                self._receiver.start()
+        try:
+            sock.sendto(_echo_request(ip.version, key[1]), (ip.format(), 0))
+            event.wait(timeout)
+            return event.is_set()
+        except socket.error as e:
+            LOG.debug("Failed to ping %s: %s" % (ip.format(), e))
+            return False
+        finally:
+            with self._lock:
+                self._waiters.pop(key, None)
+
+
+_PINGER = None
+_PINGER_LOCK = threading.Lock()
+
+
+def get_pinger():
+    """Return the pinger of the current process."""
+    global _PINGER
+
+    with _PINGER_LOCK:
+        # NOTE: sockets of the parent should not be shared with forked
+        #   runner processes
+        if _PINGER is None or _PINGER.pid != os.getpid():
+            _PINGER = Pinger()
+        return _PINGER
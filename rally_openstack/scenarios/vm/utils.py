@@ -13,19 +13,28 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import json
 import os.path
+import re
+import socket
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 
 import netaddr
 from rally.common import cfg
 from rally.common import logging
 from rally.common import sshutils
+from rally import exceptions
 from rally.task import atomic
 from rally.task import utils
 import six
 
 from rally_openstack.scenarios.nova import utils as nova_utils
+from rally_openstack.scenarios.vm import pinger
 from rally_openstack.wrappers import network as network_wrapper
 
 LOG = logging.getLogger(__name__)
@@ -33,6 +42,8 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 
+_LINE_SEPARATOR = re.compile("\r\n|\r|\n")
+
 
 class Host(object):
 
@@ -51,20 +62,27 @@ class Host(object):
 
     @classmethod
     def update_status(cls, server):
-        """Check ip address is pingable and update status."""
-        ping = "ping" if server.ip.version == 4 else "ping6"
-        if sys.platform.startswith("linux"):
-            cmd = [ping, "-c1", "-w1", server.ip.format()]
-        else:
-            cmd = [ping, "-c1", server.ip.format()]
+        """Check ip address is pingable and update status.
 
-        proc = subprocess.Popen(cmd,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        proc.wait()
+        The shared in-process pinger is used if unprivileged ICMP sockets
+        are available, ping utility is executed otherwise.
+        """
+        is_up = pinger.get_pinger().ping(server.ip)
+        if is_up is None:
+            ping = "ping" if server.ip.version == 4 else "ping6"
+            if sys.platform.startswith("linux"):
+                cmd = [ping, "-c1", "-w1", server.ip.format()]
+            else:
+                cmd = [ping, "-c1", server.ip.format()]
+
+            proc = subprocess.Popen(cmd,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+            proc.wait()
+            is_up = proc.returncode == 0
         LOG.debug("Host %s is ICMP %s"
-                  % (server.ip.format(), proc.returncode and "down" or "up"))
-        if proc.returncode == 0:
+                  % (server.ip.format(), is_up and "up" or "down"))
+        if is_up:
             server.status = cls.ICMP_UP_STATUS
         else:
             server.status = cls.ICMP_DOWN_STATUS
@@ -80,6 +98,185 @@ class Host(object):
         return not self.__eq__(other)
 
 
+def probe_ssh_banner(host, port=22, timeout=1):
+    """Check that sshd accepts connections and sends its banner.
+
+    It is much cheaper than the key exchange and authentication, so it is
+    used to poll servers which are still booting.
+
+    :param host: hostname or ip address of the server
+    :param port: ssh port of the server
+    :param timeout: timeout of the connection and reading the banner
+    """
+    try:
+        sock = socket.create_connection((host, port), timeout)
+    except socket.error:
+        return False
+    try:
+        data = b""
+        # NOTE: the server may send other lines before the version banner
+        while b"SSH-" not in data and len(data) < 1024:
+            chunk = sock.recv(1024)
+            if not chunk:
+                break
+            data += chunk
+        return b"SSH-" in data
+    except socket.error:
+        return False
+    finally:
+        sock.close()
+
+
+class SSHConnection(sshutils.SSH):
+    """SSH connection which is reused by several commands.
+
+    Sessions of all commands are multiplexed over one transport, so the key
+    exchange and authentication are performed once per connection. The
+    transport is kept alive and re-established if it is lost.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SSHConnection, self).__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if self._client:
+                transport = self._client.get_transport()
+                if transport is not None and transport.is_active():
+                    return self._client
+                LOG.debug("SSH connection to %s is lost, reconnecting."
+                          % self.host)
+                self.close()
+            client = super(SSHConnection, self)._get_client()
+            client.get_transport().set_keepalive(
+                CONF.openstack.vm_ssh_keepalive_interval)
+            return client
+
+    def close(self):
+        if self._client:
+            super(SSHConnection, self).close()
+
+
+class CommandOutput(object):
+    """Stdout of a command which is processed while it is received.
+
+    Every line which is a JSON object with the only key "additive" or
+    "complete" is a chart record: the chart has the same format as charts
+    of the scenario output. Points of additive charts with the same title
+    are appended to one chart, so a command can report a series of values
+    by printing the same chart repeatedly. All other lines are raw text and
+    only the last `tail_lines` of them are kept. Lines are terminated by
+    "\n" or "\r", so progress reports rewriting the same terminal line are
+    split as well, and a line longer than `max_text_size` characters is
+    split into pieces of that size.
+
+    For compatibility with commands printing one JSON document with lists
+    of "additive" and "complete" charts, the whole text is kept as well. It
+    is kept in memory while it is not bigger than `max_text_size`
+    characters and in a temporary file otherwise.
+    """
+
+    def __init__(self, tail_lines=100, max_text_size=64 * 1024):
+        self.tail = collections.deque(maxlen=tail_lines)
+        self.max_text_size = max_text_size
+        self.additive = collections.OrderedDict()
+        self.complete = []
+        self._text = tempfile.SpooledTemporaryFile(max_size=max_text_size,
+                                                   mode="w+")
+        self._text_size = 0
+        self._first_char = None
+        self._json_lines = 0
+        self._line = ""
+
+    def _read_text(self):
+        self._text.seek(0)
+        return self._text.read()
+
+    @property
+    def text(self):
+        """The whole text or None if it is bigger than the limit."""
+        if self._text_size > self.max_text_size:
+            return None
+        return self._read_text()
+
+    def load_json(self):
+        """Parse the whole text as one JSON document of any size.
+
+        The text is not read back if it is a stream of JSON lines (e.g.
+        chart records) rather than one document.
+
+        :raises ValueError: if the text is not a JSON document
+        """
+        if (self._first_char not in ("{", "[") or self.additive
+                or self.complete or self._json_lines > 1):
+            raise ValueError("The output is not a JSON document.")
+        return json.loads(self._read_text())
+
+    def write(self, data):
+        self._text.write(data)
+        self._text_size += len(data)
+        if self._first_char is None and data.strip():
+            self._first_char = data.lstrip()[0]
+        data = self._line + data
+        # NOTE: "\r" at the end may be the first half of "\r\n"
+        cr = "\r" if data.endswith("\r") else ""
+        lines = _LINE_SEPARATOR.split(data[:len(data) - len(cr)])
+        self._line = lines.pop() + cr
+        while len(self._line) > self.max_text_size:
+            lines.append(self._line[:self.max_text_size])
+            self._line = self._line[self.max_text_size:]
+        for line in lines:
+            self._process_line(line)
+
+    def close(self):
+        if self._line:
+            self._process_line(self._line.rstrip("\r"))
+            self._line = ""
+
+    def _process_line(self, line):
+        if line.lstrip().startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            else:
+                self._json_lines += 1
+            if self._add_chart(record):
+                return
+        self.tail.append(line)
+
+    def _add_chart(self, record):
+        if not isinstance(record, dict) or len(record) != 1:
+            return False
+        chart_type, chart = list(record.items())[0]
+        if chart_type not in ("additive", "complete") or not (
+                isinstance(chart, dict) and "title" in chart):
+            return False
+        if chart_type == "complete":
+            self.complete.append(chart)
+            return True
+        data = chart.get("data")
+        if not isinstance(data, list) or not all(
+                isinstance(p, list) and len(p) == 2 for p in data):
+            return False
+        title = chart["title"]
+        if title not in self.additive:
+            self.additive[title] = (chart, [])
+        self.additive[title][1].extend(data)
+        return True
+
+    def get_charts(self):
+        """Return list of pairs (chart type, chart) of chart records."""
+        charts = []
+        for chart, points in self.additive.values():
+            chart = dict(chart)
+            chart["data"] = list(points)
+            charts.append(("additive", chart))
+        charts.extend(("complete", chart) for chart in self.complete)
+        return charts
+
+
 class VMScenario(nova_utils.NovaScenario):
     """Base class for VM scenarios with basic atomic actions.
 
@@ -90,8 +287,12 @@ class VMScenario(nova_utils.NovaScenario):
 
     RESOURCE_NAME_PREFIX = "rally_vm_"
 
+    def __init__(self, context=None, admin_clients=None, clients=None):
+        super(VMScenario, self).__init__(context, admin_clients, clients)
+        self._ssh_connections = {}
+
     @atomic.action_timer("vm.run_command_over_ssh")
-    def _run_command_over_ssh(self, ssh, command):
+    def _run_command_over_ssh(self, ssh, command, stdout=None):
         """Run command inside an instance.
 
         This is a separate function so that only script execution is timed.
@@ -100,6 +301,8 @@ class VMScenario(nova_utils.NovaScenario):
         :param command: Dictionary specifying command to execute.
             See `rally info find VMTasks.boot_runcommand_delete' parameter
             `command' docstring for explanation.
+        :param stdout: file-like object (e.g. CommandOutput) to write stdout
+            to while it is received instead of returning it as a string
 
         :returns: tuple (exit_status, stdout, stderr)
         """
@@ -135,7 +338,14 @@ class VMScenario(nova_utils.NovaScenario):
 
         cmd.extend(command.get("command_args") or [])
 
-        return ssh.execute(cmd, stdin=stdin)
+        if stdout is None:
+            return ssh.execute(cmd, stdin=stdin)
+
+        stderr = six.moves.StringIO()
+        exit_status = ssh.run(cmd, stdin=stdin, stdout=stdout, stderr=stderr,
+                              raise_on_error=False)[0]
+        stdout.close()
+        return exit_status, stdout, stderr.getvalue()
 
     def _boot_server_with_fip(self, image, flavor, use_floating_ip=True,
                               floating_network=None, **kwargs):
@@ -186,13 +396,20 @@ class VMScenario(nova_utils.NovaScenario):
                         fip["id"], wait=True)
 
     def _delete_server_with_fip(self, server, fip, force_delete=False):
+        self._close_ssh_connections(fip["ip"])
         if fip["is_floating"]:
             self._delete_floating_ip(server, fip)
         return self._delete_server(server, force=force_delete)
 
     @atomic.action_timer("vm.wait_for_ssh")
     def _wait_for_ssh(self, ssh, timeout=120, interval=1):
-        ssh.wait(timeout, interval)
+        start_time = time.time()
+        while not probe_ssh_banner(ssh.host, ssh.port):
+            if time.time() > start_time + timeout:
+                raise exceptions.SSHTimeout("Timeout waiting for '%s'"
+                                            % ssh.host)
+            time.sleep(interval)
+        ssh.wait(max(start_time + timeout - time.time(), 0), interval)
 
     @atomic.action_timer("vm.wait_for_ping")
     def _wait_for_ping(self, server_ip):
@@ -206,13 +423,14 @@ class VMScenario(nova_utils.NovaScenario):
         )
 
     def _run_command(self, server_ip, port, username, password, command,
-                     pkey=None, timeout=120, interval=1):
+                     pkey=None, timeout=120, interval=1, stdout=None):
         """Run command via SSH on server.
 
         Create SSH connection for server, wait for server to become available
         (there is a delay between server being set to ACTIVE and sshd being
         available). Then call run_command_over_ssh to actually execute the
-        command.
+        command. The connection is reused by further commands of the
+        iteration to the same server.
 
         :param server_ip: server ip address
         :param port: ssh port for SSH connection
@@ -224,11 +442,23 @@ class VMScenario(nova_utils.NovaScenario):
         :param pkey: key for SSH authentication
         :param timeout: wait for ssh timeout. Default is 120 seconds
         :param interval: ssh retry interval. Default is 1 second
+        :param stdout: file-like object (e.g. CommandOutput) to write stdout
+            to while it is received instead of returning it as a string
 
         :returns: tuple (exit_status, stdout, stderr)
         """
-        pkey = pkey if pkey else self.context["user"]["keypair"]["private"]
-        ssh = sshutils.SSH(username, server_ip, port=port,
-                           pkey=pkey, password=password)
-        self._wait_for_ssh(ssh, timeout, interval)
-        return self._run_command_over_ssh(ssh, command)
+        key = (str(server_ip), port, username)
+        ssh = self._ssh_connections.get(key)
+        if ssh is None:
+            pkey = pkey if pkey else self.context["user"]["keypair"]["private"]
+            ssh = SSHConnection(username, server_ip, port=port,
+                                pkey=pkey, password=password)
+            self._wait_for_ssh(ssh, timeout, interval)
+            self._ssh_connections[key] = ssh
+        return self._run_command_over_ssh(ssh, command, stdout=stdout)
+
+    def _close_ssh_connections(self, server_ip):
+        """Close SSH connections to the server opened by _run_command."""
+        for key in list(self._ssh_connections):
+            if key[0] == str(server_ip):
+                self._ssh_connections.pop(key).close()
@@ -216,6 +216,19 @@ class BootRuncommandDelete(vm_utils.VMScenario, cinder_utils.CinderBasic):
                     "local_path": "/home/user/work/cve/sh-1.0/bin/sh"
                 }
 
+            The output of the command is processed while it is received.
+            Every line which is a JSON object with the only key `additive'
+            or `complete' is added to the scenario output as a chart, so
+            long-running commands can report their progress, for example:
+
+              .. code-block:: json
+
+                {"additive": {"title": "fio", "chart_plugin": "Lines",
+                              "data": [["read, MB/s", 120.5]]}}
+
+            Points of additive charts with the same title printed by several
+            lines are appended to one chart. Other lines are shown as text,
+            only the tail of a big output is kept.
 
         :param volume_args: volume args for booting server from volume
         :param floating_network: external network name, for floating ip
@@ -244,8 +257,10 @@ class BootRuncommandDelete(vm_utils.VMScenario, cinder_utils.CinderBasic):
             if wait_for_ping:
                 self._wait_for_ping(fip["ip"])
 
+            output = vm_utils.CommandOutput()
             code, out, err = self._run_command(
-                fip["ip"], port, username, password, command=command)
+                fip["ip"], port, username, password, command=command,
+                stdout=output)
             text_area_output = ["StdErr: %s" % (err or "(none)"),
                                 "StdOut:"]
             if code:
@@ -255,7 +270,7 @@ class BootRuncommandDelete(vm_utils.VMScenario, cinder_utils.CinderBasic):
                         "command": command, "code": code, "error": err})
             # Let's try to load output data
             try:
-                data = json.loads(out)
+                data = output.load_json()
                 # 'echo 42' produces very json-compatible result
                 #  - check it here
                 if not isinstance(data, dict):
@@ -278,12 +293,26 @@ class BootRuncommandDelete(vm_utils.VMScenario, cinder_utils.CinderBasic):
             for chart_type, charts in data.items():
                 for chart in charts:
                     self.add_output(**{chart_type: chart})
-        else:
+            return
+
+        # NOTE: charts streamed as separate JSON lines
+        charts = output.get_charts()
+        for chart_type, chart in charts:
+            self.add_output(**{chart_type: chart})
+        if charts and not output.tail:
+            return
+        if output.text is not None and not charts:
             # it's a dict with several unknown lines
-            text_area_output.extend(out.split("\n"))
-            self.add_output(complete={"title": "Script Output",
-                                      "chart_plugin": "TextArea",
-                                      "data": text_area_output})
+            text_area_output.extend(output.text.split("\n"))
+        else:
+            if output.text is None:
+                text_area_output.append(
+                    "(only the last %d lines of output are kept)"
+                    % output.tail.maxlen)
+            text_area_output.extend(output.tail)
+        self.add_output(complete={"title": "Script Output",
+                                  "chart_plugin": "TextArea",
+                                  "data": text_area_output})
 
 
 @scenario.configure(context={"cleanup@openstack": ["nova", "heat"],
@@ -0,0 +1,297 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fcntl
+import hashlib
+import os
+import tempfile
+import threading
+
+from rally.common import cfg
+from rally.common import logging
+from rally import exceptions
+import requests
+
+
+CONF = cfg.CONF
+LOG = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _open_partial(path):
+    """Open and lock the partial file, wait for other downloads of it."""
+    while True:
+        f = open(path, "ab")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.path.samestat(os.fstat(f.fileno()), os.stat(path)):
+                return f
+        except OSError:
+            pass
+        # NOTE: the file was completed and renamed by another process
+        #   while we were waiting for the lock
+        f.close()
+        if not os.path.exists(path):
+            return None
+
+
+def _hash_file(path, hashes):
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            for h in hashes.values():
+                h.update(chunk)
+            size += len(chunk)
+    return size
+
+
+def download(url, path, checksum=None, on_complete=None):
+    """Download data located by the URL to the file.
+
+    The data is written to a partial file '<path>.part' which is renamed to
+    the target path once the data is received and verified. Downloading of
+    a partial file left by an interrupted run is resumed by an HTTP Range
+    request. Concurrent downloads to the same path wait for each other.
+
+    :param url: URL of the data
+    :param path: the path of the file to save the data to
+    :param checksum: expected checksum of the data in form
+        '<algorithm>:<hex digest>' where algorithm is any one supported by
+        hashlib (md5, sha256, etc). The data is not verified if it is None.
+    :param on_complete: function which is called with sha256 hex digest of
+        the data after the file is renamed, but before concurrent downloads
+        stop waiting, so it can move the file to its final place
+    :returns: sha256 hex digest of the data or None if the data was
+        downloaded by another process
+    """
+    part_path = "%s.part" % path
+    f = _open_partial(part_path)
+    if f is None:
+        return None
+    with f:
+        hashes = {"sha256": hashlib.sha256()}
+        if checksum:
+            algorithm, _sep, expected = checksum.partition(":")
+            hashes.setdefault(algorithm, hashlib.new(algorithm))
+        offset = _hash_file(part_path, hashes)
+
+        headers = {"Range": "bytes=%d-" % offset} if offset else {}
+        response = requests.get(url, stream=True, headers=headers)
+        try:
+            if offset and response.status_code == 416:
+                # NOTE: the partial file is not a prefix of the data anymore
+                response.close()
+                hashes = dict((name, hashlib.new(name)) for name in hashes)
+                offset = 0
+                response = requests.get(url, stream=True, headers={})
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                LOG.debug("Server does not support ranges, downloading %s "
+                          "from the beginning." % url)
+                hashes = dict((name, hashlib.new(name)) for name in hashes)
+                offset = 0
+            if offset:
+                LOG.info("Resuming download of %s from %d bytes."
+                         % (url, offset))
+            else:
+                f.truncate(0)
+            for chunk in response.iter_content(_CHUNK_SIZE):
+                for h in hashes.values():
+                    h.update(chunk)
+                f.write(chunk)
+            f.flush()
+        finally:
+            response.close()
+
+        if checksum and hashes[algorithm].hexdigest() != expected.lower():
+            os.unlink(part_path)
+            raise exceptions.RallyException(
+                "Checksum of the data downloaded from %s is %s:%s, expected "
+                "%s." % (url, algorithm, hashes[algorithm].hexdigest(),
+                         checksum))
+        # NOTE: the file is renamed while it is locked, so processes
+        #   waiting for the lock see that it is completed
+        os.rename(part_path, path)
+        digest = hashes["sha256"].hexdigest()
+        if on_complete is not None:
+            on_complete(digest)
+        return digest
+
+
+class ImageCache(object):
+    """Local cache of images downloaded from URLs.
+
+    The data is stored under sha256 of its content, so the same image
+    published under several URLs is stored once. Every URL refers to the
+    content by a small index file. When the total size of the stored data
+    exceeds the limit, the least recently used images are removed.
+
+    Files are replaced atomically, so the same cache directory can be used
+    by several rally processes of one node. Interrupted downloads are resumed
+    by the next attempt to get the image.
+    """
+
+    def __init__(self, path, max_size):
+        """Init cache.
+
+        :param path: the directory to store images in
+        :param max_size: the max total size of images in bytes
+        """
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._url_locks = {}
+
+    def _data_path(self, digest):
+        return os.path.join(self.path, "data", digest)
+
+    def _index_path(self, url):
+        return os.path.join(self.path, "urls",
+                            hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _replace(self, src, dst):
+        if not os.path.isdir(os.path.dirname(dst)):
+            try:
+                os.makedirs(os.path.dirname(dst))
+            except OSError:
+                # NOTE: the directory might be created by another thread
+                if not os.path.isdir(os.path.dirname(dst)):
+                    raise
+        os.rename(src, dst)
+
+    def _lookup(self, url):
+        try:
+            with open(self._index_path(url)) as f:
+                digest = f.read().strip()
+        except IOError:
+            return None
+        data_path = self._data_path(digest)
+        if not os.path.isfile(data_path):
+            return None
+        # NOTE: the modification time is used as the time of the last usage
+        os.utime(data_path, None)
+        return data_path
+
+    def _download(self, url, checksum=None):
+        # NOTE: partial downloads are kept under the hash of the URL to
+        #   resume them by the next attempt
+        partial_path = os.path.join(
+            self.path, "partial",
+            hashlib.sha256(url.encode("utf-8")).hexdigest())
+        if not os.path.isdir(os.path.dirname(partial_path)):
+            try:
+                os.makedirs(os.path.dirname(partial_path))
+            except OSError:
+                if not os.path.isdir(os.path.dirname(partial_path)):
+                    raise
+
+        def publish(digest):
+            # NOTE: the image is published while the partial file is still
+            #   locked, so processes waiting for the same download find it
+            #   in the cache as soon as they stop waiting
+            self._replace(partial_path, self._data_path(digest))
+            with tempfile.NamedTemporaryFile("w", dir=self.path,
+                                             delete=False) as f:
+                f.write(digest)
+            self._replace(f.name, self._index_path(url))
+
+        digest = download(url, partial_path, checksum=checksum,
+                          on_complete=publish)
+        if digest is None:
+            # NOTE: the image has been downloaded by another process, it is
+            #   downloaded again only if that download has failed
+            return self._lookup(url) or self._download(url, checksum)
+        return self._data_path(digest)
+
+    def _evict(self, keep):
+        data_dir = os.path.dirname(keep)
+        images = []
+        for name in os.listdir(data_dir):
+            path = os.path.join(data_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            images.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _m, size, _p in images)
+        for mtime, size, path in sorted(images):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            LOG.debug("Removing image %s from the cache." % path)
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+        if total > self.max_size:
+            LOG.warning("The image %s is bigger than the limit of the image"
+                        " cache." % keep)
+
+    def get(self, url, checksum=None):
+        """Return a path to the local copy of the image.
+
+        :param url: URL of the image to download if it is not cached yet
+        :param checksum: expected checksum of the image in form
+            '<algorithm>:<hex digest>', see `download'
+        """
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            data_path = self._lookup(url)
+            if data_path is not None and checksum:
+                algorithm, _sep, expected = checksum.partition(":")
+                hashes = {algorithm: hashlib.new(algorithm)}
+                _hash_file(data_path, hashes)
+                if hashes[algorithm].hexdigest() != expected.lower():
+                    LOG.info("Checksum of the cached image %s does not "
+                             "match %s." % (url, checksum))
+                    data_path = None
+            if data_path is None:
+                LOG.info("Downloading image %s to the cache." % url)
+                data_path = self._download(url, checksum)
+                with self._lock:
+                    self._evict(keep=data_path)
+            return data_path
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_image_location(image_location, checksum=None):
+    """Return a location to upload the image from.
+
+    Images located by URLs are served from the local image cache, so every
+    URL is downloaded once per rally node. Local files and all locations in
+    case of the disabled cache are returned as is.
+
+    :param image_location: a path or URL of the image
+    :param checksum: expected checksum of the image in form
+        '<algorithm>:<hex digest>', see `download'
+    """
+    global _CACHE
+
+    if (not image_location or not CONF.openstack.image_cache_max_size
+            or os.path.isfile(os.path.expanduser(image_location))):
+        return image_location
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ImageCache(
+                CONF.openstack.image_cache_dir,
+                CONF.openstack.image_cache_max_size * 1024 * 1024)
+    return _CACHE.get(image_location, checksum=checksum)
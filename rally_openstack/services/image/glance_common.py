@@ -12,10 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 from rally import exceptions
 from rally.task import atomic
 
 from rally_openstack.services.image import image as image_service
+from rally_openstack import streaming
 
 
 class GlanceMixin(object):
@@ -56,6 +59,24 @@ class GlanceMixin(object):
             return self._get_client().images.data(image_id,
                                                   do_checksum=do_checksum)
 
+    def download_image_data(self, image_id, do_checksum=False):
+        """Download the whole data of an image and measure the throughput.
+
+        Unlike download_image, the data is read up to the end within the
+        atomic action, but it is not kept in memory.
+
+        :param image_id: ID of the image to download.
+        :param do_checksum: Enable/disable incremental checksum validation.
+        :returns: dict with statistics of the download (see
+            rally_openstack.streaming.consume)
+        """
+        aname = "glance_v%s.download_image" % self.version
+        with atomic.ActionTimer(self, aname):
+            started_at = time.time()
+            body = self._get_client().images.data(image_id,
+                                                  do_checksum=do_checksum)
+            return streaming.consume(body or [], started_at)
+
 
 class UnifiedGlanceMixin(object):
 
@@ -64,12 +85,15 @@ class UnifiedGlanceMixin(object):
         if hasattr(image, "visibility"):
             return image_service.UnifiedImage(id=image.id, name=image.name,
                                               status=image.status,
-                                              visibility=image.visibility)
+                                              visibility=image.visibility,
+                                              owner=getattr(image, "owner",
+                                                            None))
         else:
             return image_service.UnifiedImage(
                 id=image.id, name=image.name,
                 status=image.status,
-                visibility=("public" if image.is_public else "private"))
+                visibility=("public" if image.is_public else "private"),
+                owner=getattr(image, "owner", None))
 
     def get_image(self, image):
         """Get specified image.
@@ -91,3 +115,13 @@ class UnifiedGlanceMixin(object):
         :rtype: iterable containing image data or None
         """
         return self._impl.download_image(image_id, do_checksum=do_checksum)
+
+    def download_image_data(self, image_id, do_checksum=False):
+        """Download the whole data of an image and measure the throughput.
+
+        :param image_id: image id to look up
+        :param do_checksum: Enable/disable checksum validation
+        :returns: dict with statistics of the download
+        """
+        return self._impl.download_image_data(image_id,
+                                              do_checksum=do_checksum)
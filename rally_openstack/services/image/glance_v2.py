@@ -151,6 +151,28 @@ class GlanceV2Service(service.Service, glance_common.GlanceMixin):
         self._clients.glance("2").images.update(image_id,
                                                 visibility=visibility)
 
+    @atomic.action_timer("glance_v2.add_member")
+    def add_member(self, image_id, member_id):
+        """Share the image with the project.
+
+        :param image_id: ID of the shared image
+        :param member_id: ID of the project to share the image with
+        """
+        return self._clients.glance("2").image_members.create(image_id,
+                                                              member_id)
+
+    @atomic.action_timer("glance_v2.update_member_status")
+    def update_member_status(self, image_id, member_id,
+                             member_status="accepted"):
+        """Update the status of the image membership.
+
+        :param image_id: ID of the shared image
+        :param member_id: ID of the project the image is shared with
+        :param member_status: "accepted", "rejected" or "pending"
+        """
+        return self._clients.glance("2").image_members.update(
+            image_id, member_id, member_status)
+
     @atomic.action_timer("glance_v2.deactivate_image")
     def deactivate_image(self, image_id):
         """deactivate image."""
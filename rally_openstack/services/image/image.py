@@ -19,7 +19,7 @@ from rally.task import service
 CONF = cfg.CONF
 
 UnifiedImage = service.make_resource_cls(
-    "Image", properties=["id", "name", "visibility", "status"])
+    "Image", properties=["id", "name", "visibility", "status", "owner"])
 
 
 class VisibilityException(exceptions.RallyException):
@@ -131,3 +131,14 @@ class Image(service.UnifiedService):
         :rtype: iterable containing image data or None
         """
         return self._impl.download_image(image, do_checksum=do_checksum)
+
+    @service.should_be_overridden
+    def download_image_data(self, image, do_checksum=False):
+        """Download the whole data of an image and measure the throughput.
+
+        :param image: image object or id to look up
+        :param do_checksum: Enable/disable checksum validation
+        :returns: dict with the number of downloaded bytes, time to first
+            byte, duration and throughput of the download
+        """
+        return self._impl.download_image_data(image, do_checksum=do_checksum)
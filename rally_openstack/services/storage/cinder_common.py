@@ -16,8 +16,8 @@ import random
 
 from rally import exceptions
 from rally.task import atomic
-from rally.task import utils as bench_utils
 
+from rally_openstack import polling
 from rally_openstack.services.image import image
 from rally_openstack.services.storage import block
 
@@ -50,8 +50,8 @@ class CinderMixin(object):
         return res
 
     def _wait_available_volume(self, volume):
-        return bench_utils.wait_for_status(
-            volume,
+        return polling.wait_for_status(
+            self, "cinder", volume,
             ready_statuses=["available"],
             update_resource=self._update_resource,
             timeout=CONF.openstack.cinder_volume_create_timeout,
@@ -69,8 +69,8 @@ class CinderMixin(object):
         aname = "cinder_v%s.delete_volume" % self.version
         with atomic.ActionTimer(self, aname):
             self._get_client().volumes.delete(volume)
-            bench_utils.wait_for_status(
-                volume,
+            polling.wait_for_status(
+                self, "cinder", volume,
                 ready_statuses=["deleted"],
                 check_deletion=True,
                 update_resource=self._update_resource,
@@ -188,8 +188,8 @@ class CinderMixin(object):
             glance = image.Image(self._clients)
 
             image_inst = glance.get_image(image_id)
-            image_inst = bench_utils.wait_for_status(
-                image_inst,
+            image_inst = polling.wait_for_status(
+                self, "cinder", image_inst,
                 ready_statuses=["active"],
                 update_resource=glance.get_image,
                 timeout=CONF.openstack.glance_image_create_timeout,
@@ -282,8 +282,8 @@ class CinderMixin(object):
         aname = "cinder_v%s.delete_snapshot" % self.version
         with atomic.ActionTimer(self, aname):
             self._get_client().volume_snapshots.delete(snapshot)
-            bench_utils.wait_for_status(
-                snapshot,
+            polling.wait_for_status(
+                self, "cinder", snapshot,
                 ready_statuses=["deleted"],
                 check_deletion=True,
                 update_resource=self._update_resource,
@@ -302,8 +302,8 @@ class CinderMixin(object):
         aname = "cinder_v%s.delete_backup" % self.version
         with atomic.ActionTimer(self, aname):
             self._get_client().backups.delete(backup)
-            bench_utils.wait_for_status(
-                backup,
+            polling.wait_for_status(
+                self, "cinder", backup,
                 ready_statuses=["deleted"],
                 check_deletion=True,
                 update_resource=self._update_resource,
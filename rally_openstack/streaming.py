@@ -0,0 +1,100 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import time
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def consume(body, started_at, checksum=None, chunk_size=CHUNK_SIZE):
+    """Read the whole body of a download and discard the data.
+
+    File-like bodies are read into one reusable buffer, other bodies are
+    iterated chunk by chunk, so the memory usage does not depend on the size
+    of the downloaded data.
+
+    :param body: file-like object with `readinto` method or an iterable of
+        chunks
+    :param started_at: time when the request was sent
+    :param checksum: name of hashlib algorithm to calculate the checksum of
+        the data incrementally or None to skip calculation
+    :param chunk_size: size of the buffer for file-like bodies
+    :returns: dict with the number of downloaded bytes, time to first byte
+        and duration of the whole download in seconds, throughput in MB/s
+        and hex digest of the data (None if checksum is not requested)
+    """
+    hasher = hashlib.new(checksum) if checksum else None
+    size = 0
+    first_byte_at = None
+
+    if hasattr(body, "readinto"):
+        buf = memoryview(bytearray(chunk_size))
+
+        def chunks():
+            while True:
+                read = body.readinto(buf)
+                if not read:
+                    return
+                yield buf[:read]
+    else:
+        def chunks():
+            return iter(body)
+
+    for chunk in chunks():
+        if not chunk:
+            continue
+        if first_byte_at is None:
+            first_byte_at = time.time()
+        size += len(chunk)
+        if hasher:
+            hasher.update(chunk)
+
+    finished_at = time.time()
+    duration = finished_at - started_at
+    return {"bytes": size,
+            "first_byte": (first_byte_at or finished_at) - started_at,
+            "duration": duration,
+            "throughput": size / duration / 1024 / 1024 if duration else 0,
+            "checksum": hasher.hexdigest() if hasher else None}
+
+
+def merge(stats_list):
+    """Merge statistics of sequential downloads into the total ones.
+
+    :param stats_list: list of results of `consume`
+    """
+    size = sum(s["bytes"] for s in stats_list)
+    duration = sum(s["duration"] for s in stats_list)
+    return {"bytes": size,
+            "first_byte": (sum(s["first_byte"] for s in stats_list)
+                           / len(stats_list)) if stats_list else 0,
+            "duration": duration,
+            "throughput": size / duration / 1024 / 1024 if duration else 0,
+            "checksum": None}
+
+
+def get_output(title, stats):
+    """Return additive output of the download statistics.
+
+    :param title: title of the output table
+    :param stats: the result of `consume`
+    """
+    return {"title": title,
+            "description": "Downloaded data per iteration",
+            "chart_plugin": "StatsTable",
+            "data": [["Size, MB", stats["bytes"] / 1024.0 / 1024.0],
+                     ["Time to first byte, sec", stats["first_byte"]],
+                     ["Throughput, MB/s", stats["throughput"]]]}
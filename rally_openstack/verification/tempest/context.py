@@ -15,6 +15,7 @@
 
 import os
 import re
+import shutil
 
 from rally.common import logging
 from rally import exceptions
@@ -24,6 +25,7 @@ from rally.verification import utils
 import requests
 from six.moves import configparser
 
+from rally_openstack.services.image import cache as image_cache
 from rally_openstack.services.image import image
 from rally_openstack.verification.tempest import config as conf
 from rally_openstack.wrappers import network
@@ -171,36 +173,48 @@ class TempestContext(context.VerifierContext):
                   "expression '%s'." % conf.CONF.openstack.img_name_regex)
 
     def _download_image_from_source(self, target_path, image=None):
+        # NOTE: the image is saved under the target path only when it is
+        #   complete, so an interrupted download is not taken for the image
+        part_path = "%s.part" % target_path
         if image:
             LOG.debug("Downloading image '%s' from Glance to %s."
                       % (image.name, target_path))
-            with open(target_path, "wb") as image_file:
+            with open(part_path, "wb") as image_file:
                 for chunk in self.clients.glance().images.data(image.id):
                     image_file.write(chunk)
+            os.rename(part_path, target_path)
         else:
+            img_url = conf.CONF.openstack.img_url
             LOG.debug("Downloading image from %s to %s."
-                      % (conf.CONF.openstack.img_url, target_path))
+                      % (img_url, target_path))
             try:
-                response = requests.get(conf.CONF.openstack.img_url,
-                                        stream=True)
+                if conf.CONF.openstack.image_cache_max_size:
+                    cached_path = image_cache.get_image_location(
+                        img_url, checksum=conf.CONF.openstack.img_checksum)
+                    # NOTE: all verifiers of the node share one copy of
+                    #   the image stored in the image cache
+                    if os.path.exists(part_path):
+                        os.unlink(part_path)
+                    try:
+                        os.link(cached_path, part_path)
+                    except OSError:
+                        shutil.copyfile(cached_path, part_path)
+                    os.rename(part_path, target_path)
+                else:
+                    image_cache.download(
+                        img_url, target_path,
+                        checksum=conf.CONF.openstack.img_checksum)
             except requests.ConnectionError as err:
                 msg = ("Failed to download image. Possibly there is no "
                        "connection to Internet. Error: %s."
                        % (str(err) or "unknown"))
                 raise exceptions.RallyException(msg)
-
-            if response.status_code == 200:
-                with open(target_path, "wb") as image_file:
-                    for chunk in response.iter_content(chunk_size=1024):
-                        if chunk:   # filter out keep-alive new chunks
-                            image_file.write(chunk)
-                            image_file.flush()
-            else:
-                if response.status_code == 404:
+            except requests.HTTPError as err:
+                if err.response.status_code == 404:
                     msg = "Failed to download image. Image was not found."
                 else:
                     msg = ("Failed to download image. HTTP error code %d."
-                           % response.status_code)
+                           % err.response.status_code)
                 raise exceptions.RallyException(msg)
 
         LOG.debug("The image has been successfully downloaded!")
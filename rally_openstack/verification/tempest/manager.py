@@ -12,11 +12,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import heapq
+import json
+import multiprocessing
 import os
 import re
 import shutil
 import subprocess
 
+from rally.common import logging
 from rally.common import yamlutils as yaml
 from rally import exceptions
 from rally.plugins.common.verification import testr
@@ -27,6 +31,8 @@ from rally_openstack.verification.tempest import config
 from rally_openstack.verification.tempest import consts
 
 
+LOG = logging.getLogger(__name__)
+
 AVAILABLE_SETS = (list(consts.TempestTestSets) +
                   list(consts.TempestApiTestSets) +
                   list(consts.TempestScenarioTestSets))
@@ -67,6 +73,11 @@ class TempestManager(testr.TestrLauncher):
     RUN_ARGS = {"set": "Name of predefined set of tests. Known names: %s"
                        % ", ".join(AVAILABLE_SETS)}
 
+    def __init__(self, *args, **kwargs):
+        super(TempestManager, self).__init__(*args, **kwargs)
+        self._worker_file = None
+        self._tests_index = None
+
     @property
     def run_environ(self):
         env = super(TempestManager, self).run_environ
@@ -81,6 +92,14 @@ class TempestManager(testr.TestrLauncher):
     def configfile(self):
         return os.path.join(self.home_dir, "tempest.conf")
 
+    @property
+    def _durations_file(self):
+        return os.path.join(self.home_dir, "test_durations.json")
+
+    @property
+    def _tests_index_file(self):
+        return os.path.join(self.base_dir, "tests_index.json")
+
     def validate_args(self, args):
         """Validate given arguments."""
         super(TempestManager, self).validate_args(args)
@@ -130,6 +149,7 @@ class TempestManager(testr.TestrLauncher):
             raise NotImplementedError(
                 "'%s' verifiers don't support extra installation settings "
                 "for extensions." % self.get_name())
+        self._drop_tests_index()
         version = version or "master"
         egg = re.sub("\.git$", "", os.path.basename(source.strip("/")))
         full_source = "git+{0}@{1}#egg={2}".format(source, version, egg)
@@ -179,6 +199,7 @@ class TempestManager(testr.TestrLauncher):
 
     def uninstall_extension(self, name):
         """Uninstall a Tempest plugin."""
+        self._drop_tests_index()
         for ext in self.list_extensions():
             if ext["name"] == name and os.path.exists(ext["location"]):
                 shutil.rmtree(ext["location"])
@@ -192,14 +213,149 @@ class TempestManager(testr.TestrLauncher):
         """List all Tempest tests."""
         if pattern:
             pattern = self._transform_pattern(pattern)
-        return super(TempestManager, self).list_tests(pattern)
+        return self._list_tests(pattern)
+
+    def _list_tests(self, pattern=""):
+        tests = self._get_tests_index()
+        if pattern:
+            # NOTE: testr and stestr filter tests by re.search as well
+            pattern = re.compile(pattern)
+            tests = [t for t in tests if pattern.search(t)]
+        return tests
+
+    def _get_tests_index_key(self):
+        """Return git SHAs of Tempest and installed plugins."""
+        repos = [self.repo_dir]
+        extensions_dir = os.path.join(self.base_dir, "extensions")
+        if os.path.isdir(extensions_dir):
+            repos.extend(
+                os.path.join(extensions_dir, name)
+                for name in sorted(os.listdir(extensions_dir))
+                if os.path.isdir(os.path.join(extensions_dir, name, ".git")))
+        key = []
+        for repo in repos:
+            try:
+                sha = utils.check_output(["git", "rev-parse", "HEAD"],
+                                         cwd=repo, debug_output=False)
+            except (subprocess.CalledProcessError, OSError):
+                return None
+            key.append("%s@%s" % (os.path.basename(repo), sha.strip()))
+        return key
+
+    def _get_tests_index(self):
+        """Return ids of all tests discovered once per Tempest version.
+
+        The index is stored in the verifier dir and is rebuilt when git
+        SHA of Tempest or of any installed plugin changes.
+        """
+        key = self._get_tests_index_key()
+        if key is None:
+            return super(TempestManager, self).list_tests()
+        if self._tests_index is None:
+            try:
+                with open(self._tests_index_file) as f:
+                    self._tests_index = json.load(f)
+            except (IOError, ValueError):
+                pass
+        if self._tests_index and self._tests_index.get("key") == key:
+            return list(self._tests_index["tests"])
+
+        LOG.debug("Discovering tests of verifier %s." % self.verifier)
+        tests = super(TempestManager, self).list_tests()
+        self._tests_index = {"key": key, "tests": tests}
+        with open(self._tests_index_file, "w") as f:
+            json.dump(self._tests_index, f)
+        return list(tests)
+
+    def _drop_tests_index(self):
+        self._tests_index = None
+        try:
+            os.remove(self._tests_index_file)
+        except OSError:
+            pass
 
     def prepare_run_args(self, run_args):
         """Prepare 'run_args' for testr context."""
         if run_args.get("pattern"):
             run_args["pattern"] = self._transform_pattern(run_args["pattern"])
+        self._worker_file = self._schedule_tests(run_args)
         return run_args
 
+    def run(self, context):
+        """Run Tempest tests."""
+        if self._worker_file:
+            testr_cmd = context["testr_cmd"]
+            # NOTE: the number of workers is set by the worker file
+            if "--concurrency" in testr_cmd:
+                i = testr_cmd.index("--concurrency")
+                del testr_cmd[i:i + 2]
+            testr_cmd[2:2] = ["--worker-file", self._worker_file]
+            self._worker_file = None
+        results = super(TempestManager, self).run(context)
+        self._save_test_durations(results.tests)
+        return results
+
+    def _load_test_durations(self):
+        try:
+            with open(self._durations_file) as f:
+                return json.load(f)
+        except (IOError, ValueError):
+            return {}
+
+    def _save_test_durations(self, tests):
+        if not os.path.isdir(self.home_dir):
+            return
+        durations = self._load_test_durations()
+        for test_id, test in tests.items():
+            if test["status"] in ("success", "fail", "xfail", "uxsuccess"):
+                durations[test_id.split("[")[0]] = float(test["duration"])
+        with open(self._durations_file, "w") as f:
+            json.dump(durations, f)
+
+    def _schedule_tests(self, run_args):
+        """Split tests into worker groups using durations of previous runs.
+
+        Test classes are distributed across workers longest first, every
+        class goes to the least loaded worker. Classes are not split, so
+        resources of a class are set up once as by the default partitioning.
+
+        :returns: a path to stestr worker file or None if the default
+            partitioning should be used
+        """
+        concurrency = run_args.get("concurrency", 0)
+        if self._use_testr or concurrency == 1 or run_args.get("failed"):
+            return None
+        durations = self._load_test_durations()
+        if not durations:
+            return None
+
+        tests = (run_args.get("load_list")
+                 or self._list_tests(run_args.get("pattern", "")))
+        classes = {}
+        default = sum(durations.values()) / len(durations)
+        for test_id in tests:
+            name = test_id.split("[")[0]
+            cls = name.rsplit(".", 1)[0]
+            classes[cls] = classes.get(cls, 0) + durations.get(name, default)
+
+        workers = [(0, i, []) for i in range(
+            min(concurrency or multiprocessing.cpu_count(), len(classes)))]
+        for cls, duration in sorted(classes.items(), key=lambda c: -c[1]):
+            load, i, group = heapq.heappop(workers)
+            group.append("^%s\\." % re.escape(cls))
+            heapq.heappush(workers, (load + duration, i, group))
+        if len(workers) < 2:
+            return None
+        LOG.debug("Tests are split into %d worker groups, the longest one "
+                  "is expected to take %.1fs."
+                  % (len(workers), max(w[0] for w in workers)))
+
+        worker_file = os.path.join(self.home_dir, "worker_groups.yaml")
+        with open(worker_file, "w") as f:
+            # NOTE: JSON is a subset of YAML expected by stestr
+            json.dump([{"worker": group} for _l, _i, group in workers], f)
+        return worker_file
+
     @staticmethod
     def _transform_pattern(pattern):
         """Transform pattern into Tempest-specific pattern."""
@@ -45,12 +45,24 @@ def generate_cidr(start_cidr="10.2.0.0/24"):
     :param start_cidr: start CIDR str
     :returns: next available CIDR str
     """
-    if netaddr.IPNetwork(start_cidr).version == 4:
-        cidr = str(netaddr.IPNetwork(start_cidr).next(next(cidr_incr)))
-    else:
-        cidr = str(netaddr.IPNetwork(start_cidr).next(next(ipv6_cidr_incr)))
-    LOG.debug("CIDR generated: %s" % cidr)
-    return cidr
+    return generate_cidrs(start_cidr)[0]
+
+
+def generate_cidrs(start_cidr="10.2.0.0/24", count=1):
+    """Generate several CIDRs for networks or subnets at once.
+
+    The start CIDR is parsed once for all of them. The CIDRs are unique
+    among all processes and threads as the ones of `generate_cidr'.
+
+    :param start_cidr: start CIDR str
+    :param count: the number of CIDRs to generate
+    :returns: list of next available CIDR strs
+    """
+    start = netaddr.IPNetwork(start_cidr)
+    incr = cidr_incr if start.version == 4 else ipv6_cidr_incr
+    cidrs = [str(start.next(next(incr))) for i in range(count)]
+    LOG.debug("CIDRs generated: %s" % ", ".join(cidrs))
+    return cidrs
 
 
 class NetworkWrapperException(exceptions.RallyException):
@@ -200,6 +212,30 @@ class NeutronWrapper(NetworkWrapper):
             start_cidr=self.start_cidr if ip_version == 4
             else self.start_ipv6_cidr)
 
+    def _generate_cidrs(self, ip_version=4, count=1):
+        return generate_cidrs(
+            start_cidr=self.start_cidr if ip_version == 4
+            else self.start_ipv6_cidr, count=count)
+
+    def create_subnets(self, subnets):
+        """Create neutron subnets by one bulk request.
+
+        Subnets are created one by one if bulk requests are not allowed by
+        neutron.
+
+        :param subnets: list of POST /v2.0/subnets request bodies
+        :returns: list of neutron subnet dicts
+        """
+        if len(subnets) == 1:
+            return [self.client.create_subnet(
+                {"subnet": subnets[0]})["subnet"]]
+        try:
+            return self.client.create_subnet({"subnets": subnets})["subnets"]
+        except neutron_exceptions.BadRequest as e:
+            LOG.debug("Bulk creation of subnets failed: %s" % e)
+        return [self.client.create_subnet({"subnet": subnet})["subnet"]
+                for subnet in subnets]
+
     def create_network(self, tenant_id, **kwargs):
         """Create network.
 
@@ -237,34 +273,37 @@ class NeutronWrapper(NetworkWrapper):
 
         dualstack = kwargs.get("dualstack", False)
 
-        subnets = []
         subnets_num = kwargs.get("subnets_num", 0)
-        ip_versions = itertools.cycle(
+        ip_versions = list(itertools.islice(itertools.cycle(
             [self.SUBNET_IP_VERSION, self.SUBNET_IPV6_VERSION]
-            if dualstack else [self.SUBNET_IP_VERSION])
-        for i in range(subnets_num):
-            ip_version = next(ip_versions)
-            subnet_args = {
-                "subnet": {
-                    "tenant_id": tenant_id,
-                    "network_id": network["id"],
-                    "name": self.owner.generate_random_name(),
-                    "ip_version": ip_version,
-                    "cidr": self._generate_cidr(ip_version),
-                    "enable_dhcp": True,
-                    "dns_nameservers": (
-                        kwargs.get("dns_nameservers", ["8.8.8.8", "8.8.4.4"])
-                        if ip_version == 4
-                        else kwargs.get("dns_nameservers",
-                                        ["dead:beaf::1", "dead:beaf::2"]))
-                }
-            }
-            subnet = self.client.create_subnet(subnet_args)["subnet"]
-            subnets.append(subnet["id"])
+            if dualstack else [self.SUBNET_IP_VERSION]), subnets_num))
+        # NOTE: CIDRs of all subnets of the same IP version are generated
+        #   in one step
+        cidrs = dict((v, iter(self._generate_cidrs(v, ip_versions.count(v))))
+                     for v in set(ip_versions))
+        subnets_args = []
+        for ip_version in ip_versions:
+            subnets_args.append({
+                "tenant_id": tenant_id,
+                "network_id": network["id"],
+                "name": self.owner.generate_random_name(),
+                "ip_version": ip_version,
+                "cidr": next(cidrs[ip_version]),
+                "enable_dhcp": True,
+                "dns_nameservers": (
+                    kwargs.get("dns_nameservers", ["8.8.8.8", "8.8.4.4"])
+                    if ip_version == 4
+                    else kwargs.get("dns_nameservers",
+                                    ["dead:beaf::1", "dead:beaf::2"]))
+            })
 
-            if router:
+        subnets = []
+        if subnets_args:
+            subnets = [s["id"] for s in self.create_subnets(subnets_args)]
+        if router:
+            for subnet_id in subnets:
                 self.client.add_interface_router(router["id"],
-                                                 {"subnet_id": subnet["id"]})
+                                                 {"subnet_id": subnet_id})
 
         return {"id": network["id"],
                 "name": network["name"],
@@ -0,0 +1,66 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from rally.common import logging
+from six.moves.urllib import parse
+
+
+LOG = logging.getLogger(__name__)
+
+
+def get_bulk_delete_limit(client):
+    """Return the max number of objects deleted by one bulk-delete request.
+
+    :param client: swiftclient.client.Connection instance
+    :returns: the limit advertised by the cluster via /info or 0 if the
+        bulk-delete middleware is not enabled
+    """
+    try:
+        info = client.get_capabilities()
+    except Exception as e:
+        LOG.debug("Failed to get capabilities of swift cluster: %s" % e)
+        return 0
+    return info.get("bulk_delete", {}).get("max_deletes_per_request", 0)
+
+
+def bulk_delete(client, objects):
+    """Delete objects by one bulk-delete request.
+
+    :param client: swiftclient.client.Connection instance
+    :param objects: list of pairs (container name, object name)
+    :returns: set of pairs (container name, object name) of objects which
+        were not deleted. Objects which are already missed are treated as
+        deleted.
+    """
+    objects = set(objects)
+    paths = [parse.quote("/%s/%s" % (container, name))
+             for container, name in objects]
+    body = client.post_account(
+        headers={"Accept": "application/json",
+                 "Content-Type": "text/plain"},
+        query_string="bulk-delete",
+        data="\n".join(paths).encode("utf-8"))[1]
+    result = json.loads(body)
+
+    failed = set()
+    for path, status in result.get("Errors", []):
+        failed.add(tuple(parse.unquote(path).lstrip("/").split("/", 1)))
+    if not failed and not result.get("Response Status", "").startswith("2"):
+        # NOTE: the whole request is rejected (e.g. too many objects)
+        LOG.debug("Bulk deletion of swift objects failed: %s"
+                  % result.get("Response Body"))
+        return objects
+    return failed & objects
@@ -34,6 +34,51 @@ class ResourceDecoratorTestCase(test.TestCase):
         self.assertEqual("res", Fake._resource)
 
 
+class ListingCacheTestCase(test.TestCase):
+
+    def test_list(self):
+        resources = [{"id": 1, "tenant_id": "t1"},
+                     {"id": 2, "tenant_id": "t2"},
+                     {"id": 3, "tenant_id": "t1"}]
+        list_resources = mock.Mock(return_value=resources)
+        cache = base.ListingCache()
+        key = ("service", "resources", None)
+
+        self.assertEqual(resources, cache.list(key, list_resources))
+        self.assertEqual([resources[0], resources[2]],
+                         cache.list(key, list_resources, tenant_uuid="t1"))
+        self.assertEqual([resources[1]],
+                         cache.list(key, list_resources, tenant_uuid="t2"))
+        self.assertEqual([],
+                         cache.list(key, list_resources, tenant_uuid="t3"))
+        list_resources.assert_called_once_with()
+
+    def test_list_with_custom_tenant_field(self):
+        resources = [{"id": 1, "project_id": "t1"},
+                     {"id": 2, "project_id": "t2"}]
+        cache = base.ListingCache()
+
+        self.assertEqual(
+            [resources[1]],
+            cache.list(("service", "resources", None), lambda: resources,
+                       tenant_uuid="t2", tenant_field="project_id"))
+
+    def test_invalidate(self):
+        list_resources = mock.Mock(return_value=[])
+        list_others = mock.Mock(return_value=[])
+        cache = base.ListingCache()
+
+        cache.list(("service", "resources", None), list_resources)
+        cache.list(("service", "resources", "t1"), list_resources)
+        cache.list(("service", "others", None), list_others)
+        cache.invalidate("service", "resources")
+        cache.list(("service", "resources", None), list_resources)
+        cache.list(("service", "others", None), list_others)
+
+        self.assertEqual(3, list_resources.call_count)
+        list_others.assert_called_once_with()
+
+
 class ResourceManagerTestCase(test.TestCase):
 
     def test__manager(self):
@@ -120,3 +165,44 @@ class ResourceManagerTestCase(test.TestCase):
         base.ResourceManager().list()
         mock_resource_manager__manager.assert_has_calls(
             [mock.call(), mock.call().list()])
+
+    @mock.patch("%s.ResourceManager.list" % BASE)
+    def test_list_undeleted_ids(self, mock_resource_manager_list):
+        mock_resource_manager_list.return_value = [
+            mock.MagicMock(id="a", status="ACTIVE"),
+            mock.MagicMock(id="b", status="deleted"),
+            mock.MagicMock(id="c", status="DELETING"),
+            mock.MagicMock(id="d", stack_status="DELETE_COMPLETE")]
+
+        manager = base.ResourceManager(tenant_uuid="tenant")
+        self.assertEqual({"a", "c"}, manager.list_undeleted_ids())
+        mock_resource_manager_list.assert_called_once_with()
+
+    @mock.patch("%s.ResourceManager.list" % BASE)
+    def test_list_pages(self, mock_resource_manager_list):
+        mock_resource_manager_list.side_effect = [Exception, [1, 2]]
+
+        self.assertEqual([[1, 2]], list(base.ResourceManager().list_pages()))
+        self.assertEqual(2, mock_resource_manager_list.call_count)
+
+    def test__paginate(self):
+        list_page = mock.Mock(side_effect=[[{"id": 1}, {"id": 2}],
+                                           Exception, [{"id": 3}], []])
+
+        pages = base.ResourceManager()._paginate(list_page, lambda r: r["id"],
+                                                 stable_markers=True)
+
+        self.assertEqual([[{"id": 1}, {"id": 2}], [{"id": 3}]], list(pages))
+        list_page.assert_has_calls([mock.call(None), mock.call(2),
+                                    mock.call(2), mock.call(3)])
+
+    def test__paginate_unstable_markers(self):
+        list_page = mock.Mock(side_effect=[[{"id": 1}, {"id": 2}],
+                                           [{"id": 3}], []])
+
+        pages = base.ResourceManager()._paginate(list_page, lambda r: r["id"])
+
+        self.assertEqual([{"id": 1}, {"id": 2}], next(pages))
+        # NOTE: the first page is yielded only when the listing is finished
+        self.assertEqual(3, list_page.call_count)
+        self.assertEqual([[{"id": 3}]], list(pages))
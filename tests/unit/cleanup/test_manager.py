@@ -13,8 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import threading
+
 import mock
 
+from rally.common import cfg
 from rally.common import utils
 from rally_openstack.cleanup import base
 from rally_openstack.cleanup import manager
@@ -22,6 +26,7 @@ from tests.unit import test
 
 
 BASE = "rally_openstack.cleanup.manager"
+CONF = cfg.CONF
 
 
 class SeekAndDestroyTestCase(test.TestCase):
@@ -48,7 +53,7 @@ class SeekAndDestroyTestCase(test.TestCase):
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource(self, mock_log):
         mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
-                                       _interval=0.01)
+                                       _interval=0.01, _batch_polling=False)
         mock_resource.delete.side_effect = [Exception, Exception, True]
         mock_resource.is_deleted.side_effect = [False, False, True]
 
@@ -67,7 +72,7 @@ class SeekAndDestroyTestCase(test.TestCase):
     def test__delete_single_resource_timeout(self, mock_log):
 
         mock_resource = mock.MagicMock(_max_attempts=1, _timeout=0.02,
-                                       _interval=0.025)
+                                       _interval=0.025, _batch_polling=False)
 
         mock_resource.delete.return_value = True
         mock_resource.is_deleted.side_effect = [False, False, True]
@@ -83,7 +88,7 @@ class SeekAndDestroyTestCase(test.TestCase):
     @mock.patch("%s.LOG" % BASE)
     def test__delete_single_resource_exception_in_is_deleted(self, mock_log):
         mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
-                                       _interval=0)
+                                       _interval=0, _batch_polling=False)
         mock_resource.delete.return_value = True
         mock_resource.is_deleted.side_effect = [Exception] * 4
         manager.SeekAndDestroy(None, None, None)._delete_single_resource(
@@ -95,9 +100,38 @@ class SeekAndDestroyTestCase(test.TestCase):
         self.assertEqual(1, mock_log.warning.call_count)
         self.assertEqual(4, mock_log.exception.call_count)
 
+    @mock.patch("%s.LOG" % BASE)
+    def test__delete_single_resource_batch_polling(self, mock_log):
+        undeleted = {0, 1, 2}
+        list_undeleted_ids = mock.Mock(side_effect=lambda: set(undeleted))
+        resources = []
+        for i in range(3):
+            mock_resource = mock.MagicMock(_max_attempts=3, _timeout=10,
+                                           _interval=0.01, _batch_polling=True,
+                                           tenant_uuid="tenant")
+            mock_resource.id.return_value = i
+            mock_resource.delete.side_effect = (
+                lambda i=i: undeleted.discard(i))
+            mock_resource.list_undeleted_ids = list_undeleted_ids
+            resources.append(mock_resource)
+
+        destroyer = manager.SeekAndDestroy(None, None, None)
+        for resource in resources:
+            destroyer._delete_single_resource(resource)
+
+        self.assertEqual(set(), undeleted)
+        for resource in resources:
+            resource.delete.assert_called_once_with()
+            self.assertFalse(resource.is_deleted.called)
+        self.assertTrue(list_undeleted_ids.called)
+        self.assertEqual(0, mock_log.warning.call_count)
+
     def _manager(self, list_side_effect, **kw):
         mock_mgr = mock.MagicMock()
         mock_mgr().list.side_effect = list_side_effect
+        mock_mgr().list_pages.side_effect = functools.partial(
+            base.ResourceManager.list_pages, mock_mgr())
+        mock_mgr().bulk_delete_limit.return_value = 0
         mock_mgr.reset_mock()
 
         for k, v in kw.items():
@@ -116,7 +150,8 @@ class SeekAndDestroyTestCase(test.TestCase):
         publish(queue)
         mock__get_cached_client.assert_called_once_with(admin)
         mock_mgr.assert_called_once_with(
-            admin=mock__get_cached_client.return_value)
+            admin=mock__get_cached_client.return_value,
+            listing_cache=mock.ANY)
         self.assertEqual(queue, [(admin, None, x) for x in range(1, 4)])
 
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
@@ -131,7 +166,8 @@ class SeekAndDestroyTestCase(test.TestCase):
         publish(queue)
         mock__get_cached_client.assert_called_once_with(admin)
         mock_mgr.assert_called_once_with(
-            admin=mock__get_cached_client.return_value)
+            admin=mock__get_cached_client.return_value,
+            listing_cache=mock.ANY)
         self.assertEqual(queue, [(admin, None, x) for x in range(1, 4)])
 
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
@@ -139,7 +175,8 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_mgr = self._manager([Exception, Exception, [1, 2, 3],
                                   Exception, Exception, [4, 5]],
                                  _perform_for_admin_only=False,
-                                 _tenant_resource=True)
+                                 _tenant_resource=True,
+                                 _admin_listing=False)
 
         admin = mock.MagicMock()
         users = [{"tenant_id": 1, "id": 1}, {"tenant_id": 2, "id": 2}]
@@ -151,12 +188,18 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_client = mock__get_cached_client.return_value
         mock_mgr.assert_has_calls([
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[0]["tenant_id"]),
+                      tenant_uuid=users[0]["tenant_id"],
+                      listing_cache=mock.ANY),
+            mock.call().bulk_delete_limit(),
+            mock.call().list_pages(),
             mock.call().list(),
             mock.call().list(),
             mock.call().list(),
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[1]["tenant_id"]),
+                      tenant_uuid=users[1]["tenant_id"],
+                      listing_cache=mock.ANY),
+            mock.call().bulk_delete_limit(),
+            mock.call().list_pages(),
             mock.call().list(),
             mock.call().list()
         ])
@@ -169,6 +212,72 @@ class SeekAndDestroyTestCase(test.TestCase):
         expected_queue += [(admin, users[1], x) for x in range(4, 6)]
         self.assertEqual(expected_queue, queue)
 
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_admin_listing(self, mock__get_cached_client):
+        mock_mgr = self._manager([], _perform_for_admin_only=False,
+                                 _tenant_resource=True, _admin_listing=True)
+        mock_mgr.return_value.list_all_tenants.side_effect = [
+            Exception,
+            [(1, "r1"), (2, "r2"), (3, "foreign"), (1, "r3")]]
+
+        admin = mock.MagicMock()
+        users = [{"tenant_id": 1, "id": 1}, {"tenant_id": 1, "id": 2},
+                 {"tenant_id": 2, "id": 3}]
+        publish = manager.SeekAndDestroy(mock_mgr, admin, users)._publisher
+
+        queue = []
+        publish(queue)
+
+        mock_mgr.assert_called_once_with(
+            admin=mock__get_cached_client.return_value,
+            listing_cache=mock.ANY)
+        self.assertFalse(mock_mgr.return_value.list.called)
+        self.assertEqual(
+            2, mock_mgr.return_value.list_all_tenants.call_count)
+        self.assertEqual([(admin, users[0], "r1"), (admin, users[2], "r2"),
+                          (admin, users[0], "r3")], queue)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_admin_listing_failed(self, mock__get_cached_client,
+                                             mock_log):
+        mock_mgr = self._manager([["r1", "r2"], ["r3"]],
+                                 _perform_for_admin_only=False,
+                                 _tenant_resource=True, _admin_listing=True)
+        mock_mgr.return_value.list_all_tenants.side_effect = Exception
+
+        admin = mock.MagicMock()
+        users = [{"tenant_id": 1, "id": 1}, {"tenant_id": 1, "id": 2},
+                 {"tenant_id": 2, "id": 3}]
+        publish = manager.SeekAndDestroy(mock_mgr, admin, users)._publisher
+
+        queue = []
+        publish(queue)
+
+        self.assertEqual(
+            3, mock_mgr.return_value.list_all_tenants.call_count)
+        self.assertEqual(1, mock_log.exception.call_count)
+        self.assertEqual([(admin, users[0], "r1"), (admin, users[0], "r2"),
+                          (admin, users[2], "r3")], queue)
+
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_admin_listing_disabled(self, mock__get_cached_client):
+        mock_mgr = self._manager([[1]], _perform_for_admin_only=False,
+                                 _tenant_resource=True, _admin_listing=True)
+        CONF.set_override("cleanup_admin_listing", False, "openstack")
+        self.addCleanup(CONF.clear_override, "cleanup_admin_listing",
+                        "openstack")
+
+        admin = mock.MagicMock()
+        users = [{"tenant_id": 1, "id": 1}]
+        publish = manager.SeekAndDestroy(mock_mgr, admin, users)._publisher
+
+        queue = []
+        publish(queue)
+
+        self.assertFalse(mock_mgr.return_value.list_all_tenants.called)
+        self.assertEqual([(admin, users[0], 1)], queue)
+
     @mock.patch("%s.LOG" % BASE)
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     def test__gen_publisher_tenant_resource(self, mock__get_cached_client,
@@ -191,11 +300,17 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_client = mock__get_cached_client.return_value
         mock_mgr.assert_has_calls([
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[0]["tenant_id"]),
+                      tenant_uuid=users[0]["tenant_id"],
+                      listing_cache=mock.ANY),
+            mock.call().bulk_delete_limit(),
+            mock.call().list_pages(),
             mock.call().list(),
             mock.call().list(),
             mock.call(admin=mock_client, user=mock_client,
-                      tenant_uuid=users[2]["tenant_id"]),
+                      tenant_uuid=users[2]["tenant_id"],
+                      listing_cache=mock.ANY),
+            mock.call().bulk_delete_limit(),
+            mock.call().list_pages(),
             mock.call().list(),
             mock.call().list(),
             mock.call().list()
@@ -234,7 +349,8 @@ class SeekAndDestroyTestCase(test.TestCase):
             resource="res",
             admin=mock__get_cached_client.return_value,
             user=mock__get_cached_client.return_value,
-            tenant_uuid=user1["tenant_id"])
+            tenant_uuid=user1["tenant_id"],
+            listing_cache=mock.ANY)
         mock__get_cached_client.assert_has_calls([
             mock.call(admin),
             mock.call(user1)
@@ -252,7 +368,8 @@ class SeekAndDestroyTestCase(test.TestCase):
             resource="res2",
             admin=mock__get_cached_client.return_value,
             user=mock__get_cached_client.return_value,
-            tenant_uuid=None)
+            tenant_uuid=None,
+            listing_cache=mock.ANY)
 
         mock__get_cached_client.assert_has_calls([
             mock.call(admin),
@@ -283,17 +400,149 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
-    @mock.patch("%s.broker.run" % BASE)
-    def test_exterminate(self, mock_broker_run):
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_bulk_deletion(self, mock__get_cached_client):
+        mock_mgr = self._manager([[1, 2, 3, 4, 5]],
+                                 _perform_for_admin_only=False)
+        mock_mgr.return_value.bulk_delete_limit.return_value = 2
+        admin = mock.MagicMock()
+        publish = manager.SeekAndDestroy(mock_mgr, admin, None)._publisher
+
+        queue = []
+        publish(queue)
+
+        self.assertEqual([(admin, None, [1, 2]), (admin, None, [3, 4]),
+                          (admin, None, [5])], queue)
+        for job in queue:
+            self.assertIsInstance(job[2], manager._BulkDeletion)
+
+    @mock.patch("rally.common.utils.name_matches_object")
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
+    def test__consumer_bulk_deletion(self, mock__delete_single_resource,
+                                     mock__get_cached_client,
+                                     mock_name_matches_object):
+        resources = {}
+        for name in ("r1", "r2", "r3", "foreign"):
+            resources[name] = mock.Mock()
+            resources[name].name.return_value = name
+        resources["r1"].delete_many.return_value = [resources["r3"]]
+
+        mock_mgr = mock.Mock(
+            side_effect=lambda resource, **kw: resources[resource],
+            _service="foo", _resource="bar")
+        mock_name_matches_object.side_effect = lambda name, *a, **kw: (
+            name != "foreign")
+
+        consumer = manager.SeekAndDestroy(mock_mgr, None, None)._consumer
+        consumer(None, (None, None, manager._BulkDeletion(
+            ["r1", "foreign", "r2", "r3"])))
+
+        resources["r1"].delete_many.assert_called_once_with(
+            [resources["r1"], resources["r2"], resources["r3"]])
+        mock__delete_single_resource.assert_called_once_with(
+            resources["r3"])
+
+        # fallback to deletion one by one
+        mock__delete_single_resource.reset_mock()
+        resources["r1"].delete_many.side_effect = Exception
+
+        consumer(None, (None, None, manager._BulkDeletion(["r1", "r2"])))
+
+        self.assertEqual(
+            [mock.call(resources["r1"]), mock.call(resources["r2"])],
+            mock__delete_single_resource.call_args_list)
+
+    @mock.patch("%s._run_streaming" % BASE)
+    def test_exterminate(self, mock__run_streaming):
         manager_cls = mock.MagicMock(_threads=5)
         cleaner = manager.SeekAndDestroy(manager_cls, None, None)
         cleaner._publisher = mock.Mock()
         cleaner._consumer = mock.Mock()
         cleaner.exterminate()
 
-        mock_broker_run.assert_called_once_with(cleaner._publisher,
-                                                cleaner._consumer,
-                                                consumers_count=5)
+        mock__run_streaming.assert_called_once_with(cleaner._publisher,
+                                                    cleaner._consumer,
+                                                    consumers_count=5)
+
+
+class RunStreamingTestCase(test.TestCase):
+
+    def test__run_streaming(self):
+        consumed = []
+        first_job_consumed = threading.Event()
+
+        def publish(queue):
+            queue.append(1)
+            # the next job is published only after the first one is
+            # consumed, i.e. consumers do not wait for the publisher
+            self.assertTrue(first_job_consumed.wait(10))
+            queue.append(2)
+            queue.append(3)
+
+        def consume(cache, job):
+            consumed.append(job)
+            first_job_consumed.set()
+            if job == 2:
+                raise Exception("Failed")
+
+        manager._run_streaming(publish, consume, consumers_count=3)
+
+        self.assertEqual([1, 2, 3], sorted(consumed))
+
+    @mock.patch("%s.LOG" % BASE)
+    def test__run_streaming_with_failed_publisher(self, mock_log):
+        consume = mock.Mock()
+
+        def publish(queue):
+            queue.append(1)
+            raise Exception("Failed")
+
+        manager._run_streaming(publish, consume, consumers_count=2)
+
+        consume.assert_called_once_with({}, 1)
+        self.assertEqual(1, mock_log.warning.call_count)
+
+
+class DeletionTrackerTestCase(test.TestCase):
+
+    def _get_resource(self, id, tenant_uuid="tenant", interval=60):
+        resource = mock.MagicMock(tenant_uuid=tenant_uuid, _interval=interval)
+        resource.id.return_value = id
+        return resource
+
+    def test_is_deleted(self):
+        tracker = manager._DeletionTracker()
+        res1 = self._get_resource("id1")
+        res1.list_undeleted_ids.return_value = {"id1"}
+        res2 = self._get_resource("id2")
+
+        self.assertFalse(tracker.is_deleted(res1))
+        self.assertTrue(tracker.is_deleted(res2))
+        # the listing is shared within polling interval
+        res1.list_undeleted_ids.assert_called_once_with()
+        self.assertFalse(res2.list_undeleted_ids.called)
+
+    def test_is_deleted_per_tenant(self):
+        tracker = manager._DeletionTracker()
+        res1 = self._get_resource("id1", tenant_uuid="t1")
+        res1.list_undeleted_ids.return_value = {"id1"}
+        res2 = self._get_resource("id2", tenant_uuid="t2")
+        res2.list_undeleted_ids.return_value = {"id2"}
+
+        self.assertFalse(tracker.is_deleted(res1))
+        self.assertFalse(tracker.is_deleted(res2))
+        res1.list_undeleted_ids.assert_called_once_with()
+        res2.list_undeleted_ids.assert_called_once_with()
+
+    def test_is_deleted_relists_after_interval(self):
+        tracker = manager._DeletionTracker()
+        res = self._get_resource("id1", interval=0)
+        res.list_undeleted_ids.side_effect = [{"id1"}, set()]
+
+        self.assertFalse(tracker.is_deleted(res))
+        self.assertTrue(tracker.is_deleted(res))
+        self.assertEqual(2, res.list_undeleted_ids.call_count)
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -361,10 +610,62 @@ class ResourceManagerTestCase(test.TestCase):
                          manager.find_resource_managers(names=["fake"],
                                                         admin_required=False))
 
+    def test__split_resource_managers(self):
+        managers = [
+            self._get_res_mock(_service="heat", _resource="stacks"),
+            self._get_res_mock(_service="nova", _resource="servers"),
+            self._get_res_mock(_service="swift", _resource="object"),
+            self._get_res_mock(_service="neutron", _resource="port"),
+            self._get_res_mock(_service="swift", _resource="container"),
+            self._get_res_mock(_service="mistral", _resource="workbooks"),
+            self._get_res_mock(_service="keystone", _resource="user"),
+            self._get_res_mock(_service="keystone", _resource="project")
+        ]
+
+        self.assertEqual(
+            [[[managers[0], managers[1], managers[3]],
+              [managers[2], managers[4]],
+              [managers[5]]],
+             [[managers[6], managers[7]]]],
+            manager._split_resource_managers(managers))
+        self.assertEqual(
+            [[[managers[2], managers[4]]]],
+            manager._split_resource_managers([managers[2], managers[4]]))
+        self.assertEqual([], manager._split_resource_managers([]))
+
+    @mock.patch("%s.broker.run" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_groups_in_parallel(self, mock_find_resource_managers,
+                                        mock_broker_run):
+        managers = [
+            self._get_res_mock(_service="nova", _resource="servers"),
+            self._get_res_mock(_service="swift", _resource="object"),
+            self._get_res_mock(_service="mistral", _resource="workbooks"),
+            self._get_res_mock(_service="keystone", _resource="user")
+        ]
+        mock_find_resource_managers.return_value = managers
+        stages = []
+
+        def broker_run(publish, consume, consumers_count):
+            queue = []
+            publish(queue)
+            stages.append((queue, consumers_count))
+
+        mock_broker_run.side_effect = broker_run
+
+        manager.cleanup(names=["nova", "swift", "mistral", "keystone"],
+                        admin="admin", users=["user"])
+
+        self.assertEqual(
+            [([[managers[0]], [managers[1]], [managers[2]]], 3),
+             ([[managers[3]]], 1)],
+            stages)
+
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_service="nova"),
+                              mock.MagicMock(_service="nova")])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy,
                      mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
@@ -385,18 +686,21 @@ class ResourceManagerTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      listing_cache=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      listing_cache=mock.ANY),
             mock.call().exterminate()
         ])
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_service="nova"),
+                              mock.MagicMock(_service="nova")])
     def test_cleanup_with_api_versions(self,
                                        mock_find_resource_managers,
                                        mock_seek_and_destroy,
@@ -421,10 +725,12 @@ class ResourceManagerTestCase(test.TestCase):
         mock_seek_and_destroy.assert_has_calls([
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      listing_cache=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
+                      resource_classes=[A], task_id="task_id",
+                      listing_cache=mock.ANY),
             mock.call().exterminate()
         ])
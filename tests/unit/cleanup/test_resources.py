@@ -22,6 +22,7 @@ from neutronclient.common import exceptions as neutron_exceptions
 from novaclient import exceptions as nova_exc
 from watcherclient.common.apiclient import exceptions as watcher_exceptions
 
+from rally_openstack.cleanup import base
 from rally_openstack.cleanup import resources
 from tests.unit import test
 
@@ -85,6 +86,31 @@ class NovaServerTestCase(test.TestCase):
 
         server._manager.return_value.list.assert_called_once_with(limit=-1)
 
+    def test_list_pages(self):
+        server = resources.NovaServer()
+        server._manager = mock.MagicMock()
+        servers = [mock.Mock(id="s1"), mock.Mock(id="s2"), mock.Mock(id="s3")]
+        server._manager.return_value.list.side_effect = [
+            servers[:2], servers[2:], []]
+
+        self.assertEqual([servers[:2], servers[2:]],
+                         list(server.list_pages()))
+        server._manager.return_value.list.assert_has_calls([
+            mock.call(marker=None, limit=1000),
+            mock.call(marker="s2", limit=1000),
+            mock.call(marker="s3", limit=1000)])
+
+    def test_list_all_tenants(self):
+        admin = mock.MagicMock()
+        servers = [mock.Mock(tenant_id="t1"), mock.Mock(tenant_id="t2")]
+        admin.nova.return_value.servers.list.return_value = servers
+        server = resources.NovaServer(admin=admin)
+
+        self.assertEqual([("t1", servers[0]), ("t2", servers[1])],
+                         server.list_all_tenants())
+        admin.nova.return_value.servers.list.assert_called_once_with(
+            search_opts={"all_tenants": True}, limit=-1)
+
     def test_delete(self):
         server = resources.NovaServer()
         server.raw_resource = mock.Mock()
@@ -244,8 +270,12 @@ class NeutronMixinTestCase(test.TestCase):
         neut._resource = "some_resource"
         neut.raw_resource = {"id": "42"}
 
+        neut._listing_cache = mock.Mock()
+
         neut.delete()
         neut.user.neutron().delete_some_resource.assert_called_once_with("42")
+        neut._listing_cache.invalidate.assert_called_once_with(
+            "neutron", "some_resources")
 
     def test_list(self):
         neut = self.get_neutron_mixin()
@@ -263,6 +293,35 @@ class NeutronMixinTestCase(test.TestCase):
         neut.user.neutron().list_some_resources.assert_called_once_with(
             tenant_id=neut.tenant_uuid)
 
+    def test_list_by_admin(self):
+        neut = self.get_neutron_mixin()
+        neut.admin = mock.MagicMock()
+        neut._resource = "some_resource"
+        neut.tenant_uuid = "user_tenant"
+
+        some_resources = [{"tenant_id": neut.tenant_uuid}, {"tenant_id": "a"}]
+        neut.admin.neutron().list_some_resources.return_value = {
+            "some_resources": some_resources
+        }
+
+        self.assertEqual([some_resources[0]], list(neut.list()))
+        neut.tenant_uuid = "a"
+        self.assertEqual([some_resources[1]], list(neut.list()))
+
+        neut.admin.neutron().list_some_resources.assert_called_once_with()
+
+    def test_list_undeleted_ids(self):
+        neut = self.get_neutron_mixin()
+        neut.user = mock.MagicMock()
+        neut._resource = "some_resource"
+        neut.tenant_uuid = "user_tenant"
+        neut.user.neutron().list_some_resources.side_effect = [
+            {"some_resources": [{"id": "a", "tenant_id": "user_tenant"}]},
+            {"some_resources": []}]
+
+        self.assertEqual({"a"}, neut.list_undeleted_ids())
+        self.assertEqual(set(), neut.list_undeleted_ids())
+
 
 class NeutronLbaasV1MixinTestCase(test.TestCase):
 
@@ -571,8 +630,33 @@ class NeutronPortTestCase(test.TestCase):
         user = mock.Mock(neutron=neutron)
         self.assertEqual(expected_ports, resources.NeutronPort(
             user=user, tenant_uuid=tenant_uuid).list())
-        neutron.list_ports.assert_called_once_with()
-        neutron.list_routers.assert_called_once_with()
+        neutron.list_ports.assert_called_once_with(tenant_id=tenant_uuid)
+        neutron.list_routers.assert_called_once_with(tenant_id=tenant_uuid)
+
+    def test_list_by_admin_with_shared_cache(self):
+        ports = [{"tenant_id": "t1", "id": "id1", "name": "foo",
+                  "device_owner": "compute:nova"},
+                 {"tenant_id": "t2", "id": "id2", "name": "bar",
+                  "device_owner": "compute:nova"}]
+        admin = mock.MagicMock()
+        admin.neutron().list_ports.return_value = {"ports": ports}
+        admin.neutron.reset_mock()
+        listing_cache = base.ListingCache()
+
+        self.assertEqual([ports[0]], resources.NeutronPort(
+            admin=admin, tenant_uuid="t1",
+            listing_cache=listing_cache).list())
+        self.assertEqual([ports[1]], resources.NeutronPort(
+            admin=admin, tenant_uuid="t2",
+            listing_cache=listing_cache).list())
+        admin.neutron().list_ports.assert_called_once_with()
+
+        resources.NeutronPort(resource=ports[0], admin=admin,
+                              user=mock.MagicMock(),
+                              listing_cache=listing_cache).delete()
+        resources.NeutronPort(admin=admin, tenant_uuid="t2",
+                              listing_cache=listing_cache).list()
+        self.assertEqual(2, admin.neutron().list_ports.call_count)
 
 
 @ddt.ddt
@@ -675,6 +759,22 @@ class GlanceImageTestCase(test.TestCase):
             mock.call(owner=glance.tenant_uuid),
             mock.call(status="deactivated", owner=glance.tenant_uuid)])
 
+    @mock.patch("rally_openstack.services.image.image.Image")
+    def test_list_all_tenants(self, mock_image):
+        admin = mock.Mock()
+        images = [mock.Mock(owner="t1"), mock.Mock(owner="t2"),
+                  mock.Mock(owner="t1")]
+        list_images = mock_image.return_value.list_images
+        list_images.side_effect = (images[:2], images[2:])
+        glance = resources.GlanceImage(admin=admin)
+
+        self.assertEqual(
+            [("t1", images[0]), ("t2", images[1]), ("t1", images[2])],
+            glance.list_all_tenants())
+        mock_image.assert_called_once_with(admin)
+        list_images.assert_has_calls([
+            mock.call(), mock.call(status="deactivated")])
+
     def test_delete(self):
         glance = resources.GlanceImage()
         glance._client = mock.Mock()
@@ -863,13 +963,58 @@ class SwiftObjectTestCase(test.TestCase):
         objects = [mock.MagicMock(), mock.MagicMock(), mock.MagicMock()]
         mock_swift_mixin__manager().get_account.return_value = (
             "header", containers)
-        mock_swift_mixin__manager().get_container.return_value = (
-            "header", objects)
+        mock_swift_mixin__manager().get_container.side_effect = [
+            ("header", objects), ("header", []),
+            ("header", objects), ("header", [])]
         self.assertEqual(len(containers),
                          len(resources.SwiftContainer().list()))
         self.assertEqual(len(containers) * len(objects),
                          len(resources.SwiftObject().list()))
 
+    @mock.patch("%s.SwiftMixin._manager" % BASE)
+    def test_list_pages(self, mock_swift_mixin__manager):
+        containers = [{"name": "c1"}, {"name": "c2"}]
+        mock_swift_mixin__manager().get_account.return_value = (
+            "header", containers)
+        mock_swift_mixin__manager().get_container.side_effect = [
+            ("header", [{"name": "o1"}, {"name": "o2"}]),
+            Exception("Failed"),
+            ("header", [{"name": "o3"}]),
+            ("header", []),
+            ("header", [])]
+
+        self.assertEqual(
+            [[["c1", "o1"], ["c1", "o2"]], [["c1", "o3"]]],
+            list(resources.SwiftObject().list_pages()))
+        mock_swift_mixin__manager().get_container.assert_has_calls([
+            mock.call("c1", marker=None),
+            mock.call("c1", marker="o2"),
+            mock.call("c1", marker="o2"),
+            mock.call("c1", marker="o3"),
+            mock.call("c2", marker=None)])
+
+    @mock.patch("%s.swift.get_bulk_delete_limit" % BASE)
+    @mock.patch("%s.SwiftMixin._manager" % BASE)
+    def test_bulk_delete_limit(self, mock_swift_mixin__manager,
+                               mock_get_bulk_delete_limit):
+        self.assertEqual(mock_get_bulk_delete_limit.return_value,
+                         resources.SwiftObject().bulk_delete_limit())
+        mock_get_bulk_delete_limit.assert_called_once_with(
+            mock_swift_mixin__manager.return_value)
+
+    @mock.patch("%s.swift.bulk_delete" % BASE)
+    @mock.patch("%s.SwiftMixin._manager" % BASE)
+    def test_delete_many(self, mock_swift_mixin__manager, mock_bulk_delete):
+        objects = [resources.SwiftObject(resource=["c1", "o%s" % i])
+                   for i in range(3)]
+        mock_bulk_delete.return_value = {("c1", "o1")}
+
+        self.assertEqual([objects[1]],
+                         resources.SwiftObject().delete_many(objects))
+        mock_bulk_delete.assert_called_once_with(
+            mock_swift_mixin__manager.return_value,
+            [("c1", "o0"), ("c1", "o1"), ("c1", "o2")])
+
 
 class SwiftContainerTestCase(test.TestCase):
 
@@ -1101,6 +1246,22 @@ class WatcherActionPlanTestCase(test.TestCase):
         watcher._manager().list.assert_called_once_with(limit=0)
 
 
+class CinderVolumeTestCase(test.TestCase):
+
+    def test_list_all_tenants(self):
+        admin = mock.MagicMock()
+        volumes = [mock.Mock(), mock.Mock()]
+        setattr(volumes[0], "os-vol-tenant-attr:tenant_id", "t1")
+        setattr(volumes[1], "os-vol-tenant-attr:tenant_id", "t2")
+        admin.cinder.return_value.volumes.list.return_value = volumes
+        volume = resources.CinderVolume(admin=admin)
+
+        self.assertEqual([("t1", volumes[0]), ("t2", volumes[1])],
+                         volume.list_all_tenants())
+        admin.cinder.return_value.volumes.list.assert_called_once_with(
+            search_opts={"all_tenants": True})
+
+
 class CinderImageVolumeCacheTestCase(test.TestCase):
 
     class Resource(object):
@@ -46,7 +46,8 @@ class AdminCleanupTestCase(test.TestCase):
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[mock.MagicMock(_service="nova"),
+                              mock.MagicMock(_service="nova")])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers,
                      mock_itersubclasses):
@@ -74,13 +75,13 @@ class AdminCleanupTestCase(test.TestCase):
                       ctx["users"],
                       api_versions=None,
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
+                      task_id="task_id", listing_cache=mock.ANY),
             mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       ctx["admin"],
                       ctx["users"],
                       api_versions=None,
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
+                      task_id="task_id", listing_cache=mock.ANY),
             mock.call().exterminate()
         ])
@@ -18,6 +18,7 @@ import copy
 import ddt
 import mock
 
+from rally import exceptions
 from rally_openstack.contexts.glance import images
 from tests.unit import test
 
@@ -51,6 +52,10 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
             "rally_openstack.services.image.image.Image")
         self.addCleanup(patch.stop)
         self.mock_image = patch.start()
+        patch = mock.patch("%s.image_cache.get_image_location" % CTX,
+                           side_effect=lambda location: location)
+        self.addCleanup(patch.stop)
+        self.mock_get_image_location = patch.start()
 
     def _gen_tenants(self, count):
         tenants = {}
@@ -93,6 +98,7 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
                     "container_format": container_format,
                     "images_per_tenant": images_per_tenant,
                     "visibility": visibility,
+                    "resource_management_workers": 2,
                 }
             },
             "admin": {
@@ -132,6 +138,111 @@ class ImageGeneratorTestCase(test.ScenarioTestCase):
             tenants * images_per_tenant)
 
         mock_clients.assert_has_calls([mock.call(mock.ANY)] * tenants)
+        self.mock_get_image_location.assert_called_once_with(image_url)
+
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test_setup_failure(self, mock_clients):
+        self.mock_image.return_value.create_image.side_effect = [
+            mock.Mock(id="image1"), Exception("Failed"), mock.Mock(id="3")]
+        self.context.update({
+            "config": {
+                "images": {
+                    "image_url": "/tmp/image.qcow2",
+                    "disk_format": "qcow2",
+                    "container_format": "bare",
+                    "images_per_tenant": 3,
+                    "resource_management_workers": 1
+                }
+            },
+            "users": [{"id": "u1", "tenant_id": "t1",
+                       "credential": mock.MagicMock()}],
+            "tenants": {"t1": {}}
+        })
+        images_ctx = images.ImageGenerator(self.context)
+
+        self.assertRaises(exceptions.ContextSetupFailure, images_ctx.setup)
+        self.assertEqual(["image1", "3"],
+                         self.context["tenants"]["t1"]["images"])
+
+    @ddt.data({"visibility": "private", "shared": True},
+              {"visibility": "community", "shared": False})
+    @ddt.unpack
+    @mock.patch("%s.glance_v2.GlanceV2Service" % CTX)
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test_setup_shared(self, mock_clients, mock_glance_v2_service,
+                          visibility, shared):
+        image_service = self.mock_image.return_value
+        image_service.create_image.side_effect = [mock.Mock(id="image1"),
+                                                  mock.Mock(id="image2")]
+        self.context.update({
+            "config": {
+                "images": {
+                    "image_url": "/tmp/image.qcow2",
+                    "disk_format": "qcow2",
+                    "container_format": "bare",
+                    "visibility": visibility,
+                    "images_per_tenant": 2,
+                    "share_images": True,
+                    "resource_management_workers": 1
+                }
+            },
+            "users": [{"id": "u%s" % i, "tenant_id": "t%s" % i,
+                       "credential": mock.MagicMock()} for i in range(3)],
+            "tenants": {"t0": {}, "t1": {}, "t2": {}}
+        })
+        images_ctx = images.ImageGenerator(self.context)
+
+        images_ctx.setup()
+
+        for tenant in self.context["tenants"].values():
+            self.assertEqual(["image1", "image2"], sorted(tenant["images"]))
+        self.assertEqual(2, image_service.create_image.call_count)
+        image_service.create_image.assert_called_with(
+            image_name=None,
+            container_format="bare",
+            image_location="/tmp/image.qcow2",
+            disk_format="qcow2",
+            visibility="shared" if shared else visibility,
+            min_disk=0,
+            min_ram=0)
+        glance = mock_glance_v2_service.return_value
+        if shared:
+            glance.add_member.assert_has_calls(
+                [mock.call(image_id, member_id=tenant_id)
+                 for image_id in ("image1", "image2")
+                 for tenant_id in ("t1", "t2")], any_order=True)
+            self.assertEqual(4, glance.add_member.call_count)
+            self.assertEqual(4, glance.update_member_status.call_count)
+        else:
+            self.assertFalse(glance.add_member.called)
+
+    @mock.patch("%s.glance_v2.GlanceV2Service" % CTX)
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test_setup_shared_failure(self, mock_clients,
+                                  mock_glance_v2_service):
+        self.mock_image.return_value.create_image.return_value = mock.Mock(
+            id="image1")
+        mock_glance_v2_service.return_value.add_member.side_effect = [
+            None, Exception("Failed")]
+        self.context.update({
+            "config": {
+                "images": {
+                    "image_url": "/tmp/image.qcow2",
+                    "disk_format": "qcow2",
+                    "container_format": "bare",
+                    "share_images": True,
+                    "resource_management_workers": 1
+                }
+            },
+            "users": [{"id": "u%s" % i, "tenant_id": "t%s" % i,
+                       "credential": mock.MagicMock()} for i in range(3)],
+            "tenants": {"t0": {}, "t1": {}, "t2": {}}
+        })
+        images_ctx = images.ImageGenerator(self.context)
+
+        self.assertRaises(exceptions.ContextSetupFailure, images_ctx.setup)
+        self.assertEqual(["image1"], self.context["tenants"]["t1"]["images"])
+        self.assertNotIn("images", self.context["tenants"]["t2"])
 
     @mock.patch("%s.image.Image" % CTX)
     @mock.patch("%s.LOG" % CTX)
@@ -15,6 +15,7 @@
 
 import mock
 
+from rally.common import cfg
 from rally import exceptions
 from rally_openstack.contexts.keystone import users
 from rally_openstack import credential as oscredential
@@ -98,6 +99,15 @@ class UserGeneratorBaseTestCase(test.ScenarioTestCase):
         self.assertEqual([foo_user], user_generator.existing_users)
         self.assertEqual({"user_choice_method": "foo"}, user_generator.config)
 
+    def test___init__with_keystone_versions(self):
+        versions = {"https://example.com": "3"}
+        self.platforms["openstack"]["keystone_versions"] = versions
+
+        users.UserGenerator(self.context)
+
+        (self.osclients.update_discovered_keystone_versions
+         .assert_called_once_with(versions))
+
     def test_setup(self):
         user_generator = users.UserGenerator(self.context)
         user_generator.use_existing_users = mock.Mock()
@@ -122,6 +132,45 @@ class UserGeneratorBaseTestCase(test.ScenarioTestCase):
         user_generator.use_existing_users.assert_called_once_with()
         self.assertFalse(user_generator.create_users.called)
 
+    def test_setup_token_pool(self):
+        user_generator = users.UserGenerator(self.context)
+        user_generator.create_users = mock.Mock()
+        user_generator._authenticate_users = mock.Mock()
+        user_generator.existing_users = []
+
+        user_generator.setup()
+
+        self.assertFalse(user_generator._authenticate_users.called)
+        self.assertEqual({}, self.context["users_tokens"])
+
+        cfg.CONF.set_override("users_context_token_pool", True, "openstack")
+        self.addCleanup(cfg.CONF.clear_override, "users_context_token_pool",
+                        "openstack")
+
+        user_generator.setup()
+
+        user_generator._authenticate_users.assert_called_once_with()
+
+    def test__authenticate_users(self):
+        self.context["config"]["users"] = {
+            "tenants": 1, "users_per_tenant": 2,
+            "resource_management_workers": 1}
+        user_generator = users.UserGenerator(self.context)
+        self.context["users"] = [{"id": "u1", "credential": "c1"},
+                                 {"id": "u2", "credential": "c2"}]
+        self.context["users_tokens"] = {}
+        keystone = self.osclients.Clients.return_value.keystone
+        keystone.dump_token.side_effect = [{"auth_token": "t1"},
+                                           Exception("Unauthorized")]
+
+        user_generator._authenticate_users()
+
+        self.assertEqual({"u1": {"auth_token": "t1"}},
+                         self.context["users_tokens"])
+        self.osclients.Clients.assert_has_calls([mock.call("c1"),
+                                                 mock.call("c2")],
+                                                any_order=True)
+
     def test_cleanup(self):
         user_generator = users.UserGenerator(self.context)
         user_generator._remove_default_security_group = mock.Mock()
@@ -205,6 +254,9 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
         mock_clients.return_value.keystone.auth_ref = auth_ref
 
         self.platforms["openstack"]["users"] = user_list
+        cfg.CONF.set_override("users_context_token_pool", True, "openstack")
+        self.addCleanup(cfg.CONF.clear_override, "users_context_token_pool",
+                        "openstack")
 
         user_generator = users.UserGenerator(self.context)
         user_generator.setup()
@@ -224,6 +276,15 @@ class UserGeneratorForExistingUsersTestCase(test.ScenarioTestCase):
         self.assertEqual({"p0": {"id": "p0", "name": creds.tenant_name},
                           "p1": {"id": "p1", "name": creds.tenant_name}},
                          self.context["tenants"])
+        dump_token = mock_clients.return_value.keystone.dump_token
+        self.assertEqual({"u1": dump_token.return_value,
+                          "u2": dump_token.return_value,
+                          "u3": dump_token.return_value},
+                         self.context["users_tokens"])
+        self.assertEqual(
+            (("p0", (self.context["users"][1],)),
+             ("p1", (self.context["users"][0], self.context["users"][2]))),
+            self.context["users_round_robin"])
 
 
 class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
@@ -291,8 +291,9 @@ class ShareNetworksTestCase(test.TestCase):
         ]
         mock_manila_scenario__create_share_network.assert_has_calls(
             expected_calls * (self.TENANTS_AMOUNT * networks_per_tenant))
-        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL)
-                                      for i in range(self.TENANTS_AMOUNT)])
+        mock_clients.assert_has_calls(
+            [mock.call(MOCK_USER_CREDENTIAL, token=None)
+             for i in range(self.TENANTS_AMOUNT)])
 
     @ddt.data(True, False)
     @mock.patch("rally_openstack.osclients.Clients")
@@ -329,8 +330,9 @@ class ShareNetworksTestCase(test.TestCase):
         expected_calls = [mock.call(**sn_args), mock.call().to_dict()]
         mock_manila_scenario__create_share_network.assert_has_calls(
             expected_calls * (self.TENANTS_AMOUNT * networks_per_tenant))
-        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL)
-                                      for i in range(self.TENANTS_AMOUNT)])
+        mock_clients.assert_has_calls(
+            [mock.call(MOCK_USER_CREDENTIAL, token=None)
+             for i in range(self.TENANTS_AMOUNT)])
 
     @mock.patch("rally_openstack.osclients.Clients")
     @mock.patch(MANILA_UTILS_PATH + "_create_share_network")
@@ -354,8 +356,9 @@ class ShareNetworksTestCase(test.TestCase):
         expected_calls = [mock.call(), mock.call().to_dict()]
         mock_manila_scenario__create_share_network.assert_has_calls(
             expected_calls * self.TENANTS_AMOUNT)
-        mock_clients.assert_has_calls([mock.call(MOCK_USER_CREDENTIAL)
-                                      for i in range(self.TENANTS_AMOUNT)])
+        mock_clients.assert_has_calls(
+            [mock.call(MOCK_USER_CREDENTIAL, token=None)
+             for i in range(self.TENANTS_AMOUNT)])
 
     @mock.patch("rally_openstack.osclients.Clients")
     @mock.patch(MANILA_UTILS_PATH + "_delete_share_network")
@@ -378,7 +381,7 @@ class ShareNetworksTestCase(test.TestCase):
         self.assertFalse(mock_manila_scenario__delete_share_network.called)
         self.assertEqual(2, mock_clients.call_count)
         for user in self.ctxt_use_existing["users"]:
-            self.assertIn(mock.call(user["credential"]),
+            self.assertIn(mock.call(user["credential"], token=None),
                           mock_clients.mock_calls)
 
     @mock.patch("rally_openstack.contexts.manila.manila_share_networks."
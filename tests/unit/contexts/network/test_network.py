@@ -17,6 +17,7 @@ import ddt
 import mock
 import netaddr
 
+from rally import exceptions
 from rally_openstack.contexts.network import networks as network_context
 from tests.unit import test
 
@@ -103,6 +104,23 @@ class NetworkTestCase(test.TestCase):
         self.assertSequenceEqual(sorted(expected_networks),
                                  sorted(actual_networks))
 
+    @mock.patch(NET + "wrap")
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test_setup_failure(self, mock_clients, mock_wrap):
+        mock_wrap.return_value.create_network.side_effect = [
+            "foo_net", Exception("Failed")]
+        net_context = network_context.Network(
+            self.get_context(resource_management_workers=1))
+
+        self.assertRaises(exceptions.ContextSetupFailure, net_context.setup)
+        self.assertEqual(
+            ["foo_net"],
+            [net for tenant in net_context.context["tenants"].values()
+             for net in tenant["networks"]])
+        mock_wrap.assert_called_once_with(mock_clients.return_value,
+                                          net_context,
+                                          config=net_context.config)
+
     @mock.patch("rally_openstack.osclients.Clients")
     @mock.patch(NET + "wrap")
     def test_cleanup(self, mock_wrap, mock_clients):
@@ -16,6 +16,7 @@
 import copy
 import mock
 
+from rally import exceptions
 from rally_openstack.contexts.network import routers as router_context
 from rally_openstack.scenarios.neutron import utils as neutron_utils
 
@@ -67,6 +68,7 @@ class RouterTestCase(test.ScenarioTestCase):
                 },
                 "router": {
                     "routers_per_tenant": routers_per_tenant,
+                    "resource_management_workers": 2,
                 }
             },
             "admin": {
@@ -86,6 +88,22 @@ class RouterTestCase(test.ScenarioTestCase):
         routers_ctx.setup()
         self.assertEqual(new_context, self.context)
 
+    @mock.patch("%s.neutron.utils.NeutronScenario._create_router" % SCN,
+                side_effect=[{"id": "uuid"}, Exception("Failed")])
+    def test_setup_failure(self, mock_neutron_scenario__create_router):
+        self.context.update({
+            "config": {"router": {"routers_per_tenant": 2,
+                                  "resource_management_workers": 1}},
+            "users": [{"id": "u1", "tenant_id": "t1",
+                       "credential": mock.MagicMock()}],
+            "tenants": {"t1": {}}
+        })
+        routers_ctx = router_context.Router(self.context)
+
+        self.assertRaises(exceptions.ContextSetupFailure, routers_ctx.setup)
+        self.assertEqual([{"id": "uuid"}],
+                         self.context["tenants"]["t1"]["routers"])
+
     @mock.patch("%s.resource_manager.cleanup" % CTX)
     def test_cleanup(self, mock_cleanup):
         self.context.update({"users": mock.MagicMock()})
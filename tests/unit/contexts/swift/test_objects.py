@@ -82,7 +82,7 @@ class SwiftObjectGeneratorTestCase(test.TestCase):
                         {"user": {"id": "u1", "tenant_id": "t1",
                                   "credential": "c1"},
                          "container": "c1",
-                         "objects": ["o1", "o2", "o3"]}
+                         "objects": {"o1", "o2", "o3"}}
                     ]
                 },
                 "t2": {
@@ -91,12 +91,14 @@ class SwiftObjectGeneratorTestCase(test.TestCase):
                         {"user": {"id": "u2", "tenant_id": "t2",
                                   "credential": "c2"},
                          "container": "c2",
-                         "objects": ["o4", "o5", "o6"]}
+                         "objects": {"o4", "o5", "o6"}}
                     ]
                 }
             }
         })
 
+        mock_swift_scenario.return_value.clients.return_value = (
+            mock.Mock(get_capabilities=mock.Mock(return_value={})))
         objects_ctx = objects.SwiftObjectGenerator(context)
         objects_ctx.cleanup()
 
@@ -189,7 +191,7 @@ class SwiftObjectGeneratorTestCase(test.TestCase):
                         {"user": {"id": "u1", "tenant_id": "t1",
                                   "credential": mock.MagicMock()},
                          "container": "coooon",
-                         "objects": []}] * 3
+                         "objects": set()}] * 3
                 }
             }
         })
@@ -210,12 +212,13 @@ class SwiftObjectGeneratorTestCase(test.TestCase):
                         {"user": {"id": "u1", "tenant_id": "t1",
                                   "credential": mock.MagicMock()},
                          "container": "c1",
-                         "objects": ["oooo"] * 3}
+                         "objects": {"o1", "o2", "o3"}}
                     ]
                 }
             }
         })
         mock_swift = mock_clients.return_value.swift.return_value
+        mock_swift.get_capabilities.return_value = {}
         mock_swift.delete_object.side_effect = [True, Exception, True]
         objects_ctx = objects.SwiftObjectGenerator(context)
         objects_ctx._delete_containers = mock.MagicMock()
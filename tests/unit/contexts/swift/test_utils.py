@@ -71,7 +71,7 @@ class SwiftObjectMixinTestCase(test.TestCase):
                             "id": "u1", "tenant_id": "1001",
                             "credential": mock.MagicMock()},
                          "container": "c1",
-                         "objects": []}
+                         "objects": set()}
                     ]
                 },
                 "1002": {
@@ -81,7 +81,7 @@ class SwiftObjectMixinTestCase(test.TestCase):
                             "id": "u2", "tenant_id": "1002",
                             "credential": mock.MagicMock()},
                          "container": "c2",
-                         "objects": []}
+                         "objects": set()}
                     ]
                 }
             }
@@ -117,7 +117,7 @@ class SwiftObjectMixinTestCase(test.TestCase):
                             "id": "u1", "tenant_id": "1001",
                             "credential": mock.MagicMock()},
                          "container": "c1",
-                         "objects": []}
+                         "objects": set()}
                     ]
                 },
                 "1002": {
@@ -127,7 +127,7 @@ class SwiftObjectMixinTestCase(test.TestCase):
                             "id": "u2", "tenant_id": "1002",
                             "credential": mock.MagicMock()},
                          "container": "c2",
-                         "objects": []}
+                         "objects": set()}
                     ]
                 }
             }
@@ -145,8 +145,7 @@ class SwiftObjectMixinTestCase(test.TestCase):
             self.assertEqual(0,
                              len(context["tenants"][tenant_id]["containers"]))
 
-    @mock.patch("rally_openstack.osclients.Clients")
-    def test__delete_objects(self, mock_clients):
+    def _get_context_with_objects(self):
         context = test.get_test_context()
         context.update({
             "tenants": {
@@ -157,7 +156,7 @@ class SwiftObjectMixinTestCase(test.TestCase):
                             "id": "u1", "tenant_id": "1001",
                             "credential": mock.MagicMock()},
                          "container": "c1",
-                         "objects": ["o1", "o2", "o3"]}
+                         "objects": {"o1", "o2", "o3"}}
                     ]
                 },
                 "1002": {
@@ -167,22 +166,57 @@ class SwiftObjectMixinTestCase(test.TestCase):
                             "id": "u2", "tenant_id": "1002",
                             "credential": mock.MagicMock()},
                          "container": "c2",
-                         "objects": ["o4", "o5", "o6"]}
+                         "objects": {"o4", "o5", "o6"}}
                     ]
                 }
             }
         })
+        return context
+
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test__delete_objects(self, mock_clients):
+        context = self._get_context_with_objects()
+        mock_swift = mock_clients.return_value.swift.return_value
+        mock_swift.get_capabilities.return_value = {}
 
         mixin = utils.SwiftObjectMixin()
         mixin._delete_objects(context, 1)
 
-        mock_swift = mock_clients.return_value.swift.return_value
         expected_objects = [("c1", "o1"), ("c1", "o2"), ("c1", "o3"),
                             ("c2", "o4"), ("c2", "o5"), ("c2", "o6")]
         mock_swift.delete_object.assert_has_calls(
             [mock.call(con, obj) for con, obj in expected_objects],
             any_order=True)
+        self.assertFalse(mock_swift.post_account.called)
+
+        for tenant_id in context["tenants"]:
+            for container in context["tenants"][tenant_id]["containers"]:
+                self.assertEqual(0, len(container["objects"]))
+
+    @mock.patch("rally_openstack.wrappers.swift.bulk_delete")
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test__delete_objects_bulk(self, mock_clients, mock_bulk_delete):
+        context = self._get_context_with_objects()
+        mock_swift = mock_clients.return_value.swift.return_value
+        mock_swift.get_capabilities.return_value = {
+            "bulk_delete": {"max_deletes_per_request": 2}}
+        mock_bulk_delete.side_effect = lambda client, objects: (
+            {("c1", "o3")} & set(objects))
+
+        mixin = utils.SwiftObjectMixin()
+        mixin._delete_objects(context, 1)
 
+        # 3 objects per container are deleted by a chunk of 2 objects and
+        #   a single request
+        self.assertEqual(2, mock_bulk_delete.call_count)
+        bulk_deleted = set(obj for call in mock_bulk_delete.call_args_list
+                           for obj in call[0][1]) - {("c1", "o3")}
+        deleted = set(tuple(call[0])
+                      for call in mock_swift.delete_object.call_args_list)
+        self.assertEqual(set(), bulk_deleted & deleted)
+        self.assertEqual({("c1", "o1"), ("c1", "o2"), ("c1", "o3"),
+                          ("c2", "o4"), ("c2", "o5"), ("c2", "o6")},
+                         bulk_deleted | deleted)
         for tenant_id in context["tenants"]:
             for container in context["tenants"][tenant_id]["containers"]:
                 self.assertEqual(0, len(container["objects"]))
@@ -15,8 +15,12 @@
 import copy
 import datetime as dt
 import os
+import shutil
+import tempfile
+import threading
 
 import mock
+from osprofiler.drivers import base
 
 from rally_openstack.embedcharts import osprofilerchart as osp_chart
 from tests.unit import test
@@ -26,6 +30,22 @@ PATH = "rally_openstack.embedcharts.osprofilerchart"
 CHART_PATH = "%s.OSProfilerChart" % PATH
 
 
+class FakeOSProfilerDriver(base.Driver):
+    """OSProfiler driver which keeps traces in memory."""
+
+    TRACES = {}
+
+    @classmethod
+    def get_name(cls):
+        return "rally-fake"
+
+    def get_report(self, base_id):
+        for trace_id, name, timestamp in self.TRACES[base_id]:
+            self._append_results(trace_id, base_id, name, None, None, None,
+                                 timestamp)
+        return self._parse_results()
+
+
 class OSProfilerChartTestCase(test.TestCase):
 
     def test__datetime_json_serialize(self):
@@ -45,14 +65,17 @@ class OSProfilerChartTestCase(test.TestCase):
             r
         )
 
+    @mock.patch("%s._template" % CHART_PATH, None)
     def test__generate_osprofiler_report(self):
         data = {"ts": dt.datetime(year=2018, month=7, day=3, hour=2)}
 
         mock_open = mock.mock_open(read_data="local=$LOCAL | data=$DATA")
         with mock.patch.object(osp_chart, "open", mock_open):
             r = osp_chart.OSProfilerChart._generate_osprofiler_report(data)
+            self.assertEqual(
+                r, osp_chart.OSProfilerChart._generate_osprofiler_report(data))
         self.assertEqual(
-            "local=false | data={\n    \"ts\": \"2018-07-03T02:00:00\"\n}",
+            "local=false | data={\"ts\":\"2018-07-03T02:00:00\"}",
             r
         )
         self.assertEqual(1, mock_open.call_count)
@@ -70,19 +93,90 @@ class OSProfilerChartTestCase(test.TestCase):
             r = osp_chart.OSProfilerChart._fetch_osprofiler_data(
                 connection_str, trace_id)
             self.assertIsNotNone(r)
+            osp_chart.OSProfilerChart._fetch_osprofiler_data(
+                connection_str, "another-trace-id")
 
-        mock_osp_driver.get_driver.assert_called_once_with(connection_str)
+        self.assertEqual([mock.call(connection_str)] * 2,
+                         mock_osp_driver.get_driver.call_args_list)
         engine = mock_osp_driver.get_driver.return_value
-        engine.get_report.assert_called_once_with(trace_id)
+        self.assertEqual([mock.call(trace_id), mock.call("another-trace-id")],
+                         engine.get_report.call_args_list)
         self.assertEqual(engine.get_report.return_value, r)
 
         mock_osp_driver.get_driver.side_effect = Exception("Something")
         with mock.patch.dict(
                 "sys.modules", {"osprofiler.drivers": mock_osp_drivers}):
             r = osp_chart.OSProfilerChart._fetch_osprofiler_data(
-                connection_str, trace_id)
+                "https://another.example.com", trace_id)
             self.assertIsNone(r)
 
+    @mock.patch.dict(FakeOSProfilerDriver.TRACES, {
+        "t1": [("p1", "wsgi-start", "2019-01-01T00:00:00.000"),
+               ("p1", "wsgi-stop", "2019-01-01T00:00:01.000")],
+        "t2": [("p2", "db-start", "2019-01-02T00:00:00.000"),
+               ("p2", "db-stop", "2019-01-02T00:00:00.500")]})
+    def test__fetch_osprofiler_data_several_traces(self):
+        fetch = osp_chart.OSProfilerChart._fetch_osprofiler_data
+
+        r1 = fetch("rally-fake://", "t1")
+        r2 = fetch("rally-fake://", "t2")
+
+        self.assertEqual(1000, r1["info"]["finished"])
+        self.assertEqual({"wsgi": {"count": 1, "duration": 1000}},
+                         r1["stats"])
+        self.assertEqual(500, r2["info"]["finished"])
+        self.assertEqual({"db": {"count": 1, "duration": 500}}, r2["stats"])
+        self.assertEqual(["p2"], [c["trace_id"] for c in r2["children"]])
+
+    @mock.patch("%s._generate_osprofiler_report" % CHART_PATH)
+    @mock.patch("%s._fetch_osprofiler_data" % CHART_PATH)
+    def test__save_osprofiler_report(self, mock__fetch_osprofiler_data,
+                                     mock__generate_osprofiler_report):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        path = os.path.join(tmp_dir, "report.html")
+        mock__generate_osprofiler_report.return_value = "REPORT"
+
+        osp_chart.OSProfilerChart._save_osprofiler_report("conn", "trace-id",
+                                                          path)
+
+        mock__fetch_osprofiler_data.assert_called_once_with("conn",
+                                                            "trace-id")
+        mock__generate_osprofiler_report.assert_called_once_with(
+            mock__fetch_osprofiler_data.return_value)
+        with open(path) as f:
+            self.assertEqual("REPORT", f.read())
+
+        mock__fetch_osprofiler_data.return_value = None
+        osp_chart.OSProfilerChart._save_osprofiler_report("conn", "trace-id",
+                                                          path)
+        with open(path) as f:
+            self.assertIn("trace-id", f.read())
+
+    @mock.patch("%s.CONF.openstack" % PATH)
+    def test__report_writer(self, mock_cfg_os):
+        mock_cfg_os.osprofiler_chart_workers = 2
+        writer = osp_chart._ReportWriter()
+        lock = threading.Lock()
+        saved = []
+        running = []
+
+        def save(i):
+            with lock:
+                running.append(len(writer._workers))
+            if i == 3:
+                raise Exception("Something")
+            with lock:
+                saved.append(i)
+
+        for i in range(10):
+            writer.submit(save, i)
+        writer.wait()
+
+        self.assertEqual([0, 1, 2, 4, 5, 6, 7, 8, 9], sorted(saved))
+        self.assertTrue(all(n <= 2 for n in running))
+        self.assertEqual([], writer._workers)
+
     @mock.patch("%s.OutputEmbeddedExternalChart" % PATH)
     @mock.patch("%s.OutputEmbeddedChart" % PATH)
     @mock.patch("%s._return_raw_response_for_complete_data" % CHART_PATH)
@@ -160,15 +254,20 @@ class OSProfilerChartTestCase(test.TestCase):
                           "workload_uuid": "W_ID",
                           "iteration": 777},
                  "title": title}
+        mock__fetch_osprofiler_data.reset_mock()
 
-        mock_open = mock.mock_open()
-        with mock.patch.object(osp_chart, "open", mock_open):
+        with mock.patch("%s._writer" % CHART_PATH) as mock_writer:
             with mock.patch("%s.CONF.openstack" % PATH) as mock_cfg_os:
                 mock_cfg_os.osprofiler_chart_mode = "/path"
 
                 r = osp_chart.OSProfilerChart.render_complete_data(
                     copy.deepcopy(pdata))
 
+        mock_writer.submit.assert_called_once_with(
+            osp_chart.OSProfilerChart._save_osprofiler_report, "conn",
+            trace_id, "/path/w_W_ID-777.html")
+        self.assertFalse(mock__fetch_osprofiler_data.called)
+
         mock_external_chat = mock_output_embedded_external_chart
         self.assertEqual(
             mock_external_chat.render_complete_data.return_value,
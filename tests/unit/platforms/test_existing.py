@@ -20,6 +20,7 @@ from rally.env import env_mgr
 from rally.env import platform
 from rally import exceptions
 
+from rally_openstack import osclients
 from rally_openstack.platforms import existing
 from tests.unit import test
 
@@ -287,6 +288,32 @@ class ExistingPlatformTestCase(PlatformBaseTestCase):
              mock.call(pdata["users"][1]), mock.call().keystone(),
              mock.call(pdata["admin"]), mock.call().verified_keystone()])
 
+    @mock.patch("rally_openstack.platforms.existing.db.platform_set_data")
+    @mock.patch("rally_openstack.osclients.Clients")
+    def test_check_health_saves_keystone_versions(self, mock_clients,
+                                                  mock_platform_set_data):
+        admin = {"auth_url": "http://example.com", "username": "admin"}
+        user = {"auth_url": "http://example.com/v3", "username": "user"}
+        pdata = {"admin": admin, "users": [user]}
+        expected = {"admin": dict(admin), "users": [dict(user)],
+                    "keystone_versions": {"http://example.com": "3"}}
+        mock.patch.dict(
+            osclients._DISCOVERED_KEYSTONE_VERSIONS,
+            {"http://example.com": "3", "http://another.com": "2"},
+            clear=True).start()
+        p = existing.OpenStack({}, uuid="uuid", platform_data=pdata)
+
+        self.assertEqual({"available": True}, p.check_health())
+
+        mock_platform_set_data.assert_called_once_with(
+            "uuid", platform_data=expected)
+        self.assertEqual(expected, p.platform_data)
+
+        # nothing is changed, so nothing should be saved
+        mock_platform_set_data.reset_mock()
+        self.assertEqual({"available": True}, p.check_health())
+        self.assertFalse(mock_platform_set_data.called)
+
     @mock.patch("rally_openstack.osclients.Clients")
     def test_check_failed_with_native_rally_exc(self, mock_clients):
         e = exceptions.RallyException("foo")
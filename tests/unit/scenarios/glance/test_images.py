@@ -170,11 +170,25 @@ class GlanceBasicTestCase(test.ScenarioTestCase):
                      "min_ram": 0,
                      "properties": properties}
 
-        images.CreateAndDownloadImage(self.context).run(
-            "cf", "url", "df", "vs", 0, 0, properties=properties)
+        image_service.download_image_data.return_value = {
+            "bytes": 1024 * 1024, "first_byte": 0.1, "duration": 0.5,
+            "throughput": 2.0, "checksum": None}
+
+        scenario = images.CreateAndDownloadImage(self.context)
+        scenario.run("cf", "url", "df", "vs", 0, 0, properties=properties)
 
         image_service.create_image.assert_called_once_with(**call_args)
-        image_service.download_image.assert_called_once_with(fake_image.id)
+        image_service.download_image_data.assert_called_once_with(
+            fake_image.id, do_checksum=False)
+        self.assertEqual(
+            {"additive": [{"title": "Image download",
+                           "description": "Downloaded data per iteration",
+                           "chart_plugin": "StatsTable",
+                           "data": [["Size, MB", 1.0],
+                                    ["Time to first byte, sec", 0.1],
+                                    ["Throughput, MB/s", 2.0]]}],
+             "complete": []},
+            scenario._output)
 
     @mock.patch("%s.CreateImageAndBootInstances._boot_servers" % BASE)
     def test_create_image_and_boot_instances(self, mock_boot_servers):
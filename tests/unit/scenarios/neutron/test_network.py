@@ -401,6 +401,22 @@ class NeutronNetworksTestCase(test.ScenarioTestCase):
 
         scenario._list_ports.assert_called_once_with()
 
+    def test_create_and_list_ports_bulk(self):
+        net = mock.MagicMock()
+        scenario = network.CreateAndListPorts(self.context)
+        scenario._get_or_create_network = mock.Mock(return_value=net)
+        scenario._create_port = mock.Mock()
+        scenario._create_ports = mock.Mock()
+        scenario._list_ports = mock.Mock()
+
+        scenario.run(port_create_args={"allocation_pools": []},
+                     ports_per_network=10, bulk_create=True)
+
+        scenario._create_ports.assert_called_once_with(
+            net, {"allocation_pools": []}, 10)
+        self.assertFalse(scenario._create_port.called)
+        scenario._list_ports.assert_called_once_with()
+
     def test_create_and_update_ports(self):
         port_update_args = {"admin_state_up": False},
         port_create_args = {"allocation_pools": []}
@@ -551,6 +567,22 @@ class NeutronNetworksTestCase(test.ScenarioTestCase):
         scenario._delete_port.assert_has_calls(
             [mock.call(p) for p in ports])
 
+    def test_create_and_delete_ports_bulk(self):
+        net = mock.MagicMock()
+        ports = [mock.MagicMock() for _ in range(10)]
+        scenario = network.CreateAndDeletePorts(self.context)
+        scenario._get_or_create_network = mock.Mock(return_value=net)
+        scenario._create_port = mock.Mock()
+        scenario._create_ports = mock.Mock(return_value=ports)
+        scenario._delete_port = mock.Mock()
+
+        scenario.run(ports_per_network=10, bulk_create=True)
+
+        scenario._create_ports.assert_called_once_with(net, {}, 10)
+        self.assertFalse(scenario._create_port.called)
+        self.assertEqual([mock.call(p) for p in ports],
+                         scenario._delete_port.mock_calls)
+
     @ddt.data(
         {"floating_network": "ext-net"},
         {"floating_network": "ext-net",
@@ -500,6 +500,21 @@ class NeutronScenarioTestCase(test.ScenarioTestCase):
         self.clients("neutron"
                      ).create_port.assert_called_once_with(expected_port_args)
 
+    def test_create_ports(self):
+        net = {"network": {"id": "network-id"}}
+        self.clients("neutron").create_port.return_value = {
+            "ports": ["port-1", "port-2"]}
+
+        ports = self.scenario._create_ports(net, {"admin_state_up": True}, 2)
+
+        self.assertEqual([{"port": "port-1"}, {"port": "port-2"}], ports)
+        name = self.scenario.generate_random_name.return_value
+        self.clients("neutron").create_port.assert_called_once_with(
+            {"ports": [{"network_id": "network-id", "name": name,
+                        "admin_state_up": True}] * 2})
+        self._test_atomic_action_timer(self.scenario.atomic_actions(),
+                                       "neutron.create_ports")
+
     def test_list_ports(self):
         ports = [{"name": "port1"}, {"name": "port2"}]
         self.clients("neutron").list_ports.return_value = {"ports": ports}
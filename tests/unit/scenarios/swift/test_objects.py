@@ -34,6 +34,9 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
 
         self.assertEqual(1, scenario._create_container.call_count)
         self.assertEqual(5, scenario._upload_object.call_count)
+        for call in scenario._upload_object.call_args_list:
+            self.assertEqual("AA", call[0][0])
+            self.assertEqual(100, call[0][1].size)
         scenario._list_objects.assert_called_once_with("AA")
 
     def test_create_container_and_object_then_delete_all(self):
@@ -59,14 +62,21 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario._create_container = mock.MagicMock(return_value="CC")
         scenario._upload_object = mock.MagicMock(
             side_effect=[("etaaaag", "obbbj_%i" % i) for i in range(2)])
-        scenario._download_object = mock.MagicMock()
+        scenario._download_object_data = mock.MagicMock(return_value={
+            "bytes": 50, "first_byte": 0.1, "duration": 0.2,
+            "throughput": 0.1, "checksum": None})
+        scenario.add_output = mock.MagicMock()
 
         scenario.run(objects_per_container=2, object_size=50)
 
         self.assertEqual(1, scenario._create_container.call_count)
         self.assertEqual(2, scenario._upload_object.call_count)
-        scenario._download_object.assert_has_calls(
-            [mock.call("CC", "obbbj_%i" % i) for i in range(2)])
+        scenario._download_object_data.assert_has_calls(
+            [mock.call("CC", "obbbj_%i" % i, do_checksum=False)
+             for i in range(2)])
+        additive = scenario.add_output.call_args[1]["additive"]
+        self.assertEqual(["Size, MB", 100 / 1024.0 / 1024.0],
+                         additive["data"][0])
 
     @ddt.data(1, 5)
     def test_list_objects_in_containers(self, num_cons):
@@ -137,9 +147,12 @@ class SwiftObjectsTestCase(test.ScenarioTestCase):
         scenario = objects.CreateContainerAndObjectThenDownloadObject(
             self.context)
         scenario.generate_random_name = mock.MagicMock(side_effect=names_list)
-        scenario._download_object = mock.MagicMock()
+        scenario._download_object_data = mock.MagicMock(return_value={
+            "bytes": 750, "first_byte": 0.1, "duration": 0.2,
+            "throughput": 0.1, "checksum": None})
 
         scenario.run(objects_per_container=5, object_size=750)
 
-        scenario._download_object.assert_has_calls(
-            [mock.call("aaa", name) for name in names_list[1:]])
+        scenario._download_object_data.assert_has_calls(
+            [mock.call("aaa", name, do_checksum=False)
+             for name in names_list[1:]])
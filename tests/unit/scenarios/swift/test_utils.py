@@ -16,7 +16,9 @@
 import ddt
 import mock
 
+from rally import exceptions
 from rally_openstack.scenarios.swift import utils
+from rally_openstack import streaming
 from tests.unit import test
 
 SWIFT_UTILS = "rally_openstack.scenarios.swift.utils"
@@ -140,6 +142,30 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.download_object")
 
+    @ddt.data({"headers": {"etag": "acbd18db4cc2f85cedef654fccc4a4d8"}},
+              {"headers": {"etag": "wrong", "x-static-large-object": "True"}},
+              {"headers": {"etag": "wrong"}, "do_checksum": False},
+              {"headers": {"etag": "wrong"}, "error": True})
+    @ddt.unpack
+    def test__download_object_data(self, headers, do_checksum=True,
+                                   error=False):
+        self.clients("swift").get_object.return_value = (headers,
+                                                         [b"f", b"oo"])
+        scenario = utils.SwiftScenario(context=self.context)
+
+        if error:
+            self.assertRaises(exceptions.RallyException,
+                              scenario._download_object_data, "c", "o",
+                              do_checksum=do_checksum)
+        else:
+            stats = scenario._download_object_data("c", "o",
+                                                   do_checksum=do_checksum)
+            self.assertEqual(3, stats["bytes"])
+        self.clients("swift").get_object.assert_called_once_with(
+            "c", "o", resp_chunk_size=streaming.CHUNK_SIZE)
+        self._test_atomic_action_timer(scenario.atomic_actions(),
+                                       "swift.download_object")
+
     def test__delete_object(self):
         container_name = mock.MagicMock()
         object_name = mock.MagicMock()
@@ -152,3 +178,34 @@ class SwiftScenarioTestCase(test.ScenarioTestCase):
             **kw)
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "swift.delete_object")
+
+
+class ObjectPayloadTestCase(test.TestCase):
+
+    def test_read(self):
+        size = len(utils._ZEROS) + 10
+        payload = utils.ObjectPayload(size)
+
+        chunk = payload.read()
+        self.assertIsInstance(chunk, memoryview)
+        self.assertEqual(len(utils._ZEROS), len(chunk))
+        self.assertEqual(b"\0" * 5, payload.read(5).tobytes())
+        self.assertEqual(5, len(payload.read(100)))
+        self.assertEqual(0, len(payload.read()))
+        self.assertEqual(size, payload.tell())
+
+    def test_seek(self):
+        payload = utils.ObjectPayload(100)
+
+        self.assertEqual(100, payload.seek(0, 2))
+        self.assertEqual(90, payload.seek(-10, 1))
+        self.assertEqual(10, len(payload.read()))
+        self.assertEqual(0, payload.seek(0))
+        self.assertEqual(100, len(payload.read(1000)))
+
+    def test_readers_are_independent(self):
+        payloads = [utils.ObjectPayload(10), utils.ObjectPayload(10)]
+
+        self.assertEqual(4, len(payloads[0].read(4)))
+        self.assertEqual(10, len(payloads[1].read()))
+        self.assertEqual(6, len(payloads[0].read()))
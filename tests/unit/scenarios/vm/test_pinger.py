@@ -0,0 +1,132 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import socket
+import struct
+import threading
+
+import mock
+
+from rally_openstack.scenarios.vm import pinger
+from tests.unit import test
+
+
+PINGER = "rally_openstack.scenarios.vm.pinger"
+
+
+class FakeICMPSocket(object):
+    """Replies to echo requests sent to the given addresses."""
+
+    def __init__(self, alive):
+        self.alive = alive
+        self.sent = []
+        self._replies = []
+        self._rfd, self._wfd = os.pipe()
+
+    def fileno(self):
+        return self._rfd
+
+    def sendto(self, data, address):
+        self.sent.append((data, address))
+        if address[0] in self.alive:
+            reply = bytearray(data)
+            reply[0] = 0
+            self._replies.append((bytes(reply), (address[0], 0)))
+            os.write(self._wfd, b"x")
+
+    def recvfrom(self, size):
+        os.read(self._rfd, 1)
+        return self._replies.pop(0)
+
+    def close(self):
+        os.close(self._rfd)
+        os.close(self._wfd)
+
+
+class PingerTestCase(test.TestCase):
+
+    def test_echo_request(self):
+        data = pinger._echo_request(4, 5)
+
+        self.assertEqual((8, 0, 0, 5), struct.unpack("!BBxxHH", data[:8]))
+        self.assertEqual(0, pinger._checksum(data))
+        self.assertEqual(128, bytearray(pinger._echo_request(6, 5))[0])
+
+    @mock.patch("%s.socket.socket" % PINGER)
+    def test_ping(self, mock_socket):
+        sock = FakeICMPSocket(alive=["10.0.0.1"])
+        self.addCleanup(sock.close)
+        mock_socket.return_value = sock
+        icmp = pinger.Pinger()
+
+        self.assertTrue(icmp.ping("10.0.0.1"))
+        self.assertFalse(icmp.ping("10.0.0.2", timeout=0.1))
+        self.assertTrue(icmp.ping("10.0.0.1"))
+
+        mock_socket.assert_called_once_with(
+            socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        self.assertEqual([0, 1, 2],
+                         [struct.unpack("!H", data[6:8])[0]
+                          for data, _address in sock.sent])
+        self.assertEqual({}, icmp._waiters)
+
+    @mock.patch("%s.socket.socket" % PINGER)
+    def test_ping_concurrently(self, mock_socket):
+        alive = ["10.0.0.%s" % i for i in range(1, 20, 2)]
+        sock = FakeICMPSocket(alive=alive)
+        self.addCleanup(sock.close)
+        mock_socket.return_value = sock
+        icmp = pinger.Pinger()
+        results = {}
+
+        def ping(ip):
+            results[ip] = icmp.ping(ip, timeout=0.5)
+
+        threads = [threading.Thread(target=ping, args=("10.0.0.%s" % i,))
+                   for i in range(1, 21)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(dict(("10.0.0.%s" % i, "10.0.0.%s" % i in alive)
+                              for i in range(1, 21)), results)
+        mock_socket.assert_called_once_with(
+            socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+
+    @mock.patch("%s.socket.socket" % PINGER)
+    def test_ping_not_available(self, mock_socket):
+        mock_socket.side_effect = socket.error(13, "Permission denied")
+        icmp = pinger.Pinger()
+
+        self.assertIsNone(icmp.ping("10.0.0.1"))
+        self.assertIsNone(icmp.ping("10.0.0.1"))
+        mock_socket.assert_called_once_with(
+            socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+
+    def test_ping_localhost(self):
+        result = pinger.Pinger().ping("127.0.0.1")
+        if result is None:
+            self.skipTest("ICMP datagram sockets are not permitted.")
+        self.assertTrue(result)
+
+    @mock.patch("%s.os.getpid" % PINGER)
+    def test_get_pinger(self, mock_getpid):
+        mock_getpid.return_value = 1
+        icmp = pinger.get_pinger()
+        self.assertIs(icmp, pinger.get_pinger())
+
+        mock_getpid.return_value = 2
+        self.assertIsNot(icmp, pinger.get_pinger())
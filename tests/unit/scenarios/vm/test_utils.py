@@ -14,12 +14,15 @@
 #    under the License.
 
 
+import socket
 import subprocess
+import threading
 
 import mock
 import netaddr
 
 from rally.common import cfg
+from rally import exceptions
 from rally_openstack.scenarios.vm import utils
 from tests.unit import test
 
@@ -78,6 +81,23 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             ["foo", "bar", "arg1", "arg2"],
             stdin=None)
 
+    def test__run_command_over_ssh_stdout(self):
+        mock_ssh = mock.MagicMock()
+        mock_ssh.run.side_effect = (
+            lambda cmd, stdin, stdout, stderr, raise_on_error: (
+                stdout.write("foo\nbar"), stderr.write("err"), (1, None))[-1])
+        output = utils.CommandOutput()
+        vm_scenario = utils.VMScenario(self.context)
+
+        self.assertEqual(
+            (1, output, "err"),
+            vm_scenario._run_command_over_ssh(
+                mock_ssh, {"remote_path": "foo"}, stdout=output))
+        mock_ssh.run.assert_called_once_with(
+            ["foo"], stdin=None, stdout=output, stderr=mock.ANY,
+            raise_on_error=False)
+        self.assertEqual(["foo", "bar"], list(output.tail))
+
     def test__run_command_over_ssh_remote_path_copy(self):
         mock_ssh = mock.MagicMock()
         vm_scenario = utils.VMScenario(self.context)
@@ -96,11 +116,28 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             ["foo", "bar", "arg1", "arg2"],
             stdin=None)
 
-    def test__wait_for_ssh(self):
+    @mock.patch("%s.time" % VMTASKS_UTILS)
+    @mock.patch("%s.probe_ssh_banner" % VMTASKS_UTILS)
+    def test__wait_for_ssh(self, mock_probe_ssh_banner, mock_time):
+        mock_probe_ssh_banner.side_effect = [False, False, True]
+        mock_time.time.side_effect = [0, 1, 2, 3]
         ssh = mock.MagicMock()
         vm_scenario = utils.VMScenario(self.context)
         vm_scenario._wait_for_ssh(ssh)
-        ssh.wait.assert_called_once_with(120, 1)
+        mock_probe_ssh_banner.assert_called_with(ssh.host, ssh.port)
+        self.assertEqual(2, mock_time.sleep.call_count)
+        ssh.wait.assert_called_once_with(117, 1)
+
+    @mock.patch("%s.time" % VMTASKS_UTILS)
+    @mock.patch("%s.probe_ssh_banner" % VMTASKS_UTILS)
+    def test__wait_for_ssh_timeout(self, mock_probe_ssh_banner, mock_time):
+        mock_probe_ssh_banner.return_value = False
+        mock_time.time.side_effect = [0, 60, 121]
+        ssh = mock.MagicMock()
+        vm_scenario = utils.VMScenario(self.context)
+        self.assertRaises(exceptions.SSHTimeout,
+                          vm_scenario._wait_for_ssh, ssh)
+        self.assertFalse(ssh.wait.called)
 
     def test__wait_for_ping(self):
         vm_scenario = utils.VMScenario(self.context)
@@ -114,22 +151,33 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             check_interval=CONF.openstack.vm_ping_poll_interval)
 
     @mock.patch(VMTASKS_UTILS + ".VMScenario._run_command_over_ssh")
-    @mock.patch("rally.common.sshutils.SSH")
-    def test__run_command(self, mock_sshutils_ssh,
+    @mock.patch(VMTASKS_UTILS + ".VMScenario._wait_for_ssh")
+    @mock.patch(VMTASKS_UTILS + ".SSHConnection")
+    def test__run_command(self, mock_ssh_connection,
+                          mock_vm_scenario__wait_for_ssh,
                           mock_vm_scenario__run_command_over_ssh):
         vm_scenario = utils.VMScenario(self.context)
         vm_scenario.context = {"user": {"keypair": {"private": "ssh"}}}
-        vm_scenario._run_command("1.2.3.4", 22, "username", "password",
-                                 command={"script_file": "foo",
-                                          "interpreter": "bar"})
+        for i in range(2):
+            vm_scenario._run_command("1.2.3.4", 22, "username", "password",
+                                     command={"script_file": "foo",
+                                              "interpreter": "bar"})
 
-        mock_sshutils_ssh.assert_called_once_with(
+        mock_ssh_connection.assert_called_once_with(
             "username", "1.2.3.4",
             port=22, pkey="ssh", password="password")
-        mock_sshutils_ssh.return_value.wait.assert_called_once_with(120, 1)
-        mock_vm_scenario__run_command_over_ssh.assert_called_once_with(
-            mock_sshutils_ssh.return_value,
-            {"script_file": "foo", "interpreter": "bar"})
+        mock_vm_scenario__wait_for_ssh.assert_called_once_with(
+            mock_ssh_connection.return_value, 120, 1)
+        mock_vm_scenario__run_command_over_ssh.assert_has_calls(
+            [mock.call(mock_ssh_connection.return_value,
+                       {"script_file": "foo", "interpreter": "bar"},
+                       stdout=None)] * 2)
+
+        vm_scenario._close_ssh_connections("1.2.3.4")
+        mock_ssh_connection.return_value.close.assert_called_once_with()
+        vm_scenario._run_command("1.2.3.4", 22, "username", "password",
+                                 command={"script_file": "foo"})
+        self.assertEqual(2, mock_ssh_connection.call_count)
 
     def get_scenario(self):
         server = mock.Mock(
@@ -204,6 +252,21 @@ class VMScenarioTestCase(test.ScenarioTestCase):
         scenario._delete_floating_ip.assert_called_once_with(server, fip)
         scenario._delete_server.assert_called_once_with(server, force=True)
 
+    def test__delete_server_with_fip_closes_ssh(self):
+        fip = {"ip": "foo_ip", "id": "foo_id", "is_floating": False}
+        scenario, server = self.get_scenario()
+        ssh = mock.Mock()
+        other_ssh = mock.Mock()
+        scenario._ssh_connections = {("foo_ip", 22, "root"): ssh,
+                                     ("bar_ip", 22, "root"): other_ssh}
+
+        scenario._delete_server_with_fip(server, fip)
+
+        ssh.close.assert_called_once_with()
+        self.assertFalse(other_ssh.close.called)
+        self.assertEqual({("bar_ip", 22, "root"): other_ssh},
+                         scenario._ssh_connections)
+
     @mock.patch(VMTASKS_UTILS + ".network_wrapper.wrap")
     def test__attach_floating_ip(self, mock_wrap):
         scenario, server = self.get_scenario()
@@ -244,8 +307,167 @@ class VMScenarioTestCase(test.ScenarioTestCase):
             "foo_id", wait=True)
 
 
+class CommandOutputTestCase(test.TestCase):
+
+    def test_write(self):
+        output = utils.CommandOutput()
+        for chunk in ("start\n{\"additive\": {\"title\": \"fio\", ",
+                      "\"data\": [[\"read\", 1], [\"write\", 2]]}}\r\n",
+                      "{\"complete\": {\"title\": \"t\", \"data\": []}}\n",
+                      "{\"additive\": {\"title\": \"fio\", ",
+                      "\"data\": [[\"read\", 3]]}}\n{\"foo\": 42}\nend"):
+            output.write(chunk)
+        output.close()
+
+        self.assertEqual(
+            [("additive", {"title": "fio",
+                           "data": [["read", 1], ["write", 2],
+                                    ["read", 3]]}),
+             ("complete", {"title": "t", "data": []})],
+            output.get_charts())
+        self.assertEqual(["start", "{\"foo\": 42}", "end"], list(output.tail))
+        self.assertTrue(output.text.startswith("start\n"))
+        self.assertTrue(output.text.endswith("\nend"))
+
+    def test_write_not_chart(self):
+        output = utils.CommandOutput()
+        output.write("{\"additive\": [1, 2]}\n"
+                     "{\"additive\": {\"title\": \"a\", \"data\": [1]}}\n"
+                     "{\"complete\": {\"data\": []}}\n{broken\n")
+        output.close()
+
+        self.assertEqual([], output.get_charts())
+        self.assertEqual(4, len(output.tail))
+
+    def test_write_big_output(self):
+        output = utils.CommandOutput(tail_lines=2, max_text_size=10)
+        for i in range(10):
+            output.write("line %d\n" % i)
+        output.close()
+
+        self.assertIsNone(output.text)
+        self.assertEqual(["line 8", "line 9"], list(output.tail))
+        self.assertRaises(ValueError, output.load_json)
+
+    def test_load_json(self):
+        output = utils.CommandOutput(max_text_size=10)
+        output.write("  \n")
+        output.write("{\"complete\": [%s],\n" % ", ".join(["42"] * 10))
+        output.write("\"additive\": []}")
+        output.close()
+
+        self.assertIsNone(output.text)
+        self.assertEqual({"complete": [42] * 10, "additive": []},
+                         output.load_json())
+
+    def test_load_json_stream(self):
+        output = utils.CommandOutput(max_text_size=10)
+        output._read_text = mock.Mock()
+        output.write("{\"foo\": 1}\n{\"foo\": 2}\n")
+        output.close()
+
+        self.assertRaises(ValueError, output.load_json)
+
+        output = utils.CommandOutput()
+        output._read_text = mock.Mock()
+        output.write("{\"complete\": {\"title\": \"t\", \"data\": []}}")
+        output.close()
+
+        self.assertRaises(ValueError, output.load_json)
+        self.assertFalse(output._read_text.called)
+
+    def test_write_carriage_returns(self):
+        output = utils.CommandOutput(max_text_size=12)
+        for chunk in ("1 MB copied\r2 MB", " copied\r", "\ndone\r\n",
+                      "x" * 25):
+            output.write(chunk)
+        output.close()
+
+        self.assertEqual(["1 MB copied", "2 MB copied", "done",
+                          "x" * 12, "x" * 12, "x"], list(output.tail))
+
+
+class ProbeSSHBannerTestCase(test.TestCase):
+
+    def _serve(self, banner):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.addCleanup(server.close)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+
+        def serve():
+            conn = server.accept()[0]
+            if banner:
+                conn.sendall(banner)
+            conn.close()
+
+        thread = threading.Thread(target=serve)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(thread.join)
+        return server.getsockname()[1]
+
+    def test_probe_ssh_banner(self):
+        port = self._serve(b"Welcome\r\nSSH-2.0-OpenSSH_7.4\r\n")
+        self.assertTrue(utils.probe_ssh_banner("127.0.0.1", port))
+
+    def test_probe_ssh_banner_no_banner(self):
+        port = self._serve(None)
+        self.assertFalse(utils.probe_ssh_banner("127.0.0.1", port))
+
+    def test_probe_ssh_banner_refused(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        self.assertFalse(utils.probe_ssh_banner("127.0.0.1", port))
+
+
+class SSHConnectionTestCase(test.TestCase):
+
+    @mock.patch("rally.common.sshutils.paramiko.SSHClient")
+    def test__get_client(self, mock_ssh_client):
+        ssh = utils.SSHConnection("root", "1.2.3.4")
+        transport = mock_ssh_client.return_value.get_transport.return_value
+        transport.is_active.side_effect = [True, False]
+
+        client = ssh._get_client()
+        self.assertEqual(client, ssh._get_client())
+        self.assertEqual(1, mock_ssh_client.return_value.connect.call_count)
+        transport.set_keepalive.assert_called_once_with(
+            CONF.openstack.vm_ssh_keepalive_interval)
+
+        # NOTE: the transport is not active anymore
+        ssh._get_client()
+        self.assertEqual(2, mock_ssh_client.return_value.connect.call_count)
+        mock_ssh_client.return_value.close.assert_called_once_with()
+
+    def test_close_not_connected(self):
+        utils.SSHConnection("root", "1.2.3.4").close()
+
+
 class HostTestCase(test.TestCase):
 
+    def setUp(self):
+        super(HostTestCase, self).setUp()
+        patch = mock.patch(VMTASKS_UTILS + ".pinger.get_pinger")
+        self.addCleanup(patch.stop)
+        self.mock_get_pinger = patch.start()
+        self.mock_get_pinger.return_value.ping.return_value = None
+
+    @mock.patch("subprocess.Popen")
+    def test_update_status_pinger(self, mock_popen):
+        self.mock_get_pinger.return_value.ping.side_effect = [True, False]
+
+        host = utils.Host("1.2.3.4")
+        self.assertEqual(utils.Host.ICMP_UP_STATUS,
+                         utils.Host.update_status(host).status)
+        self.assertEqual(utils.Host.ICMP_DOWN_STATUS,
+                         utils.Host.update_status(host).status)
+
+        self.mock_get_pinger.return_value.ping.assert_called_with(host.ip)
+        self.assertFalse(mock_popen.called)
+
     @mock.patch(VMTASKS_UTILS + ".sys")
     @mock.patch("subprocess.Popen")
     def test__ping_ip_address_linux(self, mock_popen, mock_sys):
@@ -41,6 +41,14 @@ class VMTasksTestCase(test.ScenarioTestCase):
         self.cinder.create_volume.return_value = mock.Mock(id="foo_volume")
         self.addCleanup(cinder_patcher.stop)
 
+    @staticmethod
+    def _fake_run_command(code, out, err):
+        def run_command(*args, **kwargs):
+            kwargs["stdout"].write(out)
+            kwargs["stdout"].close()
+            return code, kwargs["stdout"], err
+        return run_command
+
     def create_env(self, scenario):
         self.ip = {"id": "foo_id", "ip": "foo_ip", "is_floating": True}
         scenario._boot_server_with_fip = mock.Mock(
@@ -48,14 +56,13 @@ class VMTasksTestCase(test.ScenarioTestCase):
         scenario._wait_for_ping = mock.Mock()
         scenario._delete_server_with_fip = mock.Mock()
         scenario._run_command = mock.MagicMock(
-            return_value=(0, "{\"foo\": 42}", "foo_err"))
+            side_effect=self._fake_run_command(0, "{\"foo\": 42}",
+                                               "foo_err"))
         scenario.add_output = mock.Mock()
         return scenario
 
     def test_boot_runcommand_delete(self):
         scenario = self.create_env(vmtasks.BootRuncommandDelete(self.context))
-        scenario._run_command = mock.MagicMock(
-            return_value=(0, "{\"foo\": 42}", "foo_err"))
         scenario.run("foo_flavor", image="foo_image",
                      command={"script_file": "foo_script",
                               "interpreter": "foo_interpreter"},
@@ -78,7 +85,8 @@ class VMTasksTestCase(test.ScenarioTestCase):
         scenario._run_command.assert_called_once_with(
             "foo_ip", 22, "foo_username", "foo_password",
             command={"script_file": "foo_script",
-                     "interpreter": "foo_interpreter"})
+                     "interpreter": "foo_interpreter"},
+            stdout=mock.ANY)
         scenario._delete_server_with_fip.assert_called_once_with(
             "foo_server", self.ip, force_delete="foo_force")
         scenario.add_output.assert_called_once_with(
@@ -121,14 +129,27 @@ class VMTasksTestCase(test.ScenarioTestCase):
                                     "title": "Script Output"}}]},
         {"output": (0, "{\"additive\": [1, 2], \"complete\": [3, 4]}", ""),
          "expected": [{"additive": 1}, {"additive": 2},
-                      {"complete": 3}, {"complete": 4}]}
+                      {"complete": 3}, {"complete": 4}]},
+        {"output": (0, "{\"additive\": {\"title\": \"a\", "
+                       "\"data\": [[\"x\", 1]]}}\n"
+                       "{\"additive\": {\"title\": \"a\", "
+                       "\"data\": [[\"x\", 2]]}}\n", ""),
+         "expected": [{"additive": {"title": "a",
+                                    "data": [["x", 1], ["x", 2]]}}]},
+        {"output": (0, "{\"additive\": {\"title\": \"a\", "
+                       "\"data\": [[\"x\", 1]]}}\nfoo\n", ""),
+         "expected": [{"additive": {"title": "a", "data": [["x", 1]]}},
+                      {"complete": {"chart_plugin": "TextArea",
+                                    "data": ["StdErr: (none)", "StdOut:",
+                                             "foo"],
+                                    "title": "Script Output"}}]}
     )
     @ddt.unpack
     def test_boot_runcommand_delete_add_output(self, output,
                                                expected=None, raises=None):
         scenario = self.create_env(vmtasks.BootRuncommandDelete(self.context))
 
-        scenario._run_command.return_value = output
+        scenario._run_command.side_effect = self._fake_run_command(*output)
         kwargs = {"flavor": "foo_flavor",
                   "image": "foo_image",
                   "command": {"remote_path": "foo"},
@@ -157,7 +178,7 @@ class VMTasksTestCase(test.ScenarioTestCase):
 
             scenario._run_command.assert_called_once_with(
                 "foo_ip", 22, "foo_username", "foo_password",
-                command={"remote_path": "foo"})
+                command={"remote_path": "foo"}, stdout=mock.ANY)
             scenario._delete_server_with_fip.assert_called_once_with(
                 "foo_server", self.ip, force_delete="foo_force")
 
@@ -225,8 +246,6 @@ class VMTasksTestCase(test.ScenarioTestCase):
         }
 
         scenario = self.create_env(vmtasks.BootRuncommandDelete(context))
-        scenario._run_command = mock.MagicMock(
-            return_value=(0, "{\"foo\": 42}", "foo_err"))
         scenario.run("foo_flavor",
                      command={"script_file": "foo_script",
                               "interpreter": "foo_interpreter"},
@@ -249,7 +268,8 @@ class VMTasksTestCase(test.ScenarioTestCase):
         scenario._run_command.assert_called_once_with(
             "foo_ip", 22, "foo_username", "foo_password",
             command={"script_file": "foo_script",
-                     "interpreter": "foo_interpreter"})
+                     "interpreter": "foo_interpreter"},
+            stdout=mock.ANY)
         scenario._delete_server_with_fip.assert_called_once_with(
             "foo_server", self.ip, force_delete="foo_force")
         scenario.add_output.assert_called_once_with(
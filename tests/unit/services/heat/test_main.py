@@ -41,14 +41,15 @@ class StackTestCase(test.ScenarioTestCase):
         reads[0].read.assert_called_once_with()
         reads[1].read.assert_called_once_with()
 
+    @mock.patch("rally_openstack.services.heat.main.polling")
     @mock.patch("rally_openstack.services.heat.main.utils")
-    def test__wait(self, mock_utils):
+    def test__wait(self, mock_utils, mock_polling):
         fake_stack = mock.Mock()
         stack = Stack()
         stack.stack = fake_stack = mock.Mock()
         stack._wait(["ready_statuses"], ["failure_statuses"])
-        mock_utils.wait_for_status.assert_called_once_with(
-            fake_stack, check_interval=1.0,
+        mock_polling.wait_for_status.assert_called_once_with(
+            stack.scenario, "heat", fake_stack, check_interval=1.0,
             ready_statuses=["ready_statuses"],
             failure_statuses=["failure_statuses"],
             timeout=3600.0,
@@ -0,0 +1,265 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import mock
+from rally import exceptions
+
+from rally_openstack.services.image import cache
+from tests.unit import test
+
+
+PATH = "rally_openstack.services.image.cache"
+
+
+class DownloadTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DownloadTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "image")
+        patcher = mock.patch("%s.requests.get" % PATH)
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _response(self, status_code, chunks):
+        return mock.Mock(status_code=status_code,
+                         iter_content=mock.Mock(return_value=chunks))
+
+    def test_download(self):
+        self.mock_get.return_value = self._response(200, [b"da", b"ta"])
+
+        self.assertEqual(hashlib.sha256(b"data").hexdigest(),
+                         cache.download("http://example.com/a", self.path))
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(b"data", f.read())
+        self.assertEqual(["image"], os.listdir(self.tmp_dir))
+        self.mock_get.assert_called_once_with(
+            "http://example.com/a", stream=True, headers={})
+        self.mock_get.return_value.iter_content.assert_called_once_with(
+            cache._CHUNK_SIZE)
+
+    def test_download_on_complete(self):
+        self.mock_get.return_value = self._response(200, [b"data"])
+        on_complete = mock.Mock(
+            side_effect=lambda digest: self.assertTrue(
+                os.path.isfile(self.path)))
+
+        digest = cache.download("http://example.com/a", self.path,
+                                on_complete=on_complete)
+
+        on_complete.assert_called_once_with(digest)
+
+    def test_download_failed(self):
+        self.mock_get.return_value = self._response(200, [b"da"])
+        self.mock_get.return_value.iter_content.side_effect = IOError()
+
+        self.assertRaises(IOError, cache.download, "http://example.com/a",
+                          self.path)
+        self.assertEqual(["image.part"], os.listdir(self.tmp_dir))
+
+    def test_download_resume(self):
+        with open("%s.part" % self.path, "wb") as f:
+            f.write(b"da")
+        self.mock_get.return_value = self._response(206, [b"ta"])
+
+        self.assertEqual(hashlib.sha256(b"data").hexdigest(),
+                         cache.download("http://example.com/a", self.path,
+                                        checksum="md5:%s" % hashlib.md5(
+                                            b"data").hexdigest()))
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(b"data", f.read())
+        self.mock_get.assert_called_once_with(
+            "http://example.com/a", stream=True,
+            headers={"Range": "bytes=2-"})
+
+    def test_download_resume_not_supported(self):
+        with open("%s.part" % self.path, "wb") as f:
+            f.write(b"xx")
+        self.mock_get.return_value = self._response(200, [b"data"])
+
+        cache.download("http://example.com/a", self.path)
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(b"data", f.read())
+
+    def test_download_resume_range_not_satisfiable(self):
+        with open("%s.part" % self.path, "wb") as f:
+            f.write(b"old data")
+        self.mock_get.side_effect = [self._response(416, []),
+                                     self._response(200, [b"data"])]
+
+        self.assertEqual(hashlib.sha256(b"data").hexdigest(),
+                         cache.download("http://example.com/a", self.path))
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(b"data", f.read())
+        self.assertEqual(
+            [mock.call("http://example.com/a", stream=True,
+                       headers={"Range": "bytes=8-"}),
+             mock.call("http://example.com/a", stream=True, headers={})],
+            self.mock_get.call_args_list)
+
+    def test_download_wrong_checksum(self):
+        self.mock_get.return_value = self._response(200, [b"data"])
+
+        self.assertRaises(exceptions.RallyException, cache.download,
+                          "http://example.com/a", self.path,
+                          checksum="sha256:%s" % ("0" * 64))
+        self.assertEqual([], os.listdir(self.tmp_dir))
+
+    @mock.patch("%s._open_partial" % PATH, return_value=None)
+    def test_download_by_another_process(self, mock__open_partial):
+        self.assertIsNone(cache.download("http://example.com/a", self.path))
+        mock__open_partial.assert_called_once_with("%s.part" % self.path)
+        self.assertFalse(self.mock_get.called)
+
+
+class ImageCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ImageCacheTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        patcher = mock.patch("%s.requests.get" % PATH)
+        self.mock_get = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get.side_effect = lambda url, stream, headers: mock.Mock(
+            status_code=200,
+            iter_content=mock.Mock(return_value=[url.encode("utf-8")] * 2))
+
+    def test_get(self):
+        image_cache = cache.ImageCache(self.path, 1024)
+
+        path = image_cache.get("http://example.com/image")
+
+        with open(path, "rb") as f:
+            self.assertEqual(b"http://example.com/image" * 2, f.read())
+        self.assertEqual(path, image_cache.get("http://example.com/image"))
+        self.mock_get.assert_called_once_with("http://example.com/image",
+                                              stream=True, headers={})
+
+    def test_get_downloaded_by_another_process(self):
+        url = "http://example.com/image"
+        image_cache = cache.ImageCache(self.path, 1024)
+        other_cache = cache.ImageCache(self.path, 1024)
+        real_download = cache.download
+
+        def download(url, path, checksum=None, on_complete=None):
+            if download.waiting:
+                return real_download(url, path, checksum=checksum,
+                                     on_complete=on_complete)
+            # NOTE: another process completes the download while this one
+            #   waits for the lock of the partial file
+            download.waiting = True
+            other_cache.get(url)
+            return None
+
+        download.waiting = False
+        with mock.patch("%s.download" % PATH, side_effect=download):
+            path = image_cache.get(url)
+
+        with open(path, "rb") as f:
+            self.assertEqual(url.encode("utf-8") * 2, f.read())
+        self.assertEqual(1, self.mock_get.call_count)
+
+    def test_get_same_content(self):
+        image_cache = cache.ImageCache(self.path, 1024)
+        self.mock_get.side_effect = lambda url, stream, headers: mock.Mock(
+            status_code=200, iter_content=mock.Mock(return_value=[b"data"]))
+
+        self.assertEqual(image_cache.get("http://example.com/a"),
+                         image_cache.get("http://example.com/b"))
+        self.assertEqual(
+            1, len(os.listdir(os.path.join(self.path, "data"))))
+
+    def test_get_failed(self):
+        image_cache = cache.ImageCache(self.path, 1024)
+        self.mock_get.side_effect = None
+        self.mock_get.return_value.iter_content.side_effect = IOError()
+
+        self.assertRaises(IOError, image_cache.get, "http://example.com/a")
+        self.assertEqual(["partial"], os.listdir(self.path))
+
+    def test_get_checksum(self):
+        image_cache = cache.ImageCache(self.path, 1024)
+        url = "http://example.com/a"
+        checksum = "sha256:%s" % hashlib.sha256(url.encode("utf-8")
+                                                * 2).hexdigest()
+
+        path = image_cache.get(url, checksum=checksum)
+
+        self.assertEqual(path, image_cache.get(url, checksum=checksum))
+        self.assertEqual(1, self.mock_get.call_count)
+        self.assertRaises(exceptions.RallyException, image_cache.get, url,
+                          checksum="sha256:%s" % ("0" * 64))
+        self.assertEqual(2, self.mock_get.call_count)
+
+    def test_get_evicts_least_recently_used(self):
+        url_a = "http://example.com/a"
+        url_b = "http://example.com/b"
+        url_c = "http://example.com/c"
+        image_cache = cache.ImageCache(self.path, len(url_a) * 2 * 2)
+
+        path_a = image_cache.get(url_a)
+        path_b = image_cache.get(url_b)
+        os.utime(path_a, (0, 0))
+        os.utime(path_b, (1, 1))
+        # NOTE: the cache hit makes the image the most recently used one
+        image_cache.get(url_a)
+        path_c = image_cache.get(url_c)
+
+        self.assertTrue(os.path.isfile(path_a))
+        self.assertFalse(os.path.isfile(path_b))
+        self.assertTrue(os.path.isfile(path_c))
+        image_cache.get(url_b)
+        self.assertEqual(4, self.mock_get.call_count)
+
+
+class GetImageLocationTestCase(test.TestCase):
+
+    def setUp(self):
+        super(GetImageLocationTestCase, self).setUp()
+        patcher = mock.patch("%s._CACHE" % PATH)
+        self.mock_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(cache.CONF.clear_override, "image_cache_max_size",
+                        "openstack")
+        cache.CONF.set_override("image_cache_max_size", 1024, "openstack")
+
+    def test_get_image_location(self):
+        self.assertEqual(self.mock_cache.get.return_value,
+                         cache.get_image_location("http://example.com/a"))
+        self.mock_cache.get.assert_called_once_with("http://example.com/a",
+                                                    checksum=None)
+
+    def test_get_image_location_local_file(self):
+        with tempfile.NamedTemporaryFile() as f:
+            self.assertEqual(f.name, cache.get_image_location(f.name))
+        self.assertFalse(self.mock_cache.get.called)
+
+    @mock.patch("%s.CONF" % PATH)
+    def test_get_image_location_disabled(self, mock_conf):
+        mock_conf.openstack.image_cache_max_size = 0
+
+        self.assertEqual("http://example.com/a",
+                         cache.get_image_location("http://example.com/a"))
+        self.assertFalse(self.mock_cache.get.called)
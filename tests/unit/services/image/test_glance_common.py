@@ -68,6 +68,16 @@ class GlanceMixinTestCase(test.TestCase):
         self.glance.images.data.assert_called_once_with(image_id,
                                                         do_checksum=True)
 
+    def test_download_image_data(self):
+        image_id = "image_id"
+        self.glance.images.data.return_value = [b"foo", b"bar"]
+
+        stats = self.service.download_image_data(image_id)
+
+        self.assertEqual(6, stats["bytes"])
+        self.glance.images.data.assert_called_once_with(image_id,
+                                                        do_checksum=False)
+
 
 class FullUnifiedGlance(glance_common.UnifiedGlanceMixin,
                         service.Service):
@@ -91,6 +101,7 @@ class UnifiedGlanceMixinTestCase(test.TestCase):
         class Image(object):
             def __init__(self, visibility=None, is_public=None, status=None):
                 self.id = uuid.uuid4()
+                self.owner = str(uuid.uuid4())
                 self.name = str(uuid.uuid4())
                 self.visibility = visibility
                 self.is_public = is_public
@@ -102,12 +113,14 @@ class UnifiedGlanceMixinTestCase(test.TestCase):
         self.assertIsInstance(unified_image, image.UnifiedImage)
         self.assertEqual(image_obj.id, unified_image.id)
         self.assertEqual(image_obj.visibility, unified_image.visibility)
+        self.assertEqual(image_obj.owner, unified_image.owner)
 
         image_obj = Image(is_public="public")
         del image_obj.visibility
         unified_image = self.service._unify_image(image_obj)
         self.assertEqual(image_obj.id, unified_image.id)
         self.assertEqual(image_obj.is_public, unified_image.visibility)
+        self.assertEqual(image_obj.owner, unified_image.owner)
 
     def test_get_image(self):
         image_id = "image_id"
@@ -125,3 +138,11 @@ class UnifiedGlanceMixinTestCase(test.TestCase):
         self.service.download_image(image_id)
         self.service._impl.download_image.assert_called_once_with(
             image_id, do_checksum=True)
+
+    def test_download_image_data(self):
+        image_id = "image_id"
+        self.assertEqual(
+            self.service._impl.download_image_data.return_value,
+            self.service.download_image_data(image_id, do_checksum=True))
+        self.service._impl.download_image_data.assert_called_once_with(
+            image_id, do_checksum=True)
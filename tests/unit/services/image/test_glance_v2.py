@@ -141,6 +141,20 @@ class GlanceV2ServiceTestCase(test.TestCase):
             image_id,
             visibility=visibility)
 
+    def test_add_member(self):
+        member = self.service.add_member("image_id", member_id="project_id")
+
+        self.assertEqual(self.gc.image_members.create.return_value, member)
+        self.gc.image_members.create.assert_called_once_with("image_id",
+                                                             "project_id")
+
+    def test_update_member_status(self):
+        self.service.update_member_status("image_id",
+                                          member_id="project_id")
+
+        self.gc.image_members.update.assert_called_once_with(
+            "image_id", "project_id", "accepted")
+
     def test_deactivate_image(self):
         image_id = "image_id"
         self.service.deactivate_image(image_id)
@@ -108,6 +108,13 @@ class ImageTestCase(test.TestCase):
         service._impl.download_image.assert_called_once_with(image_id,
                                                              do_checksum=True)
 
+    def test_download_image_data(self):
+        image_id = "image_id"
+        service = self.get_service_with_fake_impl()
+        service.download_image_data(image=image_id)
+        service._impl.download_image_data.assert_called_once_with(
+            image_id, do_checksum=False)
+
     def test_is_applicable(self):
         clients = mock.Mock()
 
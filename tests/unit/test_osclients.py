@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime as dt
+
 import ddt
 import mock
 
@@ -160,6 +162,8 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
 
     def setUp(self):
         super(TestCreateKeystoneClient, self).setUp()
+        mock.patch.dict(osclients._DISCOVERED_KEYSTONE_VERSIONS,
+                        clear=True).start()
         self.credential = oscredential.OpenStackCredential(
             "http://auth_url/v2.0", "user", "pass", "tenant")
 
@@ -256,6 +260,92 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
              mock.call(auth=self.ksa_identity_plugin, timeout=180.0,
                        verify=True, cert=None)])
 
+    def test_keystone_get_session_discovers_once(self):
+        self.set_up_keystone_mocks()
+        version_data = mock.Mock(return_value=[{"version": (3, 0)}])
+        self.ksa_auth.discover.Discover.return_value = (
+            mock.Mock(version_data=version_data))
+
+        for username in ("user1", "user2"):
+            credential = oscredential.OpenStackCredential(
+                "http://auth_url/", username, "pass", "tenant")
+            osclients.Keystone(credential, {}, {}).get_session()
+
+        self.ksa_auth.discover.Discover.assert_called_once_with(
+            self.ksa_session.Session.return_value, "http://auth_url/")
+        self.assertEqual({"http://auth_url/": "3"},
+                         osclients.get_discovered_keystone_versions())
+        self.assertEqual(3, self.ksa_session.Session.call_count)
+        self.assertIn("user_domain_name", self.ksa_password.call_args[1])
+
+    def test_keystone_get_session_with_discovered_version(self):
+        self.set_up_keystone_mocks()
+        osclients.update_discovered_keystone_versions(
+            {"http://auth_url/": "2"})
+        credential = oscredential.OpenStackCredential(
+            "http://auth_url/", "user", "pass", "tenant")
+
+        osclients.Keystone(credential, {}, {}).get_session()
+
+        self.assertFalse(self.ksa_auth.discover.Discover.called)
+        self.ksa_password.assert_called_once_with(
+            auth_url="http://auth_url/", password="pass",
+            tenant_name="tenant", username="user")
+
+    @mock.patch("keystoneauth1.session.Session")
+    def test_keystone_get_session_with_token(self, mock_session):
+        expires_at = dt.datetime.utcnow() + dt.timedelta(hours=1)
+        token = {"auth_token": "token_id",
+                 "expires_at": expires_at.isoformat(),
+                 "body": {"token": {
+                     "expires_at": expires_at.isoformat() + "Z",
+                     "user": {"id": "user_id"},
+                     "project": {"id": "project_id"}}}}
+        keystone = osclients.Keystone(self.credential, {},
+                                      {"keystone_token": token})
+
+        sess, plugin = keystone.get_session()
+
+        self.assertEqual(mock_session.return_value, sess)
+        self.assertEqual("token_id", plugin.auth_ref.auth_token)
+        self.assertEqual("project_id", plugin.auth_ref.project_id)
+        self.assertEqual(self.credential.auth_url, plugin.auth_url)
+        mock_session.assert_called_once_with(auth=plugin, timeout=180.0,
+                                             verify=True, cert=None)
+
+    @ddt.data({"lifetime": 3600, "usable": True},
+              {"lifetime": 60, "usable": False})
+    @ddt.unpack
+    def test__load_token(self, lifetime, usable):
+        expires_at = (dt.datetime.utcnow()
+                      + dt.timedelta(seconds=lifetime))
+        token = {"auth_token": "token_id",
+                 "expires_at": expires_at.isoformat(),
+                 "body": {"token": {
+                     "expires_at": expires_at.isoformat() + "Z"}}}
+        keystone = osclients.Keystone(self.credential, {},
+                                      {"keystone_token": token})
+
+        auth_ref = keystone._load_token()
+
+        if usable:
+            self.assertEqual("token_id", auth_ref.auth_token)
+        else:
+            self.assertIsNone(auth_ref)
+        self.assertIsNone(osclients.Keystone(self.credential, {},
+                                             {})._load_token())
+
+    @mock.patch("%s.Keystone.auth_ref" % PATH)
+    def test_dump_token(self, mock_keystone_auth_ref):
+        mock_keystone_auth_ref.expires = dt.datetime(2019, 1, 1)
+        keystone = osclients.Keystone(self.credential, {}, {})
+
+        self.assertEqual(
+            {"auth_token": mock_keystone_auth_ref.auth_token,
+             "expires_at": "2019-01-01T00:00:00",
+             "body": mock_keystone_auth_ref._data},
+            keystone.dump_token())
+
     def test_keystone_property(self):
         keystone = osclients.Keystone(self.credential, None, None)
         self.assertRaises(exceptions.RallyException, lambda: keystone.keystone)
@@ -401,6 +491,8 @@ class OSClientsTestCase(test.TestCase):
 
     def setUp(self):
         super(OSClientsTestCase, self).setUp()
+        mock.patch.dict(osclients._DISCOVERED_KEYSTONE_VERSIONS,
+                        clear=True).start()
         self.credential = oscredential.OpenStackCredential(
             "http://auth_url/v2.0", "user", "pass", "tenant")
         self.clients = osclients.Clients(self.credential, {})
@@ -418,6 +510,12 @@ class OSClientsTestCase(test.TestCase):
         self.service_catalog = self.auth_ref.service_catalog
         self.service_catalog.url_for = mock.MagicMock()
 
+    def test_init_with_token(self):
+        clients = osclients.Clients(self.credential, token={"foo": "bar"})
+
+        self.assertEqual({"keystone_token": {"foo": "bar"}}, clients.cache)
+        self.assertEqual(clients.cache, clients.keystone.cache)
+
     def test_create_from_env(self):
         with mock.patch.dict("os.environ",
                              {"OS_AUTH_URL": "foo_auth_url",
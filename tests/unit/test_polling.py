@@ -0,0 +1,393 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+import threading
+import time
+
+import mock
+from novaclient.v2 import servers
+
+from rally.common import cfg
+
+from rally_openstack import polling
+from tests.unit import test
+
+
+CONF = cfg.CONF
+
+
+class PollingStrategyTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PollingStrategyTestCase, self).setUp()
+        polling.DURATIONS.clear()
+        self.addCleanup(polling.DURATIONS.clear)
+        CONF.set_override("poll_jitter", 0, "openstack")
+        self.addCleanup(CONF.clear_override, "poll_jitter", "openstack")
+
+    def _intervals(self, name, action="nova.boot_server", check_interval=2,
+                   workload="w1"):
+        strategy = polling.PollingStrategy.get(name, platform="openstack")
+        return list(itertools.islice(
+            strategy(action, check_interval, workload=workload).intervals(),
+            5))
+
+    def test_fixed(self):
+        self.assertEqual([2, 2, 2, 2, 2], self._intervals("fixed"))
+
+    def test_exponential(self):
+        self.assertEqual([0.25, 0.5, 1.0, 2, 2],
+                         self._intervals("exponential"))
+
+    @mock.patch("rally_openstack.polling.random.uniform", return_value=0.1)
+    def test_exponential_jitter(self, mock_uniform):
+        CONF.set_override("poll_jitter", 0.2, "openstack")
+
+        self.assertEqual(0.225, self._intervals("exponential")[0])
+        mock_uniform.assert_called_with(0, 0.2)
+
+    def test_learned(self):
+        self.assertEqual([0.25, 0.5, 1.0, 2, 2], self._intervals("learned"))
+
+        for duration in (5, 1, 30):
+            polling.DURATIONS.add("w1", "nova.boot_server", duration)
+
+        self.assertEqual([5, 0.25, 0.5, 1.0, 2], self._intervals("learned"))
+        self.assertEqual([0.25, 0.5, 1.0, 2, 2],
+                         self._intervals("learned", action="nova.reboot"))
+        self.assertEqual([0.25, 0.5, 1.0, 2, 2],
+                         self._intervals("learned", workload="w2"))
+
+    def test_durations_window(self):
+        CONF.set_override("poll_learned_window", 3, "openstack")
+        self.addCleanup(CONF.clear_override, "poll_learned_window",
+                        "openstack")
+        for duration in (100, 100, 1, 2, 3):
+            polling.DURATIONS.add("w1", "foo", duration)
+
+        self.assertEqual(2, polling.DURATIONS.median("w1", "foo"))
+
+
+class WaitForStatusTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WaitForStatusTestCase, self).setUp()
+        polling.DURATIONS.clear()
+        self.addCleanup(polling.DURATIONS.clear)
+        self.timer = mock.Mock(context={"owner_id": "w1"}, _atomic_actions=[
+            {"name": "nova.list_servers", "children": [],
+             "finished_at": 1},
+            {"name": "nova.boot_and_delete", "children": [
+                {"name": "nova.boot_server", "children": []}]}])
+
+    def _set_strategy(self, name):
+        CONF.set_override("nova_poll_strategy", name, "openstack")
+        self.addCleanup(CONF.clear_override, "nova_poll_strategy",
+                        "openstack")
+
+    def test__current_workload(self):
+        self.assertEqual("w1", polling._current_workload(self.timer))
+
+        class Scenario(object):
+            context = {"owner_id": "w2"}
+
+            def generate_random_name(self):
+                pass
+
+        service = mock.Mock(spec=["_name_generator"],
+                            _name_generator=Scenario().generate_random_name)
+        self.assertEqual("w2", polling._current_workload(service))
+        self.assertIsNone(polling._current_workload(mock.Mock()))
+
+    def test__current_action(self):
+        self.assertEqual("nova.boot_and_delete.nova.boot_server",
+                         polling._current_action(self.timer._atomic_actions))
+        self.assertIsNone(polling._current_action(
+            self.timer._atomic_actions[:1]))
+        self.assertIsNone(polling._current_action(None))
+
+    @mock.patch("rally_openstack.polling.utils.wait_for_status")
+    def test_wait_for_status_fixed(self, mock_wait_for_status):
+        update_resource = mock.Mock()
+
+        result = polling.wait_for_status(
+            self.timer, "nova", "server", ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+
+        self.assertEqual(mock_wait_for_status.return_value, result)
+        mock_wait_for_status.assert_called_once_with(
+            "server", ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+        self.assertIsNone(polling.DURATIONS.median(
+            "w1", "nova.boot_and_delete.nova.boot_server"))
+
+    @mock.patch("rally_openstack.polling.time")
+    @mock.patch("rally_openstack.polling.utils.wait_for_status")
+    def test_wait_for_status_exponential(self, mock_wait_for_status,
+                                         mock_time):
+        self._set_strategy("exponential")
+        CONF.set_override("poll_jitter", 0, "openstack")
+        self.addCleanup(CONF.clear_override, "poll_jitter", "openstack")
+        mock_time.time.return_value = 0
+        update_resource = mock.Mock()
+
+        def fake_wait_for_status(resource, update_resource, **kwargs):
+            for i in range(3):
+                resource = update_resource(resource)
+            return resource
+
+        mock_wait_for_status.side_effect = fake_wait_for_status
+
+        result = polling.wait_for_status(
+            self.timer, "nova", "server", ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+
+        self.assertEqual(update_resource.return_value, result)
+        mock_wait_for_status.assert_called_once_with(
+            "server", ready_statuses=["ACTIVE"], update_resource=mock.ANY,
+            timeout=10, check_interval=0)
+        self.assertEqual([mock.call(0.25), mock.call(0.5)],
+                         mock_time.sleep.call_args_list)
+        self.assertEqual(3, update_resource.call_count)
+        self.assertEqual(0, polling.DURATIONS._samples[
+            ("w1", "nova.boot_and_delete.nova.boot_server")][0])
+
+    @mock.patch("rally_openstack.polling.time")
+    @mock.patch("rally_openstack.polling.utils.wait_for_status")
+    def test_wait_for_status_respects_timeout(self, mock_wait_for_status,
+                                              mock_time):
+        self._set_strategy("learned")
+        for duration in (20, 20, 20):
+            polling.DURATIONS.add(
+                "w1", "nova.boot_and_delete.nova.boot_server", duration)
+        mock_time.time.side_effect = [0, 4, 5]
+
+        def fake_wait_for_status(resource, update_resource, **kwargs):
+            update_resource(resource)
+            update_resource(resource, id_attr="uuid")
+
+        mock_wait_for_status.side_effect = fake_wait_for_status
+        update_resource = mock.Mock()
+
+        polling.wait_for_status(
+            self.timer, "nova", "server", ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+
+        mock_time.sleep.assert_called_once_with(6)
+        update_resource.assert_has_calls([mock.call("server"),
+                                          mock.call("server", id_attr="uuid")])
+
+
+class SharedPollerTestCase(test.TestCase):
+
+    def _resource(self, id, status="BUILD", updated=None):
+        return mock.Mock(id=id, status=status, updated=updated)
+
+    def test_get(self):
+        listing = mock.Mock()
+        listing.changed_at.side_effect = lambda r: r.updated
+        poller = polling.SharedPoller(listing)
+        r1 = self._resource("r1", updated="2019-01-02")
+        r2 = self._resource("r2", updated="2019-01-01")
+        poller.register(r1)
+        poller.register(r2)
+        r1_active = self._resource("r1", status="ACTIVE")
+        listing.list_changes.return_value = [r1_active,
+                                             self._resource("other")]
+
+        self.assertEqual((r1_active, True), poller.get(r1, 0))
+        listing.list_changes.assert_called_once_with(r1, "2019-01-01")
+
+        listing.list_changes.reset_mock()
+        self.assertEqual((r2, False), poller.get(r2, 0))
+        self.assertFalse(listing.list_changes.called)
+
+        r2_active = self._resource("r2", status="ACTIVE")
+        poller.update(r2_active)
+        self.assertEqual((r2_active, False), poller.get(r2, 0))
+
+        poller.unregister(r1)
+        poller.unregister(r2)
+        self.assertEqual({}, poller._pending)
+
+    @mock.patch("rally_openstack.polling.time.time", return_value=42)
+    def test_get_without_timestamps(self, mock_time):
+        listing = mock.Mock()
+        listing.changed_at.side_effect = lambda r: r.updated
+        listing.format_time.return_value = "2019-01-01"
+        listing.list_changes.return_value = []
+        poller = polling.SharedPoller(listing)
+        r1 = self._resource("r1", updated="2019-01-02")
+        r2 = self._resource("r2")
+        poller.register(r1)
+        poller.register(r2)
+
+        self.assertEqual((r2, False), poller.get(r2, 0))
+        listing.format_time.assert_called_once_with(42)
+        listing.list_changes.assert_called_once_with(r2, "2019-01-01")
+
+    def test_get_failed_listing(self):
+        listing = mock.Mock()
+        listing.changed_at.return_value = "2019-01-01"
+        listing.list_changes.side_effect = [Exception("foo"), []]
+        poller = polling.SharedPoller(listing)
+        r1 = self._resource("r1")
+        poller.register(r1)
+
+        self.assertRaises(Exception, poller.get, r1, 0)
+        self.assertEqual((r1, False), poller.get(r1, 0))
+        self.assertEqual(2, listing.list_changes.call_count)
+
+    def test_get_shares_listing(self):
+        listing = mock.Mock()
+        listing.changed_at.return_value = "2019-01-01"
+        started = threading.Event()
+        release = threading.Event()
+
+        def list_changes(resource, since):
+            started.set()
+            release.wait(5)
+            return []
+
+        listing.list_changes.side_effect = list_changes
+        poller = polling.SharedPoller(listing)
+        r1 = self._resource("r1")
+        r2 = self._resource("r2")
+        poller.register(r1)
+        poller.register(r2)
+        not_before = time.time()
+        results = {}
+        leader = threading.Thread(
+            target=lambda: results.setdefault("r1", poller.get(r1, 0)))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(
+            target=lambda: results.setdefault("r2",
+                                              poller.get(r2, not_before)))
+        follower.start()
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual({"r1": (r1, False), "r2": (r2, False)}, results)
+        listing.list_changes.assert_called_once_with(r1, "2019-01-01")
+
+
+class SharedPollingTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SharedPollingTestCase, self).setUp()
+        CONF.set_override("nova_shared_polling", True, "openstack")
+        self.addCleanup(CONF.clear_override, "nova_shared_polling",
+                        "openstack")
+        self.addCleanup(polling._SHARED_POLLERS.clear)
+
+    def test__nova_servers_listing(self):
+        listing = polling.SHARED_LISTINGS["nova"]
+        manager = mock.Mock()
+        manager.api.client.get_project_id.return_value = "t1"
+        server = servers.Server(manager, {"id": "s1",
+                                          "updated": "2019-01-01"})
+
+        self.assertTrue(listing.matches(server))
+        self.assertFalse(listing.matches(mock.Mock()))
+        self.assertEqual("t1", listing.key(server))
+        self.assertEqual("2019-01-01", listing.changed_at(server))
+        self.assertEqual("2018-12-31", listing.changed_at(
+            servers.Server(manager, {"id": "s2", "created": "2018-12-31"})))
+        self.assertIsNone(listing.changed_at(servers.Server(manager,
+                                                            {"id": "s3"})))
+        self.assertEqual("1970-01-02T00:00:00Z",
+                         listing.format_time(24 * 60 * 60))
+        self.assertFalse(listing.is_deleted(server))
+        self.assertTrue(listing.is_deleted(
+            servers.Server(manager, {"id": "s1", "status": "DELETED"})))
+        self.assertFalse(manager.get.called)
+        self.assertEqual(server.manager.list.return_value,
+                         listing.list_changes(server, "2019-01-01"))
+        server.manager.list.assert_called_once_with(
+            search_opts={"changes-since": "2019-01-01"}, limit=-1)
+
+        server.manager.list.reset_mock()
+        listing.list_changes(server, None)
+        server.manager.list.assert_called_once_with(search_opts={},
+                                                    limit=-1)
+
+    @mock.patch("rally_openstack.polling.utils.wait_for_status")
+    def test_wait_for_status(self, mock_wait_for_status):
+        own_manager = mock.Mock()
+        own_manager.api.client.get_project_id.return_value = "t1"
+        other_manager = mock.Mock()
+        server = servers.Server(own_manager, {"id": "s1", "status": "BUILD"})
+        own_manager.list.return_value = [
+            servers.Server(other_manager, {"id": "s1", "tenant_id": "t1",
+                                           "status": "ACTIVE"})]
+        update_resource = mock.Mock()
+
+        def fake_wait_for_status(resource, update_resource, **kwargs):
+            return update_resource(resource)
+
+        mock_wait_for_status.side_effect = fake_wait_for_status
+
+        result = polling.wait_for_status(
+            mock.Mock(), "nova", server, ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+
+        self.assertEqual("ACTIVE", result.status)
+        self.assertEqual(own_manager, result.manager)
+        self.assertFalse(update_resource.called)
+        mock_wait_for_status.assert_called_once_with(
+            server, ready_statuses=["ACTIVE"], update_resource=mock.ANY,
+            timeout=10, check_interval=0)
+        self.assertEqual({}, polling._SHARED_POLLERS[("nova", "t1")]._pending)
+
+    @mock.patch("rally_openstack.polling.utils.wait_for_status")
+    def test_wait_for_status_missing_or_deleted(self, mock_wait_for_status):
+        manager = mock.Mock()
+        manager.api.client.get_project_id.return_value = "t1"
+        server = servers.Server(manager, {"id": "s1", "status": "ACTIVE"})
+        manager.list.side_effect = [
+            [],
+            [servers.Server(manager, {"id": "s1", "status": "DELETED"})]]
+        fresh = servers.Server(manager, {"id": "s1", "status": "ACTIVE",
+                                         "updated": "2019-01-01"})
+        update_resource = mock.Mock(side_effect=[fresh, Exception("404")])
+
+        def fake_wait_for_status(resource, update_resource, **kwargs):
+            self.assertEqual(fresh, update_resource(resource))
+            self.assertRaises(Exception, update_resource, resource)
+
+        mock_wait_for_status.side_effect = fake_wait_for_status
+
+        polling.wait_for_status(
+            mock.Mock(), "nova", server, check_deletion=True,
+            update_resource=update_resource, timeout=10, check_interval=0)
+
+        self.assertEqual(2, update_resource.call_count)
+        self.assertEqual("2019-01-01", manager.list.call_args_list[1][1][
+            "search_opts"]["changes-since"])
+
+    @mock.patch("rally_openstack.polling.utils.wait_for_status")
+    def test_wait_for_status_not_server(self, mock_wait_for_status):
+        update_resource = mock.Mock()
+
+        polling.wait_for_status(
+            mock.Mock(), "nova", "image", ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+
+        mock_wait_for_status.assert_called_once_with(
+            "image", ready_statuses=["ACTIVE"],
+            update_resource=update_resource, timeout=10, check_interval=3)
+        self.assertEqual({}, polling._SHARED_POLLERS)
@@ -73,7 +73,20 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"]["foo"],
                          scenario.context["tenant"])
 
-        self.osclients.mock.assert_called_once_with(user["credential"])
+        self.osclients.mock.assert_called_once_with(user["credential"],
+                                                    token=None)
+
+    def test_init_user_context_with_token(self):
+        user = {"id": "u1", "credential": mock.Mock(), "tenant_id": "foo"}
+        self.context["users"] = [user]
+        self.context["users_tokens"] = {"u1": {"auth_token": "token"}}
+        self.context["tenants"] = {"foo": {"name": "bar"}}
+        self.context["user_choice_method"] = "random"
+
+        base_scenario.OpenStackScenario(self.context)
+
+        self.osclients.mock.assert_called_once_with(
+            user["credential"], token={"auth_token": "token"})
 
     def test_init_clients(self):
         scenario = base_scenario.OpenStackScenario(self.context,
@@ -122,6 +135,105 @@ class OpenStackScenarioTestCase(test.TestCase):
             self.assertFalse(mock_profiler_init.called)
             self.assertFalse(mock_profiler_get.called)
 
+    def _init_sampled_scenarios(self, sampling, iterations, **opts):
+        class Scenario(base_scenario.OpenStackScenario):
+            def run(self):
+                pass
+
+        traced = []
+        with mock.patch("rally_openstack.scenario.CONF.openstack") as cfg:
+            cfg.enable_profiler = True
+            cfg.profiler_sampling = sampling
+            for name, value in opts.items():
+                setattr(cfg, name, value)
+            for iteration, user in iterations:
+                self.context.update(
+                    {"iteration": iteration,
+                     "user": {"id": user,
+                              "credential": CREDENTIAL_WITH_HMAC}})
+                scenario = Scenario(self.context)
+                if scenario._output["complete"]:
+                    traced.append(iteration)
+        return traced
+
+    @mock.patch("rally_openstack.scenario.profiler")
+    def test_profiler_init_every_nth(self, mock_profiler):
+        traced = self._init_sampled_scenarios(
+            "every_nth", [(i, "u1") for i in range(1, 8)],
+            profiler_sample_every=3)
+
+        self.assertEqual([1, 4, 7], traced)
+        self.assertEqual(3, mock_profiler.init.call_count)
+
+    @mock.patch("rally_openstack.scenario.random.random")
+    @mock.patch("rally_openstack.scenario.profiler")
+    def test_profiler_init_random(self, mock_profiler, mock_random):
+        mock_random.side_effect = [0.5, 0.05, 0.2, 0.09]
+
+        traced = self._init_sampled_scenarios(
+            "random", [(i, "u1") for i in range(1, 5)],
+            profiler_sample_fraction=0.1)
+
+        self.assertEqual([2, 4], traced)
+        self.assertEqual(2, mock_profiler.init.call_count)
+
+    @mock.patch.dict("rally_openstack.scenario._PROFILER_USER_SAMPLES",
+                     clear=True)
+    @mock.patch("rally_openstack.scenario.profiler")
+    def test_profiler_init_first_per_user(self, mock_profiler):
+        traced = self._init_sampled_scenarios(
+            "first_per_user",
+            [(1, "u1"), (2, "u2"), (3, "u1"), (4, "u1"), (5, "u2")],
+            profiler_sample_per_user=2)
+
+        self.assertEqual([1, 2, 3, 5], traced)
+        self.assertEqual(4, mock_profiler.init.call_count)
+
+    @mock.patch("rally_openstack.scenario._is_slow_iteration")
+    @mock.patch("rally_openstack.scenario.profiler")
+    def test_profiler_init_slow(self, mock_profiler, mock__is_slow_iteration):
+        class Scenario(base_scenario.OpenStackScenario):
+            def run(self, arg):
+                return arg
+
+        self.context.update({"iteration": 1,
+                             "user": {"id": "u1",
+                                      "credential": CREDENTIAL_WITH_HMAC}})
+        with mock.patch("rally_openstack.scenario.CONF.openstack") as cfg:
+            cfg.enable_profiler = True
+            cfg.profiler_sampling = "slow"
+            slow = Scenario(self.context)
+            fast = Scenario(self.context)
+
+        mock__is_slow_iteration.return_value = True
+        self.assertEqual("foo", slow.run("foo"))
+        self.assertEqual(1, len(slow._output["complete"]))
+        mock__is_slow_iteration.return_value = False
+        self.assertEqual("foo", fast.run("foo"))
+        self.assertEqual([], fast._output["complete"])
+        self.assertEqual(2, mock_profiler.init.call_count)
+        mock__is_slow_iteration.assert_called_with(self.context["owner_id"],
+                                                   mock.ANY)
+
+    @mock.patch.dict("rally_openstack.scenario._PROFILER_DURATIONS",
+                     clear=True)
+    @mock.patch("rally_openstack.scenario.CONF.openstack")
+    def test__is_slow_iteration(self, mock_cfg):
+        mock_cfg.profiler_sample_percentile = 90
+
+        # not enough iterations to calculate the percentile
+        for i in range(10):
+            self.assertTrue(base_scenario._is_slow_iteration("w", 1))
+        for i in range(90):
+            base_scenario._is_slow_iteration("w", 1)
+        self.assertFalse(base_scenario._is_slow_iteration("w", 0.5))
+        self.assertTrue(base_scenario._is_slow_iteration("w", 1))
+        self.assertTrue(base_scenario._is_slow_iteration("another", 0.1))
+
+    def test_profiler_sampling_unknown(self):
+        self.assertRaises(ValueError, base_scenario.CONF.set_override,
+                          "profiler_sampling", "every-nth", "openstack")
+
     def test__choose_user_random(self):
         users = [{"credential": mock.Mock(), "tenant_id": "foo"}
                  for _ in range(5)]
@@ -169,3 +281,65 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
         self.assertEqual(expected_tenant_id, tenant_id)
+
+    @ddt.data((1, "0", "bar"),
+              (2, "0", "foo"),
+              (3, "1", "bar"),
+              (4, "1", "foo"),
+              (5, "0", "bar"),
+              (6, "0", "foo"),
+              (7, "1", "bar"),
+              (8, "1", "foo"))
+    @ddt.unpack
+    def test__choose_user_round_robin_index(self, iteration,
+                                            expected_user_id,
+                                            expected_tenant_id):
+        self.context["iteration"] = iteration
+        self.context["user_choice_method"] = "round_robin"
+        self.context["tenants"] = {}
+        index = []
+        for tid in ("bar", "foo"):
+            users = [{"id": str(i), "tenant_id": tid} for i in range(2)]
+            # the index is used instead of users lists of tenants
+            self.context["tenants"][tid] = {"name": tid}
+            index.append((tid, tuple(users)))
+        self.context["users_round_robin"] = tuple(index)
+
+        scenario = base_scenario.OpenStackScenario()
+        with mock.patch("%s.sorted" % base_scenario.__name__,
+                        create=True) as mock_sorted:
+            scenario._choose_user(self.context)
+        self.assertFalse(mock_sorted.called)
+        self.assertEqual(expected_user_id, self.context["user"]["id"])
+        tenant_id = self.context["user"]["tenant_id"]
+        self.assertEqual(expected_tenant_id, tenant_id)
+        self.assertEqual(self.context["tenants"][tenant_id],
+                         self.context["tenant"])
+
+    def test__choose_user_round_robin_sorts_only_without_index(self):
+        tenants = dict(("tenant_%d" % i,
+                        {"users": [{"id": "user_%d" % i,
+                                    "tenant_id": "tenant_%d" % i}]})
+                       for i in range(50))
+        index = tuple((tenant_id, tuple(tenants[tenant_id]["users"]))
+                      for tenant_id in sorted(tenants))
+        scenario = base_scenario.OpenStackScenario()
+
+        def run(context, iterations=100):
+            chosen = []
+            with mock.patch("%s.sorted" % base_scenario.__name__,
+                            create=True, side_effect=sorted) as mock_sorted:
+                for i in range(1, iterations + 1):
+                    context["iteration"] = i
+                    scenario._choose_user(context)
+                    chosen.append(context["user"]["id"])
+            return chosen, mock_sorted.call_count
+
+        context = {"user_choice_method": "round_robin", "tenants": tenants}
+        without_index, sorted_count = run(context)
+        self.assertEqual(100, sorted_count)
+
+        context["users_round_robin"] = index
+        with_index, sorted_count = run(context)
+        self.assertEqual(0, sorted_count)
+        self.assertEqual(without_index, with_index)
@@ -0,0 +1,75 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+
+import mock
+
+from rally_openstack import streaming
+from tests.unit import test
+
+
+class StreamingTestCase(test.TestCase):
+
+    @mock.patch("rally_openstack.streaming.time.time")
+    def test_consume_iterable(self, mock_time):
+        mock_time.side_effect = [1.5, 3]
+
+        stats = streaming.consume([b"", b"foo", b"bar"], 1, checksum="md5")
+
+        self.assertEqual(
+            {"bytes": 6, "first_byte": 0.5, "duration": 2,
+             "throughput": 6 / 2.0 / 1024 / 1024,
+             "checksum": "3858f62230ac3c915f300c664312c63f"},
+            stats)
+
+    def test_consume_file(self):
+        body = io.BytesIO(b"x" * 10)
+        body.readinto = mock.Mock(side_effect=body.readinto)
+
+        stats = streaming.consume(body, 0, chunk_size=4)
+
+        self.assertEqual(10, stats["bytes"])
+        self.assertIsNone(stats["checksum"])
+        # 3 chunks and the end of the data
+        self.assertEqual(4, body.readinto.call_count)
+        buffers = set(id(c[0][0].obj) for c in body.readinto.call_args_list)
+        self.assertEqual(1, len(buffers))
+
+    @mock.patch("rally_openstack.streaming.time.time")
+    def test_consume_empty(self, mock_time):
+        mock_time.return_value = 2
+
+        stats = streaming.consume([], 1)
+
+        self.assertEqual({"bytes": 0, "first_byte": 1, "duration": 1,
+                          "throughput": 0, "checksum": None}, stats)
+
+    def test_merge(self):
+        stats = streaming.merge([
+            {"bytes": 1024 * 1024, "first_byte": 1, "duration": 2},
+            {"bytes": 1024 * 1024, "first_byte": 3, "duration": 2}])
+
+        self.assertEqual({"bytes": 2 * 1024 * 1024, "first_byte": 2,
+                          "duration": 4, "throughput": 0.5,
+                          "checksum": None}, stats)
+
+    def test_get_output(self):
+        output = streaming.get_output(
+            "foo", {"bytes": 1024 * 1024, "first_byte": 1, "throughput": 3})
+
+        self.assertEqual("foo", output["title"])
+        self.assertEqual("StatsTable", output["chart_plugin"])
+        self.assertEqual([["Size, MB", 1.0], ["Time to first byte, sec", 1],
+                          ["Throughput, MB/s", 3]], output["data"])
@@ -67,9 +67,10 @@ class TempestContextTestCase(test.TestCase):
         self.context.conf.add_section("orchestration")
         self.context.conf.add_section("scenario")
 
+    @mock.patch("%s.os.rename" % PATH)
     @mock.patch("six.moves.builtins.open", side_effect=mock.mock_open(),
                 create=True)
-    def test__download_image_from_glance(self, mock_open):
+    def test__download_image_from_glance(self, mock_open, mock_rename):
         self.mock_isfile.return_value = False
         img_path = os.path.join(self.context.data_dir, "foo")
         img = mock.MagicMock()
@@ -77,41 +78,73 @@ class TempestContextTestCase(test.TestCase):
         glanceclient.images.data.return_value = "data"
 
         self.context._download_image_from_source(img_path, img)
-        mock_open.assert_called_once_with(img_path, "wb")
+        mock_open.assert_called_once_with("%s.part" % img_path, "wb")
         glanceclient.images.data.assert_called_once_with(img.id)
         mock_open().write.assert_has_calls([mock.call("d"),
                                             mock.call("a"),
                                             mock.call("t"),
                                             mock.call("a")])
+        mock_rename.assert_called_once_with("%s.part" % img_path, img_path)
 
-    @mock.patch("six.moves.builtins.open", side_effect=mock.mock_open())
-    @mock.patch("requests.get", return_value=mock.MagicMock(status_code=200))
-    def test__download_image_from_url_success(self, mock_get, mock_open):
+    def _enable_image_cache(self):
+        self.addCleanup(CONF.clear_override, "image_cache_max_size",
+                        "openstack")
+        CONF.set_override("image_cache_max_size", 1024, "openstack")
+
+    @mock.patch("%s.image_cache" % PATH)
+    def test__download_image_from_url_success(self, mock_image_cache):
         self.mock_isfile.return_value = False
         img_path = os.path.join(self.context.data_dir, "foo")
-        mock_get.return_value.iter_content.return_value = "data"
 
         self.context._download_image_from_source(img_path)
-        mock_get.assert_called_once_with(CONF.openstack.img_url, stream=True)
-        mock_open.assert_called_once_with(img_path, "wb")
-        mock_open().write.assert_has_calls([mock.call("d"),
-                                            mock.call("a"),
-                                            mock.call("t"),
-                                            mock.call("a")])
+        mock_image_cache.download.assert_called_once_with(
+            CONF.openstack.img_url, img_path, checksum=None)
+        self.assertFalse(mock_image_cache.get_image_location.called)
+
+    @mock.patch("%s.shutil.copyfile" % PATH)
+    @mock.patch("%s.os" % PATH)
+    @mock.patch("%s.image_cache" % PATH)
+    def test__download_image_from_url_cached(self, mock_image_cache, mock_os,
+                                             mock_copyfile):
+        img_path = os.path.join(self.context.data_dir, "foo")
+        part_path = "%s.part" % img_path
+        mock_os.path.exists.return_value = False
+        cached_path = mock_image_cache.get_image_location.return_value
+        self._enable_image_cache()
+
+        self.context._download_image_from_source(img_path)
+        mock_image_cache.get_image_location.assert_called_once_with(
+            CONF.openstack.img_url, checksum=None)
+        mock_os.link.assert_called_once_with(cached_path, part_path)
+        self.assertFalse(mock_copyfile.called)
+        mock_os.rename.assert_called_once_with(part_path, img_path)
+
+        mock_os.reset_mock()
+        mock_os.link.side_effect = OSError()
+
+        self.context._download_image_from_source(img_path)
+        mock_copyfile.assert_called_once_with(cached_path, part_path)
+        mock_os.rename.assert_called_once_with(part_path, img_path)
 
-    @mock.patch("requests.get")
+    @mock.patch("%s.image_cache" % PATH)
     @ddt.data(404, 500)
-    def test__download_image_from_url_failure(self, status_code, mock_get):
+    def test__download_image_from_url_failure(self, status_code,
+                                              mock_image_cache):
         self.mock_isfile.return_value = False
-        mock_get.return_value = mock.MagicMock(status_code=status_code)
+        self._enable_image_cache()
+        mock_image_cache.get_image_location.side_effect = (
+            requests.HTTPError(response=mock.Mock(status_code=status_code)))
         self.assertRaises(exceptions.RallyException,
                           self.context._download_image_from_source,
                           os.path.join(self.context.data_dir, "foo"))
 
-    @mock.patch("requests.get", side_effect=requests.ConnectionError())
+    @mock.patch("%s.image_cache" % PATH)
     def test__download_image_from_url_connection_error(
-            self, mock_requests_get):
+            self, mock_image_cache):
         self.mock_isfile.return_value = False
+        self._enable_image_cache()
+        mock_image_cache.get_image_location.side_effect = (
+            requests.ConnectionError())
         self.assertRaises(exceptions.RallyException,
                           self.context._download_image_from_source,
                           os.path.join(self.context.data_dir, "foo"))
@@ -168,11 +201,13 @@ class TempestContextTestCase(test.TestCase):
         image = self.context._discover_image()
         self.assertEqual("CirrOS", image.name)
 
+    @mock.patch("%s.os.rename" % PATH)
     @mock.patch("six.moves.builtins.open", side_effect=mock.mock_open(),
                 create=True)
     @mock.patch("rally_openstack.services.image.image.Image")
     @mock.patch("os.path.isfile", return_value=False)
-    def test__download_image(self, mock_isfile, mock_image, mock_open):
+    def test__download_image(self, mock_isfile, mock_image, mock_open,
+                             mock_rename):
         img_1 = mock.MagicMock()
         img_1.name = "Foo"
         img_2 = mock.MagicMock()
@@ -186,7 +221,8 @@ class TempestContextTestCase(test.TestCase):
         mock_image.return_value.list_images.assert_called_once_with(
             status="active", visibility="public")
         glanceclient.images.data.assert_called_once_with(img_2.id)
-        mock_open.assert_called_once_with(img_path, "wb")
+        mock_open.assert_called_once_with("%s.part" % img_path, "wb")
+        mock_rename.assert_called_once_with("%s.part" % img_path, img_path)
         mock_open().write.assert_has_calls([mock.call("d"),
                                             mock.call("a"),
                                             mock.call("t"),
@@ -13,7 +13,9 @@
 
 import json
 import os
+import shutil
 import subprocess
+import tempfile
 
 import mock
 
@@ -175,25 +177,88 @@ class TempestManagerTestCase(test.TestCase):
         mock_list_extensions.assert_called_once_with()
         self.assertFalse(mock_rmtree.called)
 
-    @mock.patch("%s.TempestManager._transform_pattern" % PATH)
-    @mock.patch("%s.testr.TestrLauncher.list_tests" % PATH)
-    def test_list_tests(self, mock_testr_launcher_list_tests,
-                        mock__transform_pattern):
+    @mock.patch("%s.TempestManager._get_tests_index" % PATH)
+    def test_list_tests(self, mock__get_tests_index):
         tempest = manager.TempestManager(mock.MagicMock(uuid="uuuiiiddd"))
+        mock__get_tests_index.return_value = [
+            "tempest.api.compute.test_a.A.test_1[id-1,smoke]",
+            "tempest.api.compute.test_a.A.test_2[id-2]",
+            "tempest.scenario.test_b.B.test_1[id-3,smoke]"]
 
-        self.assertEqual(mock_testr_launcher_list_tests.return_value,
+        self.assertEqual(mock__get_tests_index.return_value,
                          tempest.list_tests())
-        mock_testr_launcher_list_tests.assert_called_once_with("")
-        self.assertFalse(mock__transform_pattern.called)
-        mock_testr_launcher_list_tests.reset_mock()
+        self.assertEqual(mock__get_tests_index.return_value[1:2],
+                         tempest.list_tests("test_a.A.test_2"))
+        self.assertEqual(mock__get_tests_index.return_value[:2],
+                         tempest.list_tests("set=compute"))
+        self.assertEqual(mock__get_tests_index.return_value[::2],
+                         tempest.list_tests("set=smoke"))
+        self.assertEqual(mock__get_tests_index.return_value,
+                         tempest.list_tests("set=full"))
 
-        pattern = mock.Mock()
+    @mock.patch("%s.testr.TestrLauncher.list_tests" % PATH)
+    @mock.patch("%s.TempestManager._get_tests_index_key" % PATH)
+    def test__get_tests_index(self, mock__get_tests_index_key,
+                              mock_testr_launcher_list_tests):
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        patcher = mock.patch("%s.TempestManager.base_dir" % PATH,
+                             new_callable=mock.PropertyMock,
+                             return_value=base_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tempest = manager.TempestManager(mock.MagicMock(uuid="uuuiiiddd"))
+        mock__get_tests_index_key.return_value = ["repo@sha1"]
+        mock_testr_launcher_list_tests.return_value = ["a.A.test_1"]
 
-        self.assertEqual(mock_testr_launcher_list_tests.return_value,
-                         tempest.list_tests(pattern))
-        mock_testr_launcher_list_tests.assert_called_once_with(
-            mock__transform_pattern.return_value)
-        mock__transform_pattern.assert_called_once_with(pattern)
+        self.assertEqual(["a.A.test_1"], tempest._get_tests_index())
+        self.assertEqual(["a.A.test_1"], tempest._get_tests_index())
+        # NOTE: the index is shared by instances of the verifier manager
+        tempest = manager.TempestManager(mock.MagicMock(uuid="uuuiiiddd"))
+        self.assertEqual(["a.A.test_1"], tempest._get_tests_index())
+        mock_testr_launcher_list_tests.assert_called_once_with()
+
+        # the version of tempest or a plugin is changed
+        mock__get_tests_index_key.return_value = ["repo@sha2"]
+        mock_testr_launcher_list_tests.return_value = ["a.A.test_2"]
+        self.assertEqual(["a.A.test_2"], tempest._get_tests_index())
+        self.assertEqual(2, mock_testr_launcher_list_tests.call_count)
+
+        # a plugin is installed or uninstalled
+        tempest._drop_tests_index()
+        self.assertFalse(os.path.exists(tempest._tests_index_file))
+        self.assertEqual(["a.A.test_2"], tempest._get_tests_index())
+        self.assertEqual(3, mock_testr_launcher_list_tests.call_count)
+
+        # no git
+        mock__get_tests_index_key.return_value = None
+        self.assertEqual(["a.A.test_2"], tempest._get_tests_index())
+        self.assertEqual(4, mock_testr_launcher_list_tests.call_count)
+
+    @mock.patch("%s.utils.check_output" % PATH)
+    @mock.patch("%s.os.path.isdir" % PATH)
+    @mock.patch("%s.os.listdir" % PATH)
+    def test__get_tests_index_key(self, mock_listdir, mock_isdir,
+                                  mock_check_output):
+        tempest = manager.TempestManager(mock.MagicMock(uuid="uuuiiiddd"))
+        extensions_dir = os.path.join(tempest.base_dir, "extensions")
+        mock_listdir.return_value = ["foo", "bar", "bar.egg-info"]
+        mock_isdir.side_effect = lambda path: not path.startswith(
+            os.path.join(extensions_dir, "bar.egg-info"))
+        mock_check_output.side_effect = ["sha1\n", "sha2\n", "sha3\n"]
+
+        self.assertEqual(["repo@sha1", "bar@sha2", "foo@sha3"],
+                         tempest._get_tests_index_key())
+        self.assertEqual(
+            [mock.call(["git", "rev-parse", "HEAD"], cwd=path,
+                       debug_output=False)
+             for path in (tempest.repo_dir,
+                          os.path.join(extensions_dir, "bar"),
+                          os.path.join(extensions_dir, "foo"))],
+            mock_check_output.call_args_list)
+
+        mock_check_output.side_effect = subprocess.CalledProcessError("", "")
+        self.assertIsNone(tempest._get_tests_index_key())
 
     @mock.patch("%s.testr.TestrLauncher.validate_args" % PATH)
     def test_validate_args(self, mock_testr_launcher_validate_args):
@@ -241,3 +306,93 @@ class TempestManagerTestCase(test.TestCase):
         self.assertEqual({"pattern": mock__transform_pattern.return_value},
                          tempest.prepare_run_args({"pattern": pattern}))
         mock__transform_pattern.assert_called_once_with(pattern)
+
+    def _get_manager_with_home_dir(self):
+        home_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, home_dir)
+        patcher = mock.patch("%s.TempestManager.home_dir" % PATH,
+                             new_callable=mock.PropertyMock,
+                             return_value=home_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tempest = manager.TempestManager(mock.MagicMock(uuid="uuuiiiddd"))
+        tempest._use_testr = False
+        return tempest
+
+    def test_prepare_run_args_schedules_tests(self):
+        tempest = self._get_manager_with_home_dir()
+        with open(tempest._durations_file, "w") as f:
+            json.dump({"a.A.test_1": 10, "a.A.test_2": 5, "b.B.test_1": 12,
+                       "c.C.test_1": 1, "c.C.test_2": 2}, f)
+        load_list = ["a.A.test_1[id-1]", "a.A.test_2", "b.B.test_1",
+                     "c.C.test_1", "c.C.test_2", "d.D.test_1[smoke]"]
+
+        run_args = tempest.prepare_run_args({"load_list": load_list,
+                                             "concurrency": 2})
+
+        self.assertEqual({"load_list": load_list, "concurrency": 2},
+                         run_args)
+        with open(tempest._worker_file) as f:
+            # NOTE: the test without history is expected to take the average
+            #   duration of known tests, 6 seconds
+            self.assertEqual([{"worker": ["^a\\.A\\.", "^c\\.C\\."]},
+                              {"worker": ["^b\\.B\\.", "^d\\.D\\."]}],
+                             json.load(f))
+
+    @mock.patch("%s.TempestManager._list_tests" % PATH)
+    def test_prepare_run_args_schedules_tests_by_pattern(
+            self, mock__list_tests):
+        tempest = self._get_manager_with_home_dir()
+        with open(tempest._durations_file, "w") as f:
+            json.dump({"a.A.test_1": 10}, f)
+        mock__list_tests.return_value = ["a.A.test_1", "b.B.test_1"]
+
+        tempest.prepare_run_args({"pattern": "set=smoke", "concurrency": 2})
+
+        mock__list_tests.assert_called_once_with("smoke")
+        self.assertIsNotNone(tempest._worker_file)
+
+    def test_prepare_run_args_without_scheduling(self):
+        tempest = self._get_manager_with_home_dir()
+        load_list = ["a.A.test_1", "b.B.test_1"]
+
+        # no history
+        tempest.prepare_run_args({"load_list": load_list})
+        self.assertIsNone(tempest._worker_file)
+
+        with open(tempest._durations_file, "w") as f:
+            json.dump({"a.A.test_1": 10}, f)
+        tempest.prepare_run_args({"load_list": load_list, "concurrency": 1})
+        self.assertIsNone(tempest._worker_file)
+        tempest.prepare_run_args({"load_list": load_list, "failed": True})
+        self.assertIsNone(tempest._worker_file)
+        tempest.prepare_run_args({"load_list": ["a.A.test_1", "a.A.test_2"]})
+        self.assertIsNone(tempest._worker_file)
+
+        tempest._use_testr = True
+        tempest.prepare_run_args({"load_list": load_list})
+        self.assertIsNone(tempest._worker_file)
+
+    @mock.patch("%s.testr.TestrLauncher.run" % PATH)
+    def test_run(self, mock_testr_launcher_run):
+        tempest = self._get_manager_with_home_dir()
+        with open(tempest._durations_file, "w") as f:
+            json.dump({"a.A.test_1": 10, "b.B.test_1": 1}, f)
+        mock_testr_launcher_run.return_value.tests = {
+            "a.A.test_1[id-1]": {"status": "success", "duration": "3.500"},
+            "b.B.test_1": {"status": "skip", "duration": "0.000"},
+            "c.C.test_1": {"status": "fail", "duration": "2.000"}}
+        tempest._worker_file = "worker_file"
+        context = {"testr_cmd": ["stestr", "run", "--subunit",
+                                 "--concurrency", "2", "pattern"]}
+
+        self.assertEqual(mock_testr_launcher_run.return_value,
+                         tempest.run(context))
+
+        mock_testr_launcher_run.assert_called_once_with(context)
+        self.assertEqual(["stestr", "run", "--worker-file", "worker_file",
+                          "--subunit", "pattern"], context["testr_cmd"])
+        self.assertIsNone(tempest._worker_file)
+        with open(tempest._durations_file) as f:
+            self.assertEqual({"a.A.test_1": 3.5, "b.B.test_1": 1,
+                              "c.C.test_1": 2}, json.load(f))
@@ -59,6 +59,55 @@ class NeutronWrapperTestCase(test.TestCase):
         self.assertEqual([mock.call(start_cidr=3)] * 5,
                          mock_generate_cidr.mock_calls)
 
+    @mock.patch("rally_openstack.wrappers.network.generate_cidrs")
+    def test__generate_cidrs(self, mock_generate_cidrs):
+        service = self.get_wrapper(start_cidr="foo_cidr",
+                                   start_ipv6_cidr="foo_ipv6_cidr")
+
+        self.assertEqual(mock_generate_cidrs.return_value,
+                         service._generate_cidrs(4, 3))
+        self.assertEqual(mock_generate_cidrs.return_value,
+                         service._generate_cidrs(6, 2))
+        self.assertEqual([mock.call(start_cidr="foo_cidr", count=3),
+                          mock.call(start_cidr="foo_ipv6_cidr", count=2)],
+                         mock_generate_cidrs.call_args_list)
+
+    def test_create_subnets(self):
+        service = self.get_wrapper()
+        service.client.create_subnet.return_value = {
+            "subnets": ["foo_subnet", "bar_subnet"]}
+
+        self.assertEqual(["foo_subnet", "bar_subnet"],
+                         service.create_subnets([{"cidr": "foo_cidr"},
+                                                 {"cidr": "bar_cidr"}]))
+        service.client.create_subnet.assert_called_once_with(
+            {"subnets": [{"cidr": "foo_cidr"}, {"cidr": "bar_cidr"}]})
+
+    def test_create_subnets_one(self):
+        service = self.get_wrapper()
+        service.client.create_subnet.return_value = {"subnet": "foo_subnet"}
+
+        self.assertEqual(["foo_subnet"],
+                         service.create_subnets([{"cidr": "foo_cidr"}]))
+        service.client.create_subnet.assert_called_once_with(
+            {"subnet": {"cidr": "foo_cidr"}})
+
+    def test_create_subnets_bulk_not_allowed(self):
+        service = self.get_wrapper()
+        service.client.create_subnet.side_effect = [
+            neutron_exceptions.BadRequest(), {"subnet": "foo_subnet"},
+            {"subnet": "bar_subnet"}]
+
+        self.assertEqual(["foo_subnet", "bar_subnet"],
+                         service.create_subnets([{"cidr": "foo_cidr"},
+                                                 {"cidr": "bar_cidr"}]))
+        self.assertEqual(
+            [mock.call({"subnets": [{"cidr": "foo_cidr"},
+                                    {"cidr": "bar_cidr"}]}),
+             mock.call({"subnet": {"cidr": "foo_cidr"}}),
+             mock.call({"subnet": {"cidr": "bar_cidr"}})],
+            service.client.create_subnet.mock_calls)
+
     def test_external_networks(self):
         wrap = self.get_wrapper()
         wrap.client.list_networks.return_value = {"networks": "foo_networks"}
@@ -140,13 +189,12 @@ class NeutronWrapperTestCase(test.TestCase):
     def test_create_network_with_subnets(self):
         subnets_num = 4
         service = self.get_wrapper()
-        subnets_cidrs = iter(range(subnets_num))
-        subnets_ids = iter(range(subnets_num))
-        service._generate_cidr = mock.Mock(
-            side_effect=lambda v: "cidr-%d" % next(subnets_cidrs))
+        service._generate_cidrs = mock.Mock(
+            side_effect=lambda v, count: ["cidr-%d" % i
+                                          for i in range(count)])
         service.client.create_subnet = mock.Mock(
-            side_effect=lambda i: {
-                "subnet": {"id": "subnet-%d" % next(subnets_ids)}})
+            return_value={"subnets": [{"id": "subnet-%d" % i}
+                                      for i in range(subnets_num)]})
         service.client.create_network.return_value = {
             "network": {"id": "foo_id",
                         "name": self.owner.generate_random_name.return_value,
@@ -165,17 +213,41 @@ class NeutronWrapperTestCase(test.TestCase):
                           "tenant_id": "foo_tenant",
                           "subnets": ["subnet-%d" % i
                                       for i in range(subnets_num)]}, net)
-        self.assertEqual(
-            service.client.create_subnet.mock_calls,
-            [mock.call({"subnet":
-                        {"name": self.owner.generate_random_name.return_value,
-                         "enable_dhcp": True,
-                         "network_id": "foo_id",
-                         "tenant_id": "foo_tenant",
-                         "ip_version": service.SUBNET_IP_VERSION,
-                         "dns_nameservers": ["8.8.8.8", "8.8.4.4"],
-                         "cidr": "cidr-%d" % i}})
-             for i in range(subnets_num)])
+        service._generate_cidrs.assert_called_once_with(
+            service.SUBNET_IP_VERSION, subnets_num)
+        service.client.create_subnet.assert_called_once_with(
+            {"subnets": [
+                {"name": self.owner.generate_random_name.return_value,
+                 "enable_dhcp": True,
+                 "network_id": "foo_id",
+                 "tenant_id": "foo_tenant",
+                 "ip_version": service.SUBNET_IP_VERSION,
+                 "dns_nameservers": ["8.8.8.8", "8.8.4.4"],
+                 "cidr": "cidr-%d" % i}
+                for i in range(subnets_num)]})
+
+    def test_create_network_with_dualstack_subnets(self):
+        service = self.get_wrapper()
+        service._generate_cidrs = mock.Mock(
+            side_effect=lambda v, count: ["cidr-v%d-%d" % (v, i)
+                                          for i in range(count)])
+        service.client.create_subnet = mock.Mock(
+            return_value={"subnets": [{"id": "subnet-%d" % i}
+                                      for i in range(3)]})
+        service.client.create_network.return_value = {
+            "network": {"id": "foo_id", "name": "foo_name",
+                        "status": "foo_status"}}
+
+        net = service.create_network("foo_tenant", subnets_num=3,
+                                     dualstack=True)
+
+        self.assertEqual(["subnet-0", "subnet-1", "subnet-2"], net["subnets"])
+        service._generate_cidrs.assert_has_calls(
+            [mock.call(4, 2), mock.call(6, 1)], any_order=True)
+        subnets = service.client.create_subnet.call_args[0][0]["subnets"]
+        self.assertEqual([(4, "cidr-v4-0"), (6, "cidr-v6-0"),
+                          (4, "cidr-v4-1")],
+                         [(s["ip_version"], s["cidr"]) for s in subnets])
 
     def test_create_network_with_router(self):
         service = self.get_wrapper()
@@ -198,10 +270,11 @@ class NeutronWrapperTestCase(test.TestCase):
     def test_create_network_with_router_and_subnets(self):
         subnets_num = 4
         service = self.get_wrapper()
-        service._generate_cidr = mock.Mock(return_value="foo_cidr")
+        service._generate_cidrs = mock.Mock(
+            side_effect=lambda v, count: ["foo_cidr"] * count)
         service.create_router = mock.Mock(return_value={"id": "foo_router"})
         service.client.create_subnet = mock.Mock(
-            return_value={"subnet": {"id": "foo_subnet"}})
+            return_value={"subnets": [{"id": "foo_subnet"}] * subnets_num})
         service.client.create_network.return_value = {
             "network": {"id": "foo_id",
                         "name": self.owner.generate_random_name.return_value,
@@ -218,16 +291,15 @@ class NeutronWrapperTestCase(test.TestCase):
                           "subnets": ["foo_subnet"] * subnets_num}, net)
         service.create_router.assert_called_once_with(external=True,
                                                       tenant_id="foo_tenant")
-        self.assertEqual(
-            service.client.create_subnet.mock_calls,
-            [mock.call({"subnet":
-                        {"name": self.owner.generate_random_name.return_value,
-                         "enable_dhcp": True,
-                         "network_id": "foo_id",
-                         "tenant_id": "foo_tenant",
-                         "ip_version": service.SUBNET_IP_VERSION,
-                         "dns_nameservers": ["foo_nameservers"],
-                         "cidr": "foo_cidr"}})] * subnets_num)
+        service.client.create_subnet.assert_called_once_with(
+            {"subnets": [
+                {"name": self.owner.generate_random_name.return_value,
+                 "enable_dhcp": True,
+                 "network_id": "foo_id",
+                 "tenant_id": "foo_tenant",
+                 "ip_version": service.SUBNET_IP_VERSION,
+                 "dns_nameservers": ["foo_nameservers"],
+                 "cidr": "foo_cidr"}] * subnets_num})
         self.assertEqual(service.client.add_interface_router.mock_calls,
                          [mock.call("foo_router", {"subnet_id": "foo_subnet"})
                           for i in range(subnets_num)])
@@ -478,6 +550,18 @@ class FunctionsTestCase(test.TestCase):
             self.assertEqual("1.1.0.128/26", network.generate_cidr(start_cidr))
             self.assertEqual("1.1.0.192/26", network.generate_cidr(start_cidr))
 
+    def test_generate_cidrs(self):
+        with mock.patch("rally_openstack.wrappers.network.cidr_incr",
+                        iter(range(1, 4))):
+            self.assertEqual(["10.2.1.0/24", "10.2.2.0/24"],
+                             network.generate_cidrs(count=2))
+            self.assertEqual(["10.2.3.0/24"], network.generate_cidrs())
+
+        with mock.patch("rally_openstack.wrappers.network.ipv6_cidr_incr",
+                        iter(range(1, 3))):
+            self.assertEqual(["dead:beaf:0:1::/64", "dead:beaf:0:2::/64"],
+                             network.generate_cidrs("dead:beaf::/64", 2))
+
     def test_wrap(self):
         mock_clients = mock.Mock()
         mock_clients.nova().networks.list.return_value = []
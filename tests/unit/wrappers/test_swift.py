@@ -0,0 +1,66 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import ddt
+import mock
+
+from rally_openstack.wrappers import swift
+from tests.unit import test
+
+
+@ddt.ddt
+class SwiftWrapperTestCase(test.TestCase):
+
+    @ddt.data(
+        {"capabilities": {"bulk_delete": {"max_deletes_per_request": 100}},
+         "expected": 100},
+        {"capabilities": {"swift": {}}, "expected": 0},
+        {"capabilities": Exception("Not Found"), "expected": 0})
+    @ddt.unpack
+    def test_get_bulk_delete_limit(self, capabilities, expected):
+        client = mock.Mock()
+        client.get_capabilities.side_effect = [capabilities]
+
+        self.assertEqual(expected, swift.get_bulk_delete_limit(client))
+
+    def test_bulk_delete(self):
+        client = mock.Mock()
+        client.post_account.return_value = ({}, json.dumps({
+            "Response Status": "400 Bad Request",
+            "Number Deleted": 1,
+            "Number Not Found": 0,
+            "Errors": [["/c1/o%202", "409 Conflict"]]}))
+
+        failed = swift.bulk_delete(client, [("c1", "o1"), ("c1", "o 2")])
+
+        self.assertEqual({("c1", "o 2")}, failed)
+        client.post_account.assert_called_once_with(
+            headers={"Accept": "application/json",
+                     "Content-Type": "text/plain"},
+            query_string="bulk-delete", data=mock.ANY)
+        data = client.post_account.call_args[1]["data"]
+        self.assertEqual({b"/c1/o1", b"/c1/o%202"}, set(data.split(b"\n")))
+
+    def test_bulk_delete_rejected(self):
+        client = mock.Mock()
+        client.post_account.return_value = ({}, json.dumps({
+            "Response Status": "413 Request Entity Too Large",
+            "Response Body": "Max delete failures exceeded",
+            "Errors": []}))
+
+        self.assertEqual({("c1", "o1"), ("c2", "o2")},
+                         swift.bulk_delete(client,
+                                           [("c1", "o1"), ("c2", "o2")]))